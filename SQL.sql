@@ -16,6 +16,10 @@ CREATE TABLE command_history (
     aura_response TEXT,
     input_mode VARCHAR(10) NOT NULL,
     timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    client_uuid CHAR(36) NULL,
+
+    -- rows shipped from the local history journal are idempotent (duplicate uuid = no-op)
+    CONSTRAINT uq_history_client_uuid UNIQUE (client_uuid),
     
     CONSTRAINT fk_history_user
       FOREIGN KEY (user_id)
@@ -25,3 +29,8 @@ CREATE TABLE command_history (
 
 CREATE INDEX idx_history_user_time 
     ON command_history(user_id, timestamp);
+
+-- existing installs: the journal syncer adds this on startup, or run
+-- ALTER TABLE command_history
+--     ADD COLUMN client_uuid CHAR(36) NULL,
+--     ADD CONSTRAINT uq_history_client_uuid UNIQUE (client_uuid);
@@ -0,0 +1,41 @@
+# archive_history.py
+"""
+Run a retention pass on the local command log now, or search the
+archive (aura/retention.py).
+
+Run:  python archive_history.py [aura_commands.db]
+      python archive_history.py search <text> [since] [until]
+"""
+
+import sys
+
+from aura.retention import Archiver
+
+
+def main():
+    args = sys.argv[1:]
+    if args and args[0] == "search":
+        archiver = Archiver()
+        text = args[1] if len(args) > 1 else None
+        since = args[2] if len(args) > 2 else None
+        until = args[3] if len(args) > 3 else None
+        rows = archiver.query(since=since, until=until, text=text, limit=50)
+        for row in rows:
+            print(f"{row['timestamp'][:16]}  [{row['category']}]  {row['command']}  →  {row['result']}")
+        print(f"\n{len(rows)} archived command(s)")
+        return
+
+    archiver = Archiver(args[0] if args else "aura_commands.db")
+    if not archiver.policy.enabled:
+        print("ℹ️  Retention is off (aura_config.json \"retention\" / AURA_RETENTION_DAYS)")
+        return
+    result = archiver.run()
+    print(f"✅ Archived {result['archived']:,} commands older than {result['cutoff'][:10]} "
+          f"into {result['parts']} segment part(s)")
+    print(f"   search mirror trimmed: {result['history_trimmed']:,}   "
+          f"journal pruned: {result['journal_pruned']:,}")
+    print(f"   archive: {archiver.stats()}")
+
+
+if __name__ == "__main__":
+    main()
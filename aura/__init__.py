@@ -11,16 +11,31 @@ class AURAEngineWrapper:
     def __init__(self):
         self._engine = _get_engine()
 
-    def execute(self, text: str, *args, **kwargs):
-        result = self._engine.execute_command(text)
+    def execute(self, text: str, *args, user_id=None, mode="text", min_confidence: float = 0.0,
+                **kwargs):
+        result = self._engine.execute_command(text, user_id=user_id, mode=mode,
+                                              min_confidence=min_confidence)
         return result.get("message", "Done.")
 
-    def execute_command(self, text: str):
-        return self._engine.execute_command(text)
+    def execute_command(self, text: str, user_id=None, mode="text"):
+        return self._engine.execute_command(text, user_id=user_id, mode=mode)
+
+    async def execute_async(self, text: str, timeout: float = None, user_id=None, mode="text",
+                            min_confidence: float = 0.0):
+        result = await self._engine.execute_command_async(text, timeout=timeout,
+                                                          user_id=user_id, mode=mode,
+                                                          min_confidence=min_confidence)
+        return result.get("message", "Done.")
 
     def get_history(self, limit: int = 20):
         return self._engine.get_history(limit)
 
+    def search_history(self, text: str = None, cursor: int = None, **filters):
+        return self._engine.search_history(text, cursor=cursor, **filters)
+
+    def history_categories(self):
+        return self._engine.history_index.categories()
+
 
 def get_engine():
     return AURAEngineWrapper()
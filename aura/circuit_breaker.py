@@ -0,0 +1,206 @@
+# aura/circuit_breaker.py
+"""
+Circuit breaker for calls to a service that may be down (MySQL).
+
+    breaker = get_breaker("mysql")
+    if not breaker.allow():
+        ...                     # fail fast / use the local fallback
+    try:
+        result = do_call()
+    except NetworkError as e:
+        breaker.record_failure(e)
+        raise
+    breaker.record_success()
+
+or simply `breaker.call(do_call)`, which raises CircuitOpenError while
+the circuit is open.
+
+States:
+  closed     calls go through. After `failure_threshold` failures in a
+             row the circuit opens.
+  open       calls are refused at once, with no connect attempt and no
+             timeout. After `probe_interval` seconds the next call goes
+             through as a probe (half-open).
+  half_open  exactly one probe is in flight and every other call is
+             still refused. A successful probe closes the circuit; a
+             failed one opens it for another probe_interval. A probe
+             that never reports back is replaced after probe_interval.
+
+Every call that allow() lets through must end in record_success(),
+record_failure() or release() (finished without saying anything about
+the service, e.g. a local pool was exhausted).
+
+Settings come from aura_config.json "circuit_breakers" ({"mysql":
+{"failure_threshold": 3, "probe_interval": 30}}). The environment
+variables AURA_BREAKER_THRESHOLD and AURA_BREAKER_PROBE_INTERVAL
+override them for every breaker. stats() reports the state and counters
+of every breaker.
+"""
+
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict
+
+CONFIG_FILE = Path("aura_config.json")
+FAILURE_THRESHOLD = 3
+PROBE_INTERVAL = 30.0       # seconds open before a probe is let through
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised by CircuitBreaker.call() while the circuit is open."""
+
+
+class CircuitBreaker:
+    def __init__(self, name: str, failure_threshold: int = FAILURE_THRESHOLD,
+                 probe_interval: float = PROBE_INTERVAL):
+        self.name = name
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.probe_interval = float(probe_interval)
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probing = False
+        self._probe_started = 0.0
+        self.consecutive_failures = 0
+        self.failures = 0
+        self.successes = 0
+        self.rejected = 0
+        self.times_opened = 0
+        self.last_error = None
+        self.last_change = None
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state
+
+    def allow(self) -> bool:
+        """May a call go through now? (Open: no, until the probe is due.)"""
+        with self._lock:
+            if self._state == CLOSED:
+                return True
+            now = time.monotonic()
+            if self._state == OPEN and now - self._opened_at >= self.probe_interval:
+                self._set(HALF_OPEN)
+            if self._state == HALF_OPEN and (
+                    not self._probing or now - self._probe_started >= self.probe_interval):
+                self._probing = True
+                self._probe_started = now
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.successes += 1
+            self.consecutive_failures = 0
+            self._probing = False
+            if self._state != CLOSED:
+                self._set(CLOSED)
+
+    def record_failure(self, error=None):
+        with self._lock:
+            self.failures += 1
+            self.consecutive_failures += 1
+            self.last_error = str(error) if error is not None else None
+            was_probe = self._probing
+            self._probing = False
+            if was_probe or self._state == HALF_OPEN or (
+                    self._state == CLOSED and self.consecutive_failures >= self.failure_threshold):
+                self._opened_at = time.monotonic()
+                if self._state != OPEN:
+                    self.times_opened += 1
+                    self._set(OPEN)
+
+    def release(self):
+        """An allowed call ended with no verdict on the service."""
+        with self._lock:
+            self._probing = False
+
+    def call(self, fn, *args, **kwargs):
+        if not self.allow():
+            raise CircuitOpenError(f"{self.name} circuit open")
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as e:
+            self.record_failure(e)
+            raise
+        self.record_success()
+        return result
+
+    def reset(self):
+        with self._lock:
+            self._probing = False
+            self.consecutive_failures = 0
+            if self._state != CLOSED:
+                self._set(CLOSED)
+
+    def _set(self, state):
+        # caller holds self._lock
+        self._state = state
+        self.last_change = datetime.now().isoformat()
+        print(f"[circuit:{self.name}] {state}"
+              + (f" ({self.last_error})" if state == OPEN and self.last_error else ""))
+
+    def stats(self) -> dict:
+        with self._lock:
+            retry_in = 0.0
+            if self._state == OPEN:
+                retry_in = max(0.0, self.probe_interval - (time.monotonic() - self._opened_at))
+            return {
+                "state": self._state,
+                "consecutive_failures": self.consecutive_failures,
+                "failures": self.failures,
+                "successes": self.successes,
+                "rejected": self.rejected,
+                "times_opened": self.times_opened,
+                "probe_interval_s": self.probe_interval,
+                "probe_in_s": round(retry_in, 1),
+                "last_error": self.last_error,
+                "last_change": self.last_change,
+            }
+
+
+# ---------- shared breakers ----------
+_breakers: Dict[str, CircuitBreaker] = {}
+_registry_lock = threading.Lock()
+
+
+def _settings(name: str) -> dict:
+    try:
+        setting = json.loads(CONFIG_FILE.read_text(encoding="utf-8")).get("circuit_breakers") or {}
+        setting = setting.get(name) or {}
+    except:
+        setting = {}
+    out = {
+        "failure_threshold": setting.get("failure_threshold", FAILURE_THRESHOLD),
+        "probe_interval": setting.get("probe_interval", PROBE_INTERVAL),
+    }
+    if os.getenv("AURA_BREAKER_THRESHOLD"):
+        out["failure_threshold"] = int(os.getenv("AURA_BREAKER_THRESHOLD"))
+    if os.getenv("AURA_BREAKER_PROBE_INTERVAL"):
+        out["probe_interval"] = float(os.getenv("AURA_BREAKER_PROBE_INTERVAL"))
+    return out
+
+
+def get_breaker(name: str) -> CircuitBreaker:
+    """The process-wide breaker for `name`, configured on first use."""
+    with _registry_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            breaker = _breakers[name] = CircuitBreaker(name, **_settings(name))
+        return breaker
+
+
+def stats() -> dict:
+    with _registry_lock:
+        breakers = list(_breakers.values())
+    return {b.name: b.stats() for b in breakers}
@@ -3,10 +3,7 @@
 
 import os
 import sys
-import subprocess
 import platform
-import webbrowser
-import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 import json
@@ -15,13 +12,16 @@ from pathlib import Path
 from urllib.parse import quote
 from datetime import datetime, timedelta
 import threading
+import time
+import asyncio
 import sqlite3
+from concurrent.futures import ThreadPoolExecutor
 import requests
 
 # Fix for imports if other modules exist
 try:
     from aura.enhanced_nlp import EnhancedNLP
-    from aura.context import ConversationContext, save_history
+    from aura.context import ConversationContext
 except ImportError:
     class EnhancedNLP:
         def parse(self, text): return ("general", {})
@@ -30,47 +30,180 @@ except ImportError:
         def add_turn(self, a, b): pass
         def update_search(self, a, b): pass
         def as_dict(self): return {}
-    def save_history(a, b): pass
+
+from aura.keyword_matcher import KeywordMatcher
+from aura.contacts import open_contact_store
+from aura.history_sink import build_sink, connect_sqlite, ensure_commands_table
+from aura.history_search import HistoryIndex, since_for
+from aura import retention, sandbox, tracing, usage_rollups
+
+# ✅ ROUTING TABLE - trigger phrases per category (substring match)
+ROUTE_KEYWORDS = {
+    "timer": ["timer"],
+    "alarm": ["alarm"],
+    "list_timers": ["list timer", "list alarm", "timers", "alarms"],
+    "file": ["file"],
+    "file_action": ["create", "delete", "read", "open", "edit"],
+    "call": ["call"],
+    "whatsapp": ["message", "text", "whatsapp"],
+    "settings": ["settings", "wifi", "bluetooth", "display", "camera", "microphone"],
+    "email": ["email", "mail", "send mail"],
+    "youtube": ["youtube", "yt", "video", "vedio"],
+    "weather": ["weather"],
+    "news": ["news", "headlines"],
+    "app": ["open", "launch", "start"],
+}
+
+# Priority order: timers → files → calls/whatsapp → settings → email →
+# youtube → weather/news → FAQ → apps → (fallback) google search
+ROUTE_ORDER = [
+    "timer", "alarm", "list_timers",
+    "file",
+    "call", "whatsapp",
+    "settings",
+    "email",
+    "youtube",
+    "weather", "news",
+    "faq",
+    "app",
+]
+
+
+def _span_confidence(text: str, start: int, end: int) -> float:
+    """
+    How well a trigger phrase at text[start:end] stands for a word:
+    1.0 for whole words, less when it is only the front of a longer
+    word ("timer" in "timers" 0.83), 0.0 when it starts mid-word.
+    """
+    if start > 0 and text[start - 1].isalnum():
+        return 0.0
+    word_end = end
+    while word_end < len(text) and text[word_end].isalnum():
+        word_end += 1
+    return (end - start) / (word_end - start)
+
+
+# Handlers that only fire an external effect (browser, dialer, SMTP, app
+# launch) and touch no engine state. execute_many() may run consecutive
+# commands of these categories concurrently; everything else (timers,
+# files) runs in submission order.
+INDEPENDENT_CATEGORIES = {
+    "call", "whatsapp", "settings", "email", "youtube",
+    "weather", "news", "faq", "app", "search",
+}
+
+# ✅ ASYNC PATH - per-category handler timeouts (seconds) and the size of
+# the shared executor that blocking handlers run on
+HANDLER_TIMEOUTS = {
+    "email": 30.0,      # SMTP login + send
+    "app": 10.0,
+    "file": 10.0,
+    "search": 10.0,
+    "youtube": 10.0,
+    "weather": 10.0,
+    "news": 10.0,
+}
+DEFAULT_HANDLER_TIMEOUT = 5.0
+ASYNC_MAX_WORKERS = 8
+
+# ✅ HANDLER PATTERNS - shared by the handlers and prewarm()
+CALL_RE = re.compile(r"call\s+(\w+)", re.I)
+MESSAGE_RE = re.compile(r"(?:message|text|whatsapp)\s+(\w+)(?:\s+(.+))?", re.I)
+EMAIL_RE = re.compile(r"(?:email|mail|send mail)\s+to\s+([\w\s]+?)(?:\s+about\s+([\w\s]+?))?(?:\s+saying\s+(.+))?", re.I)
+OPEN_APP_RE = re.compile(r"(?:open|launch|start)\s+(.+?)(?=\s|$)", re.I)
+
+# ✅ SPECULATIVE WARM-UP - a pre-opened SMTP session is reused for this long
+SMTP_WARM_TTL = 60.0
 
 class AURACommandEngine:
     """✅ PRODUCTION READY - ALL FEATURES WORKING"""
     
-    def __init__(self):
+    def __init__(self, db_path="aura_commands.db", history_backends=None):
+        self.db_path = db_path
+        self.history_backends = history_backends    # None = configured (sqlite + mysql)
         self.os_type = platform.system()
         self.contacts = self._load_contacts()
+        self.contact_store = open_contact_store(self.contacts)
         self.email_config = self._load_email_config()
         self.app_paths = self._load_app_paths()
         self._history = []
+        # context + _history are updated from executor threads (async path)
+        self._turn_lock = threading.Lock()
         self._timers = []
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        # the sqlite connection is shared by every worker thread
+        self._db_lock = threading.Lock()
         self.nlp = EnhancedNLP()
         self.context = ConversationContext()
+        self.router = KeywordMatcher(ROUTE_KEYWORDS)
+        self.router.build()
+        # work done ahead of time from partial voice transcripts (prewarm)
+        self._warm = {}
+        self._warm_lock = threading.Lock()
+        # bumped by settle / discard; a warm-up from an older generation
+        # finishing late must not store into _warm
+        self._warm_gen = 0
+        self._warmers = {
+            "call": lambda cmd, gen: self._warm_contact(CALL_RE, cmd, gen),
+            "whatsapp": lambda cmd, gen: self._warm_contact(MESSAGE_RE, cmd, gen),
+            "email": self._warm_email,
+            "app": self._warm_app,
+        }
+        # category -> (handler, wants raw text instead of lowercased)
+        self._handlers = {
+            "timer": (self._handle_timer, False),
+            "alarm": (self._handle_alarm, False),
+            "list_timers": (self._handle_list_timers, False),
+            "file": (self._handle_file_operation, False),
+            "call": (self._handle_call, False),
+            "whatsapp": (self._handle_message, False),
+            "settings": (self._handle_system_settings, False),
+            "email": (self._handle_email, False),
+            "youtube": (self._handle_youtube_search, True),
+            "weather": (self._handle_weather, False),
+            "news": (self._handle_news, False),
+            "app": (self._handle_open_app, False),
+            "search": (self._handle_search, True),
+        }
         self.init_database()
         
     def init_database(self):
-        """✅ REAL DATABASE LOGGING"""
-        self.conn = sqlite3.connect('aura_commands.db', check_same_thread=False)
+        """✅ REAL DATABASE LOGGING - WAL mode; all history goes through one HistorySink"""
+        path, uri = self.db_path, False
+        if path == ":memory:":
+            # the sink's writer thread needs its own connection to the same database
+            path, uri = f"file:aura_commands_{id(self)}?mode=memory&cache=shared", True
+        self.conn = connect_sqlite(path, uri)
         self.cursor = self.conn.cursor()
-        self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS commands (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                timestamp TEXT,
-                command TEXT,
-                category TEXT,
-                result TEXT
-            )
-        ''')
-        self.conn.commit()
+        ensure_commands_table(self.conn)
+        # searchable mirror (filled by the "search" history backend); reads
+        # share the engine connection, so they take the same lock
+        self.history_index = HistoryIndex(self.conn, self._db_lock)
+        self.history_index.import_commands()
+        # usage counters (kept by the sqlite history backend); a database
+        # from before they existed is counted once here
+        usage_rollups.ensure_schema(self.conn)
+        if usage_rollups.is_empty(self.conn):
+            self.cursor.execute("SELECT 1 FROM commands LIMIT 1")
+            if self.cursor.fetchone():
+                usage_rollups.backfill(self.conn)
+        self.history_sink = build_sink(path, uri, self.history_backends)
+        # old rows move to compressed segments in the background (not for
+        # throwaway in-memory databases)
+        self.retention = None if self.db_path == ":memory:" else retention.start_worker(path, uri)
 
-    def log_command(self, command, category, result):
-        """✅ LOG EVERY COMMAND TO DATABASE"""
-        try:
-            self.cursor.execute(
-                "INSERT INTO commands (timestamp, command, category, result) VALUES (?, ?, ?, ?)",
-                (datetime.now().isoformat(), command, category, result)
-            )
-            self.conn.commit()
-        except:
-            pass  # Silent fail for demo
+    def log_command(self, command, category, result, user_id=None, mode="text"):
+        """✅ RECORD ONE COMMAND - queued once, written by every history backend"""
+        with tracing.span("log_command", category=category):
+            self.history_sink.record(command, category, result, user_id, mode)
+
+    def log_commands(self, rows, user_id=None, mode="text"):
+        """✅ RECORD MANY COMMANDS - rows of (command, category, result)"""
+        if not rows:
+            return
+        with tracing.span("log_commands", rows=len(rows)):
+            self.history_sink.record_many(rows, user_id, mode)
 
     def _load_contacts(self):
         """✅ HARDCODED CONTACTS - NO JSON NEEDED"""
@@ -133,97 +266,215 @@ class AURACommandEngine:
         return paths
 
     def _find_contact(self, name):
-        """✅ FUZZY CONTACT MATCHING"""
-        name = name.lower().strip()
-        if name in self.contacts:
-            return self.contacts[name]
-        for cname, info in self.contacts.items():
-            if name in cname.lower() or cname.lower() in name:
-                return info
-        return None
+        """✅ FUZZY CONTACT MATCHING - exact, prefix, then phonetic (see aura/contacts.py)"""
+        with self._warm_lock:
+            warm = self._warm.pop("contact", None)
+        if warm and warm[0] == name.lower().strip():
+            return warm[1]
+        with tracing.span("contacts.find"):
+            return self.contact_store.find(name)
 
-    def parse_command(self, command: str):
-        """✅ MAIN ROUTER - PERFECT PRIORITY ORDER"""
-        raw = command.strip()
-        cmd_lower = raw.lower()
-        
-        if not command:
-            return {"status": "error", "message": "Please say something."}
+    # ---------- speculative warm-up from partial transcripts ----------
+    def warm_generation(self) -> int:
+        """Token for prewarm(gen=...): stale once the command is settled or discarded."""
+        with self._warm_lock:
+            return self._warm_gen
 
-        # 1️⃣ TIMERS FIRST
-        if "timer" in cmd_lower:
-            result = self._handle_timer(cmd_lower)
-            self.log_command(raw, "timer", result["message"])
-            return result
-        if "alarm" in cmd_lower:
-            result = self._handle_alarm(cmd_lower)
-            self.log_command(raw, "alarm", result["message"])
-            return result
-        if any(phrase in cmd_lower for phrase in ["list timer", "list alarm", "timers", "alarms"]):
-            result = self._handle_list_timers()
-            self.log_command(raw, "list_timers", result["message"])
-            return result
+    def prewarm(self, partial: str, gen: int = None):
+        """
+        Route a partial voice transcript and do the slow part of its
+        handler early: resolve the contact, open the SMTP session, find
+        the app's launch path. Handlers use the result only when the
+        final command asks for the same thing; settle_prewarm() drops the
+        rest. Returns the predicted category (None if the command was
+        settled or discarded while this ran, or since `gen` was taken
+        from warm_generation()).
+        """
+        cmd_lower = partial.strip().lower()
+        if not cmd_lower:
+            return None
+        if gen is None:
+            gen = self.warm_generation()
+        category, _ = self._route_table(cmd_lower)
+        stale = {}
+        with self._warm_lock:
+            if gen != self._warm_gen:
+                return None
+            if self._warm.get("category") != category:
+                stale, self._warm = self._warm, {}
+                self._warm_gen += 1
+                gen = self._warm_gen
+            self._warm["category"] = category
+        self._close_warm(stale)
+        warmer = self._warmers.get(category)
+        if warmer:
+            with tracing.span("prewarm", category=category):
+                try:
+                    warmer(cmd_lower, gen)
+                except Exception as e:
+                    print(f"[prewarm] {category}: {e}")
+        return category
 
-        # 2️⃣ FILES (ONLY WHEN "FILE" MENTIONED)
-        if "file" in cmd_lower and any(w in cmd_lower for w in ["create", "delete", "read", "open", "edit"]):
-            result = self._handle_file_operation(cmd_lower)
-            self.log_command(raw, "file", result["message"])
-            return result
+    def settle_prewarm(self, final: str):
+        """Keep warmed work only if the final transcript routes the same way."""
+        with self._warm_lock:
+            predicted = self._warm.get("category")
+            # warm-ups still running were for partials of this command: too late
+            self._warm_gen += 1
+        if predicted is None:
+            return
+        category, _ = self._route_table(final.strip().lower())
+        if category != predicted:
+            self.discard_prewarm()
 
-        # 3️⃣ CALLS & WHATSAPP
-        if "call" in cmd_lower:
-            result = self._handle_call(cmd_lower)
-            self.log_command(raw, "call", result["message"])
-            return result
-        if any(w in cmd_lower for w in ["message", "text", "whatsapp"]):
-            result = self._handle_message(cmd_lower)
-            self.log_command(raw, "whatsapp", result["message"])
-            return result
+    def discard_prewarm(self):
+        with self._warm_lock:
+            warm, self._warm = self._warm, {}
+            self._warm_gen += 1
+        self._close_warm(warm)
 
-        # 4️⃣ SETTINGS
-        if any(w in cmd_lower for w in ["settings", "wifi", "bluetooth", "display", "camera", "microphone"]):
-            result = self._handle_system_settings(cmd_lower)
-            self.log_command(raw, "settings", result["message"])
-            return result
+    @staticmethod
+    def _close_warm(warm):
+        smtp = warm.get("smtp")
+        if smtp:
+            try:
+                smtp[0].quit()
+            except:
+                pass
 
-        # 5️⃣ EMAIL
-        if any(w in cmd_lower for w in ["email", "mail", "send mail"]):
-            result = self._handle_email(cmd_lower)
-            self.log_command(raw, "email", result["message"])
-            return result
+    def _warm_contact(self, pattern, cmd_lower, gen):
+        m = pattern.search(cmd_lower)
+        if not m:
+            return
+        name = m.group(1).strip().lower()
+        with self._warm_lock:
+            if self._warm.get("contact", (None,))[0] == name:
+                return
+        info = self.contact_store.find(name)
+        with self._warm_lock:
+            if gen == self._warm_gen:
+                self._warm["contact"] = (name, info)
 
-        # 6️⃣ YOUTUBE/VIDEO (BEFORE FAQ)
-        if any(w in cmd_lower for w in ["youtube", "yt", "video", "vedio"]):
-            result = self._handle_youtube_search(raw)
-            self.log_command(raw, "youtube", result["message"])
-            return result
+    def _warm_email(self, cmd_lower, gen):
+        self._warm_contact(EMAIL_RE, cmd_lower, gen)
+        if self.email_config["sender_email"] == "your_email@gmail.com":
+            return
+        with self._warm_lock:
+            if "smtp" in self._warm or gen != self._warm_gen:
+                return
+            self._warm["smtp"] = None     # connecting
+        try:
+            server = self._open_smtp()
+        except Exception as e:
+            with self._warm_lock:
+                if self._warm.get("smtp", 0) is None:
+                    self._warm.pop("smtp")
+            print(f"[prewarm] smtp: {e}")
+            return
+        with self._warm_lock:
+            if self._warm.get("smtp", 0) is None:
+                if gen == self._warm_gen:
+                    self._warm["smtp"] = (server, time.monotonic())
+                    return
+                self._warm.pop("smtp")
+        # settled / discarded while connecting
+        try:
+            server.quit()
+        except:
+            pass
 
-        # 7️⃣ WEATHER/NEWS
-        if "weather" in cmd_lower:
-            result = self._handle_weather(cmd_lower)
-            self.log_command(raw, "weather", result["message"])
-            return result
-        if any(w in cmd_lower for w in ["news", "headlines"]):
-            result = self._handle_news(cmd_lower)
-            self.log_command(raw, "news", result["message"])
-            return result
+    def _take_warm_smtp(self):
+        """A logged-in SMTP session opened by prewarm(), or None."""
+        with self._warm_lock:
+            warm = self._warm.pop("smtp", None)
+        if not warm:
+            return None
+        server, opened = warm
+        if time.monotonic() - opened <= SMTP_WARM_TTL:
+            return server
+        try:
+            server.quit()
+        except:
+            pass
+        return None
 
-        # 8️⃣ FAQ (EXCLUDES YOUTUBE)
-        answer = self._answer_question(cmd_lower)
-        if answer:
-            self.log_command(raw, "faq", answer)
-            return {"status": "success", "message": answer}
+    def _warm_app(self, cmd_lower, gen):
+        m = OPEN_APP_RE.search(cmd_lower)
+        if not m:
+            return
+        app = m.group(1).strip().lower()
+        path = next((p for p in self.app_paths.get(app, ()) if os.path.exists(p)), None)
+        with self._warm_lock:
+            if gen == self._warm_gen:
+                self._warm["app"] = (app, path)
 
-        # 9️⃣ APPS
-        if any(w in cmd_lower for w in ["open", "launch", "start"]):
-            result = self._handle_open_app(cmd_lower)
-            self.log_command(raw, "app", result["message"])
-            return result
+    def _app_path(self, app):
+        """First existing install path of a known app, or None."""
+        with self._warm_lock:
+            warm = self._warm.pop("app", None)
+        if warm and warm[0] == app:
+            return warm[1]
+        return next((p for p in self.app_paths.get(app, ()) if os.path.exists(p)), None)
 
+    def route(self, command: str, min_confidence: float = 0.0):
+        """✅ SINGLE-PASS ROUTER - returns (category, keyword matches)"""
+        cmd_lower = command.strip().lower()
+        return self._classify(cmd_lower, min_confidence)
+
+    def _classify(self, cmd_lower: str, min_confidence: float = 0.0):
+        """Scan once with the keyword automaton, then apply ROUTE_ORDER."""
+        with tracing.span("route") as span:
+            category, matches = self._route_table(cmd_lower, min_confidence)
+            span.tag(category=category)
+        return category, matches
+
+    def _route_table(self, cmd_lower: str, min_confidence: float = 0.0):
+        matches = self.router.match(cmd_lower)
+        if min_confidence > 0:
+            # DROP TRIGGERS THAT ONLY HIT PART OF A WORD ("start" IN "restart")
+            matches = {
+                category: spans for category, spans in matches.items()
+                if max(_span_confidence(cmd_lower, s, e) for s, e in spans) >= min_confidence
+            }
+        for category in ROUTE_ORDER:
+            if category == "faq":
+                # FAQ keys are checked by _answer_question (EXCLUDES YOUTUBE,
+                # which is earlier in the order)
+                if self._answer_question(cmd_lower):
+                    return "faq", matches
+                continue
+            if category not in matches:
+                continue
+            # FILES ONLY WHEN "FILE" + AN ACTION ARE MENTIONED
+            if category == "file" and "file_action" not in matches:
+                continue
+            return category, matches
         # 🔟 FALLBACK: GOOGLE SEARCH
-        result = self._handle_search(raw)
-        self.log_command(raw, "search", result["message"])
-        return result
+        return "search", matches
+
+    def _dispatch(self, category: str, raw: str, cmd_lower: str):
+        """Run the handler for an already-routed command."""
+        with tracing.span("handler", category=category):
+            if category == "faq":
+                return {"status": "success", "message": self._answer_question(cmd_lower)}
+            handler, wants_raw = self._handlers[category]
+            return handler(raw if wants_raw else cmd_lower)
+
+    def parse_command(self, command: str):
+        """✅ MAIN ROUTER - PERFECT PRIORITY ORDER (nothing is recorded)"""
+        return self._parse(command)[1]
+
+    def _parse(self, command: str, min_confidence: float = 0.0):
+        """(category or None for empty input, result)"""
+        raw = command.strip()
+        cmd_lower = raw.lower()
+        
+        if not command:
+            return None, {"status": "error", "message": "Please say something."}
+
+        category, _ = self._classify(cmd_lower, min_confidence)
+        tracing.annotate(category=category)
+        return category, self._dispatch(category, raw, cmd_lower)
 
     def _answer_question(self, command: str) -> str | None:
         """✅ COMPREHENSIVE FAQ DATABASE"""
@@ -294,11 +545,11 @@ class AURACommandEngine:
                     if path.exists():
                         try:
                             if self.os_type == "Windows":
-                                os.startfile(str(path))
+                                sandbox.startfile(str(path))
                             elif self.os_type == "Darwin":
-                                subprocess.Popen(["open", str(path)])
+                                sandbox.popen(["open", str(path)])
                             else:
-                                subprocess.Popen(["xdg-open", str(path)])
+                                sandbox.popen(["xdg-open", str(path)])
                             return {"status": "success", "message": f"✅ Opening '{filename}'"}
                         except Exception as e:
                             return {"status": "error", "message": f"❌ Open failed: {str(e)[:30]}..."}
@@ -311,14 +562,14 @@ class AURACommandEngine:
     def _handle_message(self, command: str):
         """✅ REAL WHATSAPP"""
         try:
-            m = re.search(r"(?:message|text|whatsapp)\s+(\w+)(?:\s+(.+))?", command, re.I)
+            m = MESSAGE_RE.search(command)
             if m:
                 name = m.group(1).lower()
                 msg = m.group(2).strip() if m.group(2) else "Hi!"
                 
                 contact = self._find_contact(name)
                 if contact:
-                    webbrowser.open(f"https://wa.me/{contact['phone']}?text={quote(msg)}")
+                    sandbox.open_url(f"https://wa.me/{contact['phone']}?text={quote(msg)}")
                     return {"status": "success", "message": f"✅ WhatsApp: {name}\n📱 {msg}"}
                 else:
                     contacts = ", ".join(self.contacts.keys())
@@ -330,12 +581,12 @@ class AURACommandEngine:
     def _handle_call(self, command: str):
         """✅ REAL CALLS"""
         try:
-            m = re.search(r"call\s+(\w+)", command, re.I)
+            m = CALL_RE.search(command)
             if m:
                 name = m.group(1).lower()
                 contact = self._find_contact(name)
                 if contact:
-                    webbrowser.open(f"tel:{contact['phone']}")
+                    sandbox.open_url(f"tel:{contact['phone']}")
                     return {"status": "success", "message": f"📞 Calling {name}\n{contact['phone']}"}
                 else:
                     contacts = ", ".join(self.contacts.keys())
@@ -347,7 +598,7 @@ class AURACommandEngine:
     def _handle_email(self, command: str):
         """✅ REAL EMAIL"""
         try:
-            m = re.search(r"(?:email|mail|send mail)\s+to\s+([\w\s]+?)(?:\s+about\s+([\w\s]+?))?(?:\s+saying\s+(.+))?", command, re.I)
+            m = EMAIL_RE.search(command)
             if m:
                 name = m.group(1).strip().lower()
                 subject = m.group(2).strip() if m.group(2) else "Request"
@@ -397,9 +648,7 @@ Your Student
             msg["Subject"] = subject
             msg.attach(MIMEText(body, "plain"))
             
-            server = smtplib.SMTP(self.email_config["smtp_server"], self.email_config["smtp_port"])
-            server.starttls()
-            server.login(self.email_config["sender_email"], self.email_config["sender_password"])
+            server = self._take_warm_smtp() or self._open_smtp()
             server.sendmail(self.email_config["sender_email"], to_email, msg.as_string())
             server.quit()
             
@@ -407,6 +656,13 @@ Your Student
         except Exception as e:
             return {"status": "error", "message": f"❌ Email failed (needs Gmail App Password): {str(e)[:50]}..."}
 
+    def _open_smtp(self):
+        """Connected, TLS'd and logged-in SMTP session."""
+        server = sandbox.smtp(self.email_config["smtp_server"], self.email_config["smtp_port"])
+        server.starttls()
+        server.login(self.email_config["sender_email"], self.email_config["sender_password"])
+        return server
+
     def _handle_timer(self, command: str):
         """✅ REAL TIMERS"""
         m = re.search(r"(\d+)\s*(minutes?|mins?|hours?|hrs?)", command, re.I)
@@ -458,7 +714,7 @@ Your Student
             return {"status": "success", "message": f"🚨 Alarm set for {hour:02d}:{minute:02d} ({int(seconds/60)} min)"}
         return {"status": "error", "message": "Say: 'set alarm for 7:30'"}
 
-    def _handle_list_timers(self):
+    def _handle_list_timers(self, command: str = ""):
         """✅ LIST TIMERS"""
         if not self._timers:
             return {"status": "success", "message": "⏰ No active timers"}
@@ -468,30 +724,29 @@ Your Student
     def _handle_open_app(self, command: str):
         """✅ UNIVERSAL APP LAUNCHER"""
         try:
-            m = re.search(r"(?:open|launch|start)\s+(.+?)(?=\s|$)", command, re.I)
+            m = OPEN_APP_RE.search(command)
             if m:
                 app = m.group(1).strip().lower()
                 
                 # KNOWN APPS FIRST
-                if app in self.app_paths:
-                    for path in self.app_paths[app]:
-                        if os.path.exists(path):
-                            if self.os_type == "Windows":
-                                subprocess.Popen([path])
-                            elif self.os_type == "Darwin":
-                                subprocess.Popen(["open", path])
-                            else:
-                                subprocess.Popen([path])
-                            return {"status": "success", "message": f"✅ Opening {app}..."}
+                path = self._app_path(app)
+                if path:
+                    if self.os_type == "Windows":
+                        sandbox.popen([path])
+                    elif self.os_type == "Darwin":
+                        sandbox.popen(["open", path])
+                    else:
+                        sandbox.popen([path])
+                    return {"status": "success", "message": f"✅ Opening {app}..."}
                 
                 # UNIVERSAL LAUNCH (works for most apps)
                 try:
                     if self.os_type == "Windows":
-                        os.startfile(app)
+                        sandbox.startfile(app)
                     elif self.os_type == "Darwin":
-                        subprocess.Popen(["open", "-a", app])
+                        sandbox.popen(["open", "-a", app])
                     else:
-                        subprocess.Popen(["xdg-open", app])
+                        sandbox.popen(["xdg-open", app])
                     return {"status": "success", "message": f"✅ Opening {app}..."}
                 except:
                     pass
@@ -505,12 +760,12 @@ Your Student
         city_match = re.search(r"weather(?:\s+in\s+)?(.+?)(?:\s|$)", command, re.I)
         city = city_match.group(1).strip() if city_match else "Delhi"
         url = f"https://wttr.in/{quote(city)}?format=3"
-        webbrowser.open(url)
+        sandbox.open_url(url)
         return {"status": "success", "message": f"🌤️ Weather for {city}"}
 
     def _handle_news(self, command: str):
         """✅ REAL NEWS"""
-        webbrowser.open("https://news.google.com")
+        sandbox.open_url("https://news.google.com")
         return {"status": "success", "message": "📰 Google News opened"}
 
     def _handle_system_settings(self, command: str):
@@ -529,55 +784,232 @@ Your Student
         for key, uri in mapping.items():
             if key in command.lower():
                 try:
-                    os.startfile(uri)
+                    sandbox.startfile(uri)
                     return {"status": "success", "message": f"⚙️ {key.title()} settings"}
                 except:
                     pass
         
         try:
-            os.startfile("ms-settings:")
+            sandbox.startfile("ms-settings:")
             return {"status": "success", "message": "⚙️ Windows Settings"}
         except:
             return {"status": "error", "message": "⚙️ Cannot open settings"}
 
     def _handle_search(self, query: str):
         """✅ GOOGLE FALLBACK"""
-        webbrowser.open(f"https://www.google.com/search?q={quote(query)}")
+        sandbox.open_url(f"https://www.google.com/search?q={quote(query)}")
         return {"status": "success", "message": f"🔍 Google: {query[:30]}..."}
 
     def _handle_youtube_search(self, query: str):
         """✅ YOUTUBE SEARCH"""
-        webbrowser.open(f"https://www.youtube.com/results?search_query={quote(query)}")
+        sandbox.open_url(f"https://www.youtube.com/results?search_query={quote(query)}")
         return {"status": "success", "message": f"🎥 YouTube: {query[:30]}..."}
 
-    def execute_command(self, command: str):
-        """✅ MAIN EXECUTION + HISTORY"""
-        result = self.parse_command(command)
+    def execute_command(self, command: str, user_id=None, mode="text", min_confidence: float = 0.0):
+        """
+        ✅ MAIN EXECUTION + HISTORY (recorded once, see aura/history_sink.py)
+
+        Trigger phrases that match with less than `min_confidence` (see
+        _span_confidence) are ignored; if none is left the command falls
+        back to search.
+        """
+        with tracing.span("execute_command"):
+            category, result = self._parse(command, min_confidence)
+            self._record_turn(command, category, result, user_id, mode)
+        return result
+
+    def _record_turn(self, command: str, category, result: dict, user_id=None, mode="text"):
         message = result.get("message", "")
-        self.context.add_turn(command, message)
-        save_history(command, message)
-        self._history.append({
-            "timestamp": datetime.now().isoformat(),
-            "command": command, 
-            "result": result
-        })
-        self._history = self._history[-50:]
+        if category is not None:
+            self.log_command(command.strip(), category, message, user_id, mode)
+        with self._turn_lock:
+            self.context.add_turn(command, message)
+            self._history.append({
+                "timestamp": datetime.now().isoformat(),
+                "command": command, 
+                "result": result
+            })
+            self._history = self._history[-50:]
+
+    def _get_executor(self):
+        """Shared bounded pool for blocking handlers on the async path."""
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=ASYNC_MAX_WORKERS, thread_name_prefix="aura-cmd"
+                )
+            return self._executor
+
+    async def execute_command_async(self, command: str, timeout: float = None,
+                                    user_id=None, mode="text", min_confidence: float = 0.0):
+        """
+        ✅ ASYNC EXECUTION - same result as execute_command, without
+        blocking the event loop.
+
+        Routing runs inline (it is pure CPU and cheap). The handler and
+        the history writes run on a bounded shared executor, so a GUI,
+        server or wake-word loop can keep many commands in flight.
+
+        The handler gets `timeout` seconds, or HANDLER_TIMEOUTS for its
+        category. On timeout an error result is returned and recorded.
+        Cancelling the awaiting task drops the command without recording
+        it. A handler that has already started in a worker thread cannot
+        be interrupted; its result is discarded.
+        """
+        raw = command.strip()
+        cmd_lower = raw.lower()
+        if not command:
+            # same as execute_command: the turn is kept in context/_history
+            result = {"status": "error", "message": "Please say something."}
+            self._record_turn(command, None, result, user_id, mode)
+            return result
+
+        category, _ = self._classify(cmd_lower, min_confidence)
+        limit = timeout if timeout is not None else HANDLER_TIMEOUTS.get(category, DEFAULT_HANDLER_TIMEOUT)
+
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        try:
+            result = await asyncio.wait_for(
+                loop.run_in_executor(executor, self._dispatch, category, raw, cmd_lower),
+                limit,
+            )
+        except asyncio.TimeoutError:
+            result = {"status": "error", "message": f"⏱️ {category} timed out after {limit:g}s"}
+
+        def persist():
+            self._record_turn(command, category, result, user_id, mode)
+
+        await loop.run_in_executor(executor, persist)
         return result
 
+    def execute_many(self, commands, max_workers=4, dry_run=False, user_id=None, mode="text"):
+        """
+        ✅ BATCH EXECUTION - route a whole list, run it, persist once.
+
+        Consecutive commands in INDEPENDENT_CATEGORIES run concurrently;
+        any other command waits for everything before it. History is
+        recorded once at the end; each history backend writes it as one
+        batch.
+        With dry_run=True commands are only routed: no handler runs and
+        nothing is written.
+
+        Returns one dict per command, in input order:
+            {"command", "category", "result", "elapsed_ms"}
+        """
+        routed = []
+        for command in commands:
+            raw = command.strip()
+            cmd_lower = raw.lower()
+            category = self._classify(cmd_lower)[0] if command else None
+            routed.append((command, raw, cmd_lower, category))
+
+        results = [None] * len(routed)
+
+        def run(i):
+            command, raw, cmd_lower, category = routed[i]
+            start = time.perf_counter()
+            if category is None:
+                result = {"status": "error", "message": "Please say something."}
+            elif dry_run:
+                result = {"status": "dry_run", "message": f"Would run: {category}"}
+            else:
+                try:
+                    result = self._dispatch(category, raw, cmd_lower)
+                except Exception as e:
+                    result = {"status": "error", "message": f"❌ {category} error: {str(e)[:50]}..."}
+            results[i] = {
+                "command": command,
+                "category": category,
+                "result": result,
+                "elapsed_ms": (time.perf_counter() - start) * 1000,
+            }
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            in_flight = []
+            for i, (_, _, _, category) in enumerate(routed):
+                if category in INDEPENDENT_CATEGORIES:
+                    in_flight.append(pool.submit(run, i))
+                    continue
+                for future in in_flight:
+                    future.result()
+                in_flight = []
+                run(i)
+            for future in in_flight:
+                future.result()
+
+        if dry_run:
+            return results
+
+        # ONE BATCH PER HISTORY BACKEND
+        self.log_commands([
+            (routed[i][1], r["category"], r["result"]["message"])
+            for i, r in enumerate(results) if r["category"] is not None
+        ], user_id, mode)
+
+        with self._turn_lock:
+            for r in results:
+                self.context.add_turn(r["command"], r["result"].get("message", ""))
+                self._history.append({
+                    "timestamp": datetime.now().isoformat(),
+                    "command": r["command"],
+                    "result": r["result"]
+                })
+            self._history = self._history[-50:]
+        return results
+
     def get_history(self, limit=10):
-        return self._history[-limit:]
+        with self._turn_lock:
+            return self._history[-limit:]
+
+    def search_history(self, text=None, since=None, until=None, categories=None,
+                       user_id=None, limit=20, cursor=None, time_range=None,
+                       include_unowned=False):
+        """✅ HISTORY SEARCH - full text + filters, one keyset page (see aura/history_search.py)"""
+        if cursor is None:
+            # first page: make sure just-executed commands are visible
+            self.history_sink.flush(timeout=1.0)
+        if time_range and not since:
+            since = since_for(time_range)
+        with tracing.span("search_history", paged=cursor is not None):
+            return self.history_index.search(text, since, until, categories,
+                                             user_id, limit, cursor, include_unowned)
 
-    def get_stats(self):
-        """✅ DATABASE STATISTICS"""
+    def search_archive(self, text=None, since=None, until=None, category=None, limit=100):
+        """✅ ARCHIVE SEARCH - rows retention moved out of the database, newest first"""
+        archiver = self.retention.archiver if self.retention else retention.Archiver(self.db_path)
+        with tracing.span("search_archive"):
+            return archiver.query(since, until, text, category, limit)
+
+    def get_stats(self, user_id=None):
+        """✅ DATABASE STATISTICS - category -> count from the usage rollups (no table scan)"""
         try:
-            self.cursor.execute("SELECT category, COUNT(*) FROM commands GROUP BY category")
-            stats = dict(self.cursor.fetchall())
-            return stats
+            self.history_sink.flush()
+            with self._db_lock:
+                if user_id is None:
+                    return usage_rollups.category_totals(self.conn)
+                return usage_rollups.user_totals(self.conn, user_id)
         except:
             return {}
 
+    def get_daily_usage(self, since=None, until=None, category=None):
+        """✅ DAILY USAGE - (day, category, count) rows, since <= day < until"""
+        try:
+            self.history_sink.flush()
+            with self._db_lock:
+                return usage_rollups.daily(self.conn, since, until, category)
+        except:
+            return []
+
     def close(self):
         """✅ CLEANUP"""
+        self.discard_prewarm()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        if getattr(self, 'retention', None) is not None:
+            self.retention.stop()
+        if hasattr(self, 'history_sink'):
+            self.history_sink.close()
         if hasattr(self, 'conn'):
             self.conn.close()
 
@@ -595,6 +1027,11 @@ def handle_command(text: str) -> str:
     res = engine.execute_command(text)
     return res.get("message", "Done.")
 
-# Auto-close on exit
+# Auto-close on exit (only an engine that was actually started)
 import atexit
-atexit.register(lambda: get_engine().close())
+
+def _close_engine():
+    if _engine_instance is not None:
+        _engine_instance.close()
+
+atexit.register(_close_engine)
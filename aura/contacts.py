@@ -0,0 +1,391 @@
+# aura/contacts.py
+"""
+Indexed contact lookup for calls, WhatsApp and email.
+
+A name is resolved in this order:
+  1. exact name (hash lookup)
+  2. a contact name starting with what was said ("sin" -> "sinchana"),
+     or a contact name that what was said starts with ("ammas" -> "amma")
+  3. any word of a contact name starting with it ("kumar" -> "ravi kumar")
+  4. same phonetic key: a Metaphone-style key first, then Soundex
+     ("sinchna", "sinchanaa" -> "sinchana"), best spelling match wins,
+     if its spelling is close enough (PHONETIC_MIN_RATIO; "me" is not "mom")
+
+ContactStore keeps everything in memory (hash + prefix trie + phonetic
+dicts). SQLiteContactStore keeps the same keys in indexed SQLite
+columns, for address books too big to hold and rescan in memory.
+"""
+
+import difflib
+import json
+import os
+import re
+import sqlite3
+import threading
+from typing import Dict, List, Optional
+
+CONTACTS_DB_ENV = "AURA_CONTACTS_DB"
+# spelling similarity (difflib ratio) a phonetic match needs to count
+PHONETIC_MIN_RATIO = 0.6
+
+
+# ---------- phonetic keys ----------
+_SOUNDEX_CODES = {}
+for _letters, _code in (("bfpv", "1"), ("cgjkqsxz", "2"), ("dt", "3"),
+                        ("l", "4"), ("mn", "5"), ("r", "6")):
+    for _ch in _letters:
+        _SOUNDEX_CODES[_ch] = _code
+
+
+def soundex(name: str) -> str:
+    """Classic 4-character American Soundex ("robert" -> "R163")."""
+    letters = [ch for ch in name.lower() if ch.isalpha()]
+    if not letters:
+        return ""
+    first = letters[0]
+    out = [first.upper()]
+    prev = _SOUNDEX_CODES.get(first, "")
+    for ch in letters[1:]:
+        code = _SOUNDEX_CODES.get(ch, "")
+        if code and code != prev:
+            out.append(code)
+            if len(out) == 4:
+                break
+        if ch not in "hw":          # h / w do not separate equal codes
+            prev = code
+    return "".join(out).ljust(4, "0")
+
+
+# ordered rewrite rules, applied left to right (simplified Metaphone)
+_METAPHONE_RULES = [
+    (r"^kn|^gn|^pn|^wr", lambda m: m.group(0)[1]),
+    (r"^x", lambda m: "s"),
+    (r"x", lambda m: "ks"),
+    (r"ph", lambda m: "f"),
+    (r"ck", lambda m: "k"),
+    (r"sch", lambda m: "sk"),
+    (r"tch|sh|ch", lambda m: "x"),
+    (r"th", lambda m: "0"),
+    (r"dg(?=[eiy])", lambda m: "j"),
+    (r"c(?=[eiy])", lambda m: "s"),
+    (r"g(?=[eiy])", lambda m: "j"),
+    (r"q", lambda m: "k"),
+    (r"c", lambda m: "k"),
+    (r"z", lambda m: "s"),
+    (r"v", lambda m: "f"),
+    (r"(?<=[^aeiou])h|h(?=[^aeiou]|$)", lambda m: ""),
+    (r"w(?=[^aeiou]|$)", lambda m: ""),
+    (r"y(?=[^aeiou]|$)", lambda m: ""),
+]
+_METAPHONE_RES = [(re.compile(p), f) for p, f in _METAPHONE_RULES]
+
+
+def metaphone(name: str) -> str:
+    """
+    Simplified Metaphone key: consonant skeleton after common English
+    (and transliterated Indian) sound rewrites. Vowels are kept only at
+    the start. "sinchana" / "sinchna" -> "SNXN", "philip" / "filip" -> "FLP".
+    """
+    word = re.sub(r"[^a-z]", "", name.lower())
+    if not word:
+        return ""
+    for pattern, repl in _METAPHONE_RES:
+        word = pattern.sub(repl, word)
+    if not word:
+        return ""
+    head, tail = word[0], re.sub(r"[aeiou]", "", word[1:])
+    key = head + tail
+    # collapse doubled letters ("amma" -> "AM")
+    key = re.sub(r"(.)\1+", r"\1", key)
+    return key.upper()
+
+
+def normalize_name(name: str) -> str:
+    return " ".join(re.sub(r"[^\w\s]", " ", (name or "").lower()).split())
+
+
+# ---------- prefix trie ----------
+class _Trie:
+    """Sorted-name prefix trie; each node is {char: node, "$": name}."""
+
+    def __init__(self):
+        self.root = {}
+
+    def add(self, word: str, name: str):
+        node = self.root
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node.setdefault("$", set()).add(name)
+
+    def remove(self, word: str, name: str):
+        node = self.root
+        for ch in word:
+            node = node.get(ch)
+            if node is None:
+                return
+        node.get("$", set()).discard(name)
+
+    def starting_with(self, prefix: str, limit: int = 10) -> List[str]:
+        """Up to `limit` names filed under words starting with `prefix`, shortest first."""
+        node = self.root
+        for ch in prefix:
+            node = node.get(ch)
+            if node is None:
+                return []
+        found, level = [], [node]
+        # breadth-first, so shorter words come first
+        while level and len(found) < limit:
+            nxt = []
+            for n in level:
+                found.extend(sorted(n.get("$", ())))
+                nxt.extend(n[ch] for ch in sorted(k for k in n if k != "$"))
+            level = nxt
+        return found[:limit]
+
+    def prefixes_of(self, text: str) -> List[str]:
+        """Names filed under words that `text` starts with, longest first."""
+        node, found = self.root, []
+        for ch in text:
+            node = node.get(ch)
+            if node is None:
+                break
+            found = sorted(node.get("$", ())) + found
+        return found
+
+
+# ---------- stores ----------
+class ContactStore:
+    """In-memory contact index. `contacts` is {name: {"phone", "email", ...}}."""
+
+    def __init__(self, contacts: Dict[str, dict] = None):
+        self._lock = threading.Lock()
+        self.contacts: Dict[str, dict] = {}
+        self._names = _Trie()           # full names
+        self._words = _Trie()           # every word of every name
+        self._metaphone: Dict[str, set] = {}
+        self._soundex: Dict[str, set] = {}
+        for name, info in (contacts or {}).items():
+            self.add(name, info)
+
+    def __len__(self):
+        return len(self.contacts)
+
+    def __contains__(self, name):
+        return normalize_name(name) in self.contacts
+
+    def names(self) -> List[str]:
+        return list(self.contacts)
+
+    def add(self, name: str, info: dict):
+        key = normalize_name(name)
+        if not key:
+            return
+        with self._lock:
+            if key in self.contacts:
+                self.contacts[key] = info
+                return
+            self.contacts[key] = info
+            self._names.add(key, key)
+            for word in key.split():
+                self._words.add(word, key)
+                self._metaphone.setdefault(metaphone(word), set()).add(key)
+                self._soundex.setdefault(soundex(word), set()).add(key)
+
+    def remove(self, name: str):
+        key = normalize_name(name)
+        with self._lock:
+            if self.contacts.pop(key, None) is None:
+                return
+            self._names.remove(key, key)
+            for word in key.split():
+                self._words.remove(word, key)
+                self._metaphone.get(metaphone(word), set()).discard(key)
+                self._soundex.get(soundex(word), set()).discard(key)
+
+    # -------- lookup primitives (overridden by SQLiteContactStore) --------
+    def _get(self, key: str) -> Optional[dict]:
+        return self.contacts.get(key)
+
+    def _starting_with(self, key: str) -> List[str]:
+        return self._names.starting_with(key, limit=1)
+
+    def _prefixes_of(self, key: str) -> List[str]:
+        return self._names.prefixes_of(key)
+
+    def _word_starting_with(self, key: str) -> List[str]:
+        return self._words.starting_with(key, limit=10)
+
+    def _phonetic(self, column: str, code: str) -> List[str]:
+        table = self._metaphone if column == "metaphone" else self._soundex
+        return sorted(table.get(code, ()))
+
+    # -------- lookup --------
+    def resolve(self, name: str) -> Optional[str]:
+        """The stored contact name `name` most likely refers to, or None."""
+        key = normalize_name(name)
+        if not key:
+            return None
+        with self._lock:
+            if self._get(key) is not None:
+                return key
+
+            for found in (self._starting_with(key), self._prefixes_of(key),
+                          self._word_starting_with(key)):
+                if found:
+                    return found[0]
+
+            # phonetic: every word of the spoken name votes for contacts
+            for column, fn in (("metaphone", metaphone), ("soundex", soundex)):
+                candidates = set()
+                for word in key.split():
+                    code = fn(word)
+                    if code:
+                        candidates.update(self._phonetic(column, code))
+                if candidates:
+                    ratios = {c: difflib.SequenceMatcher(None, key, c).ratio() for c in candidates}
+                    best = max(sorted(candidates), key=ratios.get)
+                    if ratios[best] >= PHONETIC_MIN_RATIO:
+                        return best
+        return None
+
+    def find(self, name: str) -> Optional[dict]:
+        """Contact info for a spoken/typed name, or None."""
+        key = self.resolve(name)
+        if key is None:
+            return None
+        with self._lock:
+            return self._get(key)
+
+
+class SQLiteContactStore(ContactStore):
+    """
+    Same lookups against an SQLite table with B-tree indexes on name,
+    each name word, and both phonetic keys. Only matched rows are read.
+    """
+
+    def __init__(self, path: str, contacts: Dict[str, dict] = None):
+        self.path = path
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.executescript('''
+            CREATE TABLE IF NOT EXISTS contacts (
+                name TEXT PRIMARY KEY,
+                info TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS contact_words (
+                word TEXT NOT NULL,
+                name TEXT NOT NULL,
+                metaphone TEXT NOT NULL,
+                soundex TEXT NOT NULL,
+                PRIMARY KEY (word, name)
+            );
+            CREATE INDEX IF NOT EXISTS idx_contact_words_metaphone ON contact_words(metaphone);
+            CREATE INDEX IF NOT EXISTS idx_contact_words_soundex ON contact_words(soundex);
+        ''')
+        self.conn.commit()
+        super().__init__()
+        if contacts:
+            self.add_many(contacts)
+
+    def __len__(self):
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM contacts").fetchone()[0]
+
+    def __contains__(self, name):
+        with self._lock:
+            return self._get(normalize_name(name)) is not None
+
+    def names(self) -> List[str]:
+        with self._lock:
+            return [r[0] for r in self.conn.execute("SELECT name FROM contacts ORDER BY name")]
+
+    def add(self, name: str, info: dict):
+        key = normalize_name(name)
+        if not key:
+            return
+        with self._lock:
+            self.conn.execute("INSERT OR REPLACE INTO contacts (name, info) VALUES (?, ?)",
+                              (key, json.dumps(info)))
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO contact_words (word, name, metaphone, soundex) VALUES (?, ?, ?, ?)",
+                [(w, key, metaphone(w), soundex(w)) for w in key.split()],
+            )
+            self.conn.commit()
+
+    def add_many(self, contacts: Dict[str, dict]):
+        rows, words = [], []
+        for name, info in contacts.items():
+            key = normalize_name(name)
+            if key:
+                rows.append((key, json.dumps(info)))
+                words.extend((w, key, metaphone(w), soundex(w)) for w in key.split())
+        with self._lock:
+            self.conn.executemany("INSERT OR REPLACE INTO contacts (name, info) VALUES (?, ?)", rows)
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO contact_words (word, name, metaphone, soundex) VALUES (?, ?, ?, ?)",
+                words,
+            )
+            self.conn.commit()
+
+    def remove(self, name: str):
+        key = normalize_name(name)
+        with self._lock:
+            self.conn.execute("DELETE FROM contacts WHERE name = ?", (key,))
+            self.conn.execute("DELETE FROM contact_words WHERE name = ?", (key,))
+            self.conn.commit()
+
+    # -------- lookup primitives --------
+    def _get(self, key):
+        row = self.conn.execute("SELECT info FROM contacts WHERE name = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _starting_with(self, key):
+        # range scan on the primary key = prefix match, shortest first
+        rows = self.conn.execute(
+            "SELECT name FROM contacts WHERE name >= ? AND name < ? "
+            "ORDER BY length(name), name LIMIT 1",
+            (key, key + "\uffff"),
+        ).fetchall()
+        return [r[0] for r in rows]
+
+    def _prefixes_of(self, key):
+        prefixes = [key[:i] for i in range(len(key), 0, -1)]
+        marks = ",".join("?" * len(prefixes))
+        rows = self.conn.execute(
+            f"SELECT name FROM contacts WHERE name IN ({marks}) ORDER BY length(name) DESC, name",
+            prefixes,
+        ).fetchall()
+        return [r[0] for r in rows]
+
+    def _word_starting_with(self, key):
+        rows = self.conn.execute(
+            "SELECT DISTINCT name FROM contact_words WHERE word >= ? AND word < ? "
+            "ORDER BY length(word), name LIMIT 10",
+            (key, key + "\uffff"),
+        ).fetchall()
+        return [r[0] for r in rows]
+
+    def _phonetic(self, column, code):
+        rows = self.conn.execute(
+            f"SELECT DISTINCT name FROM contact_words WHERE {column} = ? ORDER BY name LIMIT 50",
+            (code,),
+        ).fetchall()
+        return [r[0] for r in rows]
+
+    def close(self):
+        self.conn.close()
+
+
+def open_contact_store(contacts: Dict[str, dict]) -> ContactStore:
+    """
+    In-memory store, or an SQLite-backed one when AURA_CONTACTS_DB is set
+    (`contacts` are merged into it, so data/contacts.json stays the source).
+    """
+    path = os.getenv(CONTACTS_DB_ENV)
+    if path:
+        try:
+            store = SQLiteContactStore(path)
+            store.add_many(contacts)
+            return store
+        except Exception as e:
+            print(f"⚠️ Contact DB unavailable ({e}), using memory")
+    return ContactStore(contacts)
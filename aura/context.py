@@ -1,52 +1,28 @@
-import os
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Optional, List, Dict
 
-import mysql.connector
-from dotenv import load_dotenv
-
-load_dotenv()
+from aura import history_journal
 
 # ---------- DB LOGGING ----------
-
-_db = None
-_cursor = None
+# Nothing here touches MySQL on import or on the caller's thread: turns
+# are buffered in the local journal (aura/history_journal.py) and its
+# background syncer ships them once the pool is up, so a slow or
+# missing server never delays startup or a command.
 
 
-def _connect():
-    global _db, _cursor
-    if _db:
-        return
-    try:
-        _db = mysql.connector.connect(
-            host=os.getenv("DB_HOST", "localhost"),
-            user=os.getenv("DB_USER", "root"),
-            password=os.getenv("DB_PASSWORD", ""),
-            database=os.getenv("DB_NAME", "aura_db"),
-            auth_plugin="mysql_native_password",
-        )
-        _cursor = _db.cursor()
-    except Exception:
-        _db, _cursor = None, None
+def save_history(command: str, response: str, user_id=None, mode: str = "text"):
+    """Buffer one turn for MySQL table command_history."""
+    history_journal.record(user_id, command, response[:255], mode)
 
 
-_connect()
-
-
-def save_history(command: str, response: str):
-    """Persist one turn into MySQL table command_history."""
-    if not _cursor:
+def save_history_many(rows, user_id=None, mode: str = "text"):
+    """Buffer many (command, response) turns in one local transaction."""
+    if not rows:
         return
-    try:
-        _cursor.execute(
-            "INSERT INTO command_history (user_command, aura_response, created_at) "
-            "VALUES (%s, %s, %s)",
-            (command, response[:255], datetime.now()),
-        )
-        _db.commit()
-    except Exception:
-        pass
+    history_journal.record_many(
+        [(user_id, command, response[:255], mode, None) for command, response in rows]
+    )
 
 
 # ---------- IN‑MEMORY CONTEXT ----------
@@ -0,0 +1,250 @@
+# aura/db_pool.py
+"""
+One shared MySQL connection pool for every module that talks to MySQL
+(history, auth, command logging, the typo miner).
+
+Opening a mysql.connector connection costs a TCP + auth handshake, and
+saving one history row used to pay it every time. The pool is created on
+first use from the .env settings below (DB_HOST, DB_USER, ...), which
+db.py and aura/database.py import rather than read again. Connections
+are health-checked when checked out, and a borrowed connection's close()
+just hands it back.
+
+    from aura import db_pool
+
+    db_pool.executemany(sql, rows)      # one transaction, one multi-row INSERT
+
+    with db_pool.connection() as conn:
+        cur = conn.cursor()
+        ...
+
+Every connect attempt gives up after DB_CONNECT_TIMEOUT seconds (5 by
+default) instead of the OS TCP timeout. warm_up() creates the pool on a
+background thread, so startup can overlap the handshake with building
+the UI and never waits for it.
+
+Every checkout goes through the shared "mysql" circuit breaker
+(aura/circuit_breaker.py). Connection failures, and connections lost
+mid-query inside connection(), count against it. Once it opens,
+get_connection() raises DatabaseUnavailable at once instead of waiting
+out a connect timeout, until a probe gets through. History is not
+written here directly: it goes to the local history journal
+(aura/history_journal.py), whose syncer ships it with executemany()
+once the server is reachable.
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from mysql.connector import Error, errors, pooling
+from mysql.connector.errors import PoolError
+
+from aura.circuit_breaker import CircuitOpenError, get_breaker
+
+POOL_NAME = "aura"
+POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+CHECKOUT_TIMEOUT = 5.0      # seconds to wait for a free connection
+CONNECT_TIMEOUT = int(os.getenv("DB_CONNECT_TIMEOUT", "5"))   # seconds per connect
+
+# same defaults the original aura/context.py connection used, so an .env
+# that relied on them keeps connecting (DB_AUTH_PLUGIN= turns the plugin off)
+DB_HOST = os.getenv("DB_HOST", "localhost")
+DB_USER = os.getenv("DB_USER", "root")
+DB_PASSWORD = os.getenv("DB_PASSWORD", "")
+DB_NAME = os.getenv("DB_NAME", "aura_db")
+DB_AUTH_PLUGIN = os.getenv("DB_AUTH_PLUGIN", "mysql_native_password")
+
+# errors that say the server / network is gone, not that the SQL was bad
+NETWORK_ERRORS = tuple(
+    getattr(errors, name) for name in (
+        "InterfaceError", "OperationalError",
+        "ConnectionTimeoutError", "ReadTimeoutError", "WriteTimeoutError",
+    ) if hasattr(errors, name)
+)
+
+
+class DatabaseUnavailable(Error, CircuitOpenError):
+    """The MySQL circuit is open: failed fast, nothing was attempted."""
+
+
+_breaker = get_breaker("mysql")
+_pool = None
+_pool_lock = threading.Lock()
+_ready = threading.Event()
+_warming = None
+_stats = {"checkouts": 0, "waits": 0, "reconnects": 0, "errors": 0, "rejected": 0}
+
+
+def db_config() -> dict:
+    config = {
+        "host": DB_HOST,
+        "user": DB_USER,
+        "password": DB_PASSWORD,
+        "database": DB_NAME,
+        "connection_timeout": CONNECT_TIMEOUT,
+    }
+    if os.getenv("DB_PORT"):
+        config["port"] = int(os.getenv("DB_PORT"))
+    if DB_AUTH_PLUGIN:
+        config["auth_plugin"] = DB_AUTH_PLUGIN
+    return config
+
+
+def get_pool() -> pooling.MySQLConnectionPool:
+    """The shared pool, created on first use (callers go through the breaker)."""
+    global _pool
+    if _pool is not None:
+        return _pool
+    with _pool_lock:
+        if _pool is not None:
+            return _pool
+        try:
+            _pool = pooling.MySQLConnectionPool(
+                pool_name=POOL_NAME,
+                pool_size=POOL_SIZE,
+                pool_reset_session=True,
+                **db_config(),
+            )
+            _ready.set()
+        except Error as e:
+            _stats["errors"] += 1
+            print(f"[db_pool] MYSQL CONNECTION ERROR: {e}")
+            raise
+    return _pool
+
+
+def warm_up() -> threading.Thread:
+    """Create the pool in the background; returns at once."""
+    global _warming
+
+    def _run():
+        if not _breaker.allow():
+            return
+        try:
+            get_pool()
+            _breaker.record_success()
+        except Exception as e:
+            _breaker.record_failure(e)     # the next user retries
+            print(f"[db_pool] MySQL unavailable at startup ({DB_USER}@{DB_HOST}/{DB_NAME}); "
+                  f"history stays in the local journal until it connects")
+
+    with _pool_lock:
+        if _pool is None and (_warming is None or not _warming.is_alive()):
+            _warming = threading.Thread(target=_run, name="aura-db-warmup", daemon=True)
+            _warming.start()
+        return _warming
+
+
+def is_ready() -> bool:
+    return _ready.is_set()
+
+
+def wait_ready(timeout: float = None) -> bool:
+    """True once the pool exists (False if `timeout` passes first)."""
+    return _ready.wait(timeout)
+
+
+def get_connection(timeout: float = CHECKOUT_TIMEOUT):
+    """
+    Borrow a live pooled connection; close() returns it to the pool.
+    Waits up to `timeout` seconds when every connection is in use.
+    Raises DatabaseUnavailable without trying while the circuit is open.
+    """
+    if not _breaker.allow():
+        _stats["rejected"] += 1
+        raise DatabaseUnavailable(msg="MySQL unavailable (circuit open)")
+    try:
+        conn = _checkout(timeout)
+    except PoolError:
+        _breaker.release()      # every connection busy: says nothing about the server
+        raise
+    except Error as e:
+        _breaker.record_failure(e)
+        raise
+    _breaker.record_success()
+    return conn
+
+
+def _checkout(timeout):
+    pool = get_pool()
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            conn = pool.get_connection()
+            break
+        except PoolError:
+            if time.monotonic() >= deadline:
+                raise
+            _stats["waits"] += 1
+            time.sleep(0.01)
+    _stats["checkouts"] += 1
+
+    # health check: a connection idle in the pool may have been dropped
+    # by the server (wait_timeout) or the network
+    try:
+        if not conn.is_connected():
+            _stats["reconnects"] += 1
+            conn.reconnect(attempts=2, delay=0)
+    except Error:
+        _stats["errors"] += 1
+        conn.close()
+        raise
+    return conn
+
+
+@contextmanager
+def connection(timeout: float = CHECKOUT_TIMEOUT):
+    conn = get_connection(timeout)
+    try:
+        yield conn
+    except NETWORK_ERRORS as e:
+        _breaker.record_failure(e)      # lost the server mid-query
+        raise
+    finally:
+        conn.close()
+
+
+def execute(sql: str, params=(), prepared: bool = True) -> int:
+    """Run one write statement and commit. Returns the affected row count."""
+    with connection() as conn:
+        cursor = conn.cursor(prepared=prepared)
+        try:
+            cursor.execute(sql, params)
+            conn.commit()
+            return cursor.rowcount
+        finally:
+            cursor.close()
+
+
+def executemany(sql: str, rows, prepared: bool = False) -> int:
+    """
+    Run a write statement for every row, in one transaction. The plain
+    cursor rewrites INSERTs into one multi-row statement; a prepared one
+    would execute row by row.
+    """
+    rows = list(rows)
+    if not rows:
+        return 0
+    with connection() as conn:
+        cursor = conn.cursor(prepared=prepared)
+        try:
+            cursor.executemany(sql, rows)
+            conn.commit()
+            return len(rows)
+        finally:
+            cursor.close()
+
+
+def stats() -> dict:
+    out = dict(_stats)
+    out["pool_size"] = POOL_SIZE
+    out["ready"] = _ready.is_set()
+    out["connect_timeout_s"] = CONNECT_TIMEOUT
+    out["breaker"] = _breaker.stats()
+    return out
@@ -12,12 +12,15 @@ def get_engine():
     return _get_engine()
 
 
-def execute(text: str, *args, **kwargs) -> str:
+def execute(text: str, *args, user_id=None, mode="text", min_confidence: float = 0.0,
+            **kwargs) -> str:
     """
-    Legacy API. Extra args/kwargs (like min_confidence) are ignored.
+    Legacy API. Trigger phrases matching below min_confidence are
+    ignored; other extra args/kwargs are ignored.
     """
     engine = _get_engine()
-    result = engine.execute_command(text)
+    result = engine.execute_command(text, user_id=user_id, mode=mode,
+                                    min_confidence=min_confidence)
     return result.get("message", "Done.")
 
 
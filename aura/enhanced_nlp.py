@@ -3,6 +3,60 @@
 import re
 from datetime import datetime
 
+from aura.parse_cache import ParseCache
+
+EMAIL_RE = re.compile(r"[\w\.-]+@[\w\.-]+\.\w+")
+QUOTED_RE = re.compile(r'"([^"]*)"')
+TOKEN_RE = re.compile(r"\w+")
+
+
+class ParsedUtterance:
+    """
+    One input, tokenized once and shared by every extractor.
+
+    tokens are the lowercase word-character runs of the input; offsets[i] is the
+    (start, end) span of tokens[i] in raw / lower (computed on first use).
+    """
+
+    __slots__ = ("raw", "lower", "tokens", "token_set", "_offsets")
+
+    def __init__(self, raw: str):
+        self.raw = raw
+        self.lower = raw.lower()
+        self.tokens = TOKEN_RE.findall(self.lower)
+        self.token_set = frozenset(self.tokens)
+        self._offsets = None
+
+    @property
+    def offsets(self):
+        if self._offsets is None:
+            self._offsets = [m.span() for m in TOKEN_RE.finditer(self.lower)]
+        return self._offsets
+
+    def __repr__(self):
+        return f"ParsedUtterance({self.raw!r})"
+
+
+def _name_index(names):
+    """name -> priority for one-word names, plus the multi-word ones in order."""
+    single, multi = {}, []
+    for rank, name in enumerate(names):
+        if " " in name:
+            multi.append((rank, name))
+        else:
+            single.setdefault(name, rank)
+    return single, multi
+
+
+def _first_known(u: ParsedUtterance, index):
+    """Highest-priority known name among the utterance's tokens."""
+    single, multi = index
+    hits = [(single[t], t) for t in u.token_set & single.keys()]
+    if multi:
+        padded = f" {' '.join(u.tokens)} "
+        hits += [(rank, name) for rank, name in multi if f" {name} " in padded]
+    return min(hits)[1] if hits else None
+
 
 class EnhancedNLP:
     """
@@ -10,7 +64,9 @@ class EnhancedNLP:
     Uses regex and keyword rules instead of heavy ML to stay offline.
     """
 
-    def __init__(self):
+    def __init__(self, cache_size: int = 256):
+        self.cache = ParseCache(cache_size)
+
         self.intent_patterns = {
             "music": r"(play|pause|stop|music|song|spotify|next|skip|previous|back)",
             "youtube": r"(youtube|yt\b|watch|video|vedio|utube)",
@@ -60,40 +116,7 @@ class EnhancedNLP:
             "whatsapp",
         ]
 
-    # -------- basic extractors --------
-    def extract_intent(self, user_input: str) -> str:
-        text = user_input.lower()
-        for intent, pattern in self.intent_patterns.items():
-            if re.search(pattern, text):
-                return intent
-        return "general"
-
-    def extract_email(self, user_input: str):
-        email_pattern = r"[\w\.-]+@[\w\.-]+\.\w+"
-        emails = re.findall(email_pattern, user_input)
-        return emails[0] if emails else None
-
-    def extract_app(self, user_input: str):
-        text = user_input.lower()
-        for app in self.known_apps:
-            if app in text:
-                return app
-        return None
-
-    def extract_website(self, user_input: str):
-        text = user_input.lower()
-        for site in self.known_websites:
-            if site in text:
-                return site
-        return None
-
-    def extract_number(self, user_input: str):
-        numbers = re.findall(r"\b\d+\b", user_input)
-        return [int(n) for n in numbers] if numbers else None
-
-    def extract_query(self, user_input: str):
-        text = user_input.lower()
-        keywords_to_remove = [
+        self.query_keywords = [
             "search for",
             "find",
             "google",
@@ -115,36 +138,91 @@ class EnhancedNLP:
             "can you",
             "could you",
         ]
-        query = text
-        for kw in keywords_to_remove:
+
+        self.compile_patterns()
+
+    def compile_patterns(self):
+        """
+        Precompile the intent table (in priority order) and drop cached
+        parses. Call again after editing any of the keyword tables.
+        """
+        self._intent_res = [
+            (intent, re.compile(pattern))
+            for intent, pattern in self.intent_patterns.items()
+        ]
+        self._app_index = _name_index(self.known_apps)
+        self._website_index = _name_index(self.known_websites)
+        self.cache.clear()
+
+    # -------- basic extractors --------
+    # each accepts the raw string or an already built ParsedUtterance
+    @staticmethod
+    def utterance(user_input) -> ParsedUtterance:
+        if type(user_input) is ParsedUtterance:
+            return user_input
+        return ParsedUtterance(user_input)
+
+    def extract_intent(self, user_input) -> str:
+        if isinstance(user_input, ParsedUtterance):
+            text = user_input.lower
+        else:
+            text = user_input.lower()
+        for intent, pattern in self._intent_res:
+            if pattern.search(text):
+                return intent
+        return "general"
+
+    def extract_email(self, user_input):
+        if isinstance(user_input, ParsedUtterance):
+            user_input = user_input.raw
+        found = EMAIL_RE.search(user_input)
+        return found.group(0) if found else None
+
+    def extract_app(self, user_input):
+        """First known app (in known_apps order) that is a word of the input."""
+        return _first_known(self.utterance(user_input), self._app_index)
+
+    def extract_website(self, user_input):
+        """First known website (in known_websites order) that is a word of the input."""
+        return _first_known(self.utterance(user_input), self._website_index)
+
+    def extract_number(self, user_input):
+        u = self.utterance(user_input)
+        numbers = [int(t) for t in u.tokens if t.isdecimal()]
+        return numbers or None
+
+    def extract_query(self, user_input):
+        query = self.utterance(user_input).lower
+        for kw in self.query_keywords:
             query = query.replace(kw, "")
         return query.strip()
 
     # -------- combined parsing --------
-    def extract_entities(self, user_input: str):
+    def extract_entities(self, user_input):
+        u = self.utterance(user_input)
         entities: dict = {}
 
-        email = self.extract_email(user_input)
+        email = self.extract_email(u)
         if email:
             entities["email"] = email
 
-        app = self.extract_app(user_input)
+        app = self.extract_app(u)
         if app:
             entities["app"] = app
 
-        website = self.extract_website(user_input)
+        website = self.extract_website(u)
         if website:
             entities["website"] = website
 
-        numbers = self.extract_number(user_input)
+        numbers = self.extract_number(u)
         if numbers:
             entities["numbers"] = numbers
 
-        query = self.extract_query(user_input)
+        query = self.extract_query(u)
         if query and len(query) > 2:
             entities["query"] = query
 
-        quoted = re.findall(r'"([^"]*)"', user_input)
+        quoted = QUOTED_RE.findall(u.raw)
         if quoted:
             entities["quoted"] = quoted
 
@@ -152,8 +230,17 @@ class EnhancedNLP:
 
     def parse(self, user_input: str):
         """Return (intent, entities) pair."""
-        intent = self.extract_intent(user_input)
-        entities = self.extract_entities(user_input)
+        # surrounding whitespace never changes the result
+        key = user_input.strip()
+        cached = self.cache.get(key)
+        if cached is None:
+            u = ParsedUtterance(user_input)
+            cached = (self.extract_intent(u), self.extract_entities(u))
+            self.cache.put(key, cached)
+
+        intent, entities = cached
+        # fresh copy per call; raw input and timestamp are never cached
+        entities = {k: list(v) if isinstance(v, list) else v for k, v in entities.items()}
         entities["raw_input"] = user_input
         entities["timestamp"] = datetime.now().isoformat()
         return intent, entities
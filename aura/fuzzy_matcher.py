@@ -1,7 +1,9 @@
 ﻿# aura/fuzzy_matcher.py
 
-from fuzzywuzzy import fuzz
-from fuzzywuzzy import process
+from aura.symspell_index import SymSpellIndex
+
+# correct() only rewrites the input when the match scores above this
+MATCH_CUTOFF = 80
 
 class FuzzyMatcher:
     """Auto-correct typos in user commands"""
@@ -24,26 +26,58 @@ class FuzzyMatcher:
             'pause music': ['paus music', 'pause muzic'],
             'next song': ['nxt song', 'next track'],
         }
+        # typo -> correction mined from history (see aura/typo_miner.py)
+        self.learned = {}
+        self.build_index()
+
+    def build_index(self):
+        """Index every canonical command, then every known misspelling."""
+        self.index = SymSpellIndex()
+        for command in self.correct_commands:
+            self.index.add(command, command)
+        for command, misspellings in self.correct_commands.items():
+            for typo in misspellings:
+                self.index.add(typo, command)
+
+    def add_command(self, command, misspellings=()):
+        """Register a command (and typos) without rebuilding the index."""
+        known = self.correct_commands.setdefault(command, [])
+        self.index.add(command, command)
+        for typo in misspellings:
+            if typo not in known:
+                known.append(typo)
+            self.index.add(typo, command)
+
+    def add_correction(self, typo, correction):
+        """
+        Learn one typo -> correction pair. It resolves exactly from now on.
+        Typos of a known command also join the fuzzy index, so near
+        variants of them match too. Nothing is rebuilt.
+        """
+        typo, correction = typo.lower().strip(), correction.lower().strip()
+        if not typo or typo == correction:
+            return
+        self.learned[typo] = correction
+        if correction in self.correct_commands:
+            self.add_command(correction, [typo])
+
+    def load_corrections(self, pairs):
+        for typo, correction in pairs:
+            self.add_correction(typo, correction)
     
     def correct(self, user_input):
         """Auto-correct input using fuzzy matching"""
         user_input_lower = user_input.lower().strip()
+
+        learned = self.learned.get(user_input_lower)
+        if learned:
+            return learned
         
         try:
-            # process.extractOne returns (match, score) tuple
-            result = process.extractOne(
-                user_input_lower,
-                self.correct_commands.keys(),
-                scorer=fuzz.token_set_ratio,
-                score_cutoff=70
-            )
-            
-            # Check if result exists and unpack properly
+            # (command, token_set_ratio score) or None
+            result = self.index.lookup(user_input_lower, cutoff=MATCH_CUTOFF)
             if result:
-                matched_command, confidence_score = result  # FIXED: Unpack tuple
-                
-                if confidence_score > 80:
-                    return matched_command
+                return result[0]
             
             return user_input_lower
         
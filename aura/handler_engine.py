@@ -0,0 +1,296 @@
+# aura/handler_engine.py
+"""
+Keyword handler registry with vectorized confidence scoring.
+
+When a handler is registered, every keyword of every handler becomes one
+row of a character n-gram TF-IDF matrix. An utterance is turned into an
+n-gram presence vector and scored against all keywords with a single
+matrix-vector product. A handler's confidence is the score of its best
+keyword, so `min_confidence` is a real threshold and the top-k handlers
+are available for disambiguation.
+
+A keyword only scores when every one of its words is present in the
+utterance, either exactly or as a close typo ("chrom" for "chrome",
+difflib ratio >= WORD_MATCH_CUTOFF). Partial n-gram overlap alone
+("restart" vs "start", "volume up" vs "set volume to") never lets a
+handler win. This coverage check is a second matrix product, over a
+keyword x word matrix. Typo candidates come from a symmetric-delete
+index of the keyword words (aura/symspell_index.py), so only a handful
+of words are compared per utterance word, never the whole vocabulary.
+
+An utterance is scored once; confidence_for() / handler.matches() for
+the same text reuse that score vector.
+"""
+
+import difflib
+import math
+from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from aura.symspell_index import deletes
+
+NGRAM_SIZE = 3
+# how close an utterance word must be to a keyword word to cover it
+# (0.85 accepts "chrom"/"chrome", rejects "restart"/"start")
+WORD_MATCH_CUTOFF = 0.85
+# one edit (via symmetric deletes) is all 0.85 allows; shorter words
+# cannot stay above the cutoff after any edit
+TYPO_DISTANCE = 1
+TYPO_MIN_LENGTH = 4
+
+# Tiny per-character bonus so that, at equal scores, the more specific
+# keyword wins ("open chrome" beats "open" for "open chrome").
+_LENGTH_TIEBREAK = 1e-6
+
+
+class CommandCategory(Enum):
+    SYSTEM = "system"
+    ENTERTAINMENT = "entertainment"
+    INFORMATION = "information"
+    PRODUCTIVITY = "productivity"
+    OTHER = "other"
+
+
+def char_ngrams(text: str, n: int = NGRAM_SIZE) -> set:
+    """Character n-grams of each space-padded word ("chrome" -> " ch", "chr", ...)."""
+    grams = set()
+    for word in text.lower().split():
+        padded = f" {word} "
+        for i in range(len(padded) - n + 1):
+            grams.add(padded[i:i + n])
+    return grams
+
+
+class SimpleKeywordHandler:
+    """
+    A named command handler triggered by keywords.
+    A handler whose only keyword is "" is a fallback: it runs when no
+    other handler clears the confidence threshold.
+    """
+
+    def __init__(self, name: str, keywords: List[str],
+                 response_func: Callable[[str], str],
+                 category: CommandCategory = CommandCategory.OTHER):
+        self.name = name
+        self.keywords = [k.lower().strip() for k in keywords]
+        self.response_func = response_func
+        self.category = category
+        self._engine = None
+
+    @property
+    def is_fallback(self) -> bool:
+        return not any(self.keywords)
+
+    def matches(self, text: str) -> float:
+        """Confidence (0..1) that this handler should take `text`."""
+        if self._engine is not None:
+            return self._engine.confidence_for(self.name, text)
+        text = text.lower()
+        return 1.0 if any(k and k in text for k in self.keywords) else 0.0
+
+
+@dataclass
+class HandlerMatch:
+    handler_name: str
+    confidence: float
+    category: CommandCategory
+
+
+class EnhancedCommandEngine:
+    """Registry of keyword handlers with TF-IDF confidence scoring."""
+
+    def __init__(self):
+        self.handlers: Dict[str, SimpleKeywordHandler] = {}
+        self._names: List[str] = []
+        self._fallback: Optional[str] = None
+        self._history = []
+
+        self._vocab: Dict[str, int] = {}
+        self._matrix = np.zeros((0, 0))
+        self._row_bonus = np.zeros(0)
+        self._row_starts = np.zeros(0, dtype=np.intp)
+        self._scored = np.zeros(0, dtype=np.intp)
+        self._words: Dict[str, int] = {}
+        self._word_matrix = np.zeros((0, 0))
+        self._row_word_counts = np.zeros(0)
+        self._word_deletes: Dict[str, set] = {}
+        self._last_score = (None, np.zeros(0))     # (text, scores) of the last utterance
+
+    # -------- registration --------
+    def register_handler(self, name: str, handler: SimpleKeywordHandler):
+        if name not in self.handlers:
+            self._names.append(name)
+        self.handlers[name] = handler
+        handler._engine = self
+        if handler.is_fallback:
+            self._fallback = name
+        self._build_matrix()
+
+    def _build_matrix(self):
+        """Rebuild the keyword x n-gram TF-IDF matrix (rows grouped by handler)."""
+        docs, owners, lengths, kw_words = [], [], [], []
+        for idx, name in enumerate(self._names):
+            for kw in self.handlers[name].keywords:
+                if kw:
+                    docs.append(char_ngrams(kw))
+                    owners.append(idx)
+                    lengths.append(len(kw))
+                    kw_words.append(set(kw.split()))
+
+        vocab: Dict[str, int] = {}
+        df: Dict[str, int] = {}
+        for grams in docs:
+            for g in grams:
+                vocab.setdefault(g, len(vocab))
+                df[g] = df.get(g, 0) + 1
+
+        n_docs = len(docs)
+        idf = np.zeros(len(vocab))
+        for g, i in vocab.items():
+            idf[i] = math.log((1 + n_docs) / (1 + df[g])) + 1.0
+
+        matrix = np.zeros((n_docs, len(vocab)))
+        for row, grams in enumerate(docs):
+            cols = [vocab[g] for g in grams]
+            matrix[row, cols] = idf[cols]
+            # L1-normalise: a row scores 1.0 when all its n-grams are present
+            matrix[row] /= matrix[row].sum()
+
+        # keyword x word incidence, for the whole-word coverage check
+        words: Dict[str, int] = {}
+        for ws in kw_words:
+            for w in ws:
+                words.setdefault(w, len(words))
+        word_matrix = np.zeros((n_docs, len(words)))
+        for row, ws in enumerate(kw_words):
+            word_matrix[row, [words[w] for w in ws]] = 1.0
+
+        owners = np.array(owners, dtype=np.intp)
+        self._vocab = vocab
+        self._matrix = matrix
+        self._words = words
+        self._word_matrix = word_matrix
+        self._row_word_counts = word_matrix.sum(axis=1)
+        word_deletes: Dict[str, set] = {}
+        for w in words:
+            if len(w) >= TYPO_MIN_LENGTH:
+                for d in deletes(w, TYPO_DISTANCE):
+                    word_deletes.setdefault(d, set()).add(w)
+        self._word_deletes = word_deletes
+        self._last_score = (None, np.zeros(0))
+        self._row_bonus = np.array(lengths, dtype=float) * _LENGTH_TIEBREAK
+        # handlers that own at least one row, and where their rows start
+        self._scored, self._row_starts = np.unique(owners, return_index=True)
+
+    # -------- scoring --------
+    def score(self, text: str) -> np.ndarray:
+        """Confidence of every handler (registration order) for `text`."""
+        last_text, last_scores = self._last_score
+        if text == last_text:
+            return last_scores
+        scores = self._score(text)
+        self._last_score = (text, scores)
+        return scores
+
+    def _score(self, text: str) -> np.ndarray:
+        scores = np.zeros(len(self._names))
+        if not len(self._scored):
+            return scores
+
+        query = np.zeros(len(self._vocab))
+        cols = [self._vocab[g] for g in char_ngrams(text) if g in self._vocab]
+        if not cols:
+            return scores
+        query[cols] = 1.0
+
+        per_keyword = self._matrix @ query
+        per_keyword *= self._covered(text)
+        per_keyword += self._row_bonus * (per_keyword > 0)
+        scores[self._scored] = np.maximum.reduceat(per_keyword, self._row_starts)
+        return scores
+
+    def _covered(self, text: str) -> np.ndarray:
+        """1.0 for keywords whose every word appears in `text` (typos allowed)."""
+        present = np.zeros(len(self._words))
+        for word in set(text.lower().split()):
+            if word in self._words:
+                present[self._words[word]] = 1.0
+                continue
+            if len(word) < TYPO_MIN_LENGTH:
+                continue
+            candidates = set()
+            for d in deletes(word, TYPO_DISTANCE):
+                candidates |= self._word_deletes.get(d, set())
+            for close in candidates:
+                if difflib.SequenceMatcher(None, word, close).ratio() >= WORD_MATCH_CUTOFF:
+                    present[self._words[close]] = 1.0
+        return (self._word_matrix @ present >= self._row_word_counts).astype(float)
+
+    def confidence_for(self, name: str, text: str) -> float:
+        scores = self.score(text)
+        return float(min(1.0, scores[self._names.index(name)]))
+
+    def top_matches(self, text: str, k: int = 3,
+                    min_confidence: float = 0.0) -> List[HandlerMatch]:
+        """The k best handlers for `text` at or above `min_confidence`."""
+        scores = self.score(text)
+        # stable sort keeps registration order for exact ties
+        order = np.argsort(-scores, kind="stable")
+        matches = []
+        for idx in order[:k]:
+            confidence = float(min(1.0, scores[idx]))
+            if confidence <= 0.0 or confidence < min_confidence:
+                break
+            name = self._names[idx]
+            matches.append(HandlerMatch(name, confidence, self.handlers[name].category))
+        return matches
+
+    def find_best_match(self, text: str, min_confidence: float = 0.5) -> Optional[HandlerMatch]:
+        matches = self.top_matches(text, k=1, min_confidence=min_confidence)
+        return matches[0] if matches else None
+
+    # -------- execution --------
+    def execute(self, text: str, min_confidence: float = 0.5) -> str:
+        text = (text or "").strip()
+        if not text:
+            return "Please say something."
+
+        match = self.find_best_match(text, min_confidence)
+        if match:
+            name, confidence = match.handler_name, match.confidence
+        elif self._fallback:
+            name, confidence = self._fallback, 0.0
+        else:
+            return "Sorry, I didn't understand that."
+
+        try:
+            response = self.handlers[name].response_func(text.lower())
+        except Exception as e:
+            response = f"❌ {name} failed: {e}"
+
+        self._history.append({
+            "timestamp": datetime.now().isoformat(),
+            "command": text,
+            "handler": name,
+            "confidence": round(confidence, 3),
+            "response": response,
+        })
+        self._history = self._history[-50:]
+        return response
+
+    def get_history(self, limit: int = 20):
+        return self._history[-limit:]
+
+    def get_handler_info(self) -> dict:
+        return {
+            name: {
+                "keywords": h.keywords,
+                "category": h.category.value,
+                "fallback": h.is_fallback,
+            }
+            for name, h in self.handlers.items()
+        }
@@ -0,0 +1,421 @@
+# aura/history_journal.py
+"""
+Offline-first command history for MySQL.
+
+Every turn is first appended to a local SQLite journal. That is one
+WAL commit on the caller's thread and works with the network down.
+JournalSyncer ships unsent rows to MySQL `command_history` in large
+executemany batches from a background thread:
+
+  * each row carries a client_uuid, UNIQUE in command_history. A
+    duplicate uuid is a no-op (ON DUPLICATE KEY UPDATE), so if the
+    process dies after MySQL committed but before the journal marked the
+    batch, the replay changes nothing and every row lands exactly once.
+    Any other rejection (a user_id missing from `users`, a NULL in a NOT
+    NULL column) is still an error, not a warning.
+  * before the first pass the syncer checks that command_history has
+    client_uuid and its unique key, and adds them to older tables. If
+    it may not ALTER the table it falls back to a plain INSERT (a replay
+    after a crash can then duplicate a batch).
+  * a row is marked (synced_at) only after its batch committed. A batch
+    MySQL rejects for its data (constraint, "Data too long", "Incorrect
+    string value", ...) is resent row by row: a row whose user is unknown is
+    sent without the user, and a row MySQL still refuses is marked
+    rejected (with the error) rather than synced, so it cannot block
+    the rows behind it. After a network failure the syncer backs off
+    (up to MAX_BACKOFF seconds) and resumes from the first unmarked row.
+  * synced rows are kept: the journal is append-only apart from the
+    marker, and prune() drops synced and rejected rows older than a cutoff.
+  * while the shared MySQL circuit breaker is open, a pass is refused
+    without touching the network. The syncer then keeps its normal
+    interval instead of backing off, so the pass that runs once the
+    probe is due is the probe.
+
+    journal = get_journal()
+    journal.append([(user_id, "open chrome", "✅ Opening chrome...", "voice", None)])
+    get_syncer().start()
+"""
+
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import List, Optional
+
+from aura.circuit_breaker import CircuitOpenError, get_breaker
+
+JOURNAL_DB = os.getenv("AURA_JOURNAL_DB", "aura_history_journal.db")
+SYNC_BATCH = 1000
+SYNC_INTERVAL = 5.0         # seconds between sync passes when idle
+MAX_BACKOFF = 300.0         # seconds, after repeated failures
+
+INSERT_REMOTE_SQL = (
+    "INSERT INTO command_history "
+    "(client_uuid, user_id, user_command, aura_response, input_mode, timestamp) "
+    "VALUES (%s, %s, %s, %s, %s, %s) "
+    "ON DUPLICATE KEY UPDATE client_uuid = client_uuid"
+)
+# command_history without client_uuid that we may not ALTER: not idempotent
+INSERT_REMOTE_PLAIN_SQL = (
+    "INSERT INTO command_history "
+    "(user_id, user_command, aura_response, input_mode, timestamp) "
+    "VALUES (%s, %s, %s, %s, %s)"
+)
+FK_ERRNO = 1452             # ER_NO_REFERENCED_ROW_2: user_id not in `users`
+# errors about the table or the account, not the row: retried with backoff
+# (no database / table / column, access denied)
+SCHEMA_ERRNOS = {1044, 1045, 1046, 1049, 1054, 1142, 1146}
+
+
+class HistoryJournal:
+    """Append-only local journal of history rows waiting for / sent to MySQL."""
+
+    def __init__(self, path: str = JOURNAL_DB):
+        self.path = path
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.execute('''
+                CREATE TABLE IF NOT EXISTS history_journal (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    client_uuid TEXT NOT NULL UNIQUE,
+                    user_id INTEGER,
+                    user_command TEXT,
+                    aura_response TEXT,
+                    input_mode TEXT NOT NULL,
+                    created_at TEXT NOT NULL,
+                    synced_at TEXT,
+                    rejected TEXT
+                )
+            ''')
+            columns = [r[1] for r in self.conn.execute("PRAGMA table_info(history_journal)")]
+            if "rejected" not in columns:
+                self.conn.execute("ALTER TABLE history_journal ADD COLUMN rejected TEXT")
+            # only unsent rows are indexed, so finding them never scans history
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_journal_unsent_v2 ON history_journal(id) "
+                "WHERE synced_at IS NULL AND rejected IS NULL"
+            )
+            self.conn.execute("DROP INDEX IF EXISTS idx_journal_unsent")
+            self.conn.commit()
+
+    def append(self, rows) -> int:
+        """
+        rows of (user_id, command, response, mode, created_at or None).
+        One local transaction; returns the number of rows appended.
+        """
+        now = datetime.now().isoformat()
+        values = [
+            (str(uuid.uuid4()), user_id, command, response, mode or "text", created_at or now)
+            for user_id, command, response, mode, created_at in rows
+        ]
+        if not values:
+            return 0
+        with self._lock:
+            with self.conn:
+                self.conn.executemany(
+                    "INSERT INTO history_journal "
+                    "(client_uuid, user_id, user_command, aura_response, input_mode, created_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    values,
+                )
+        return len(values)
+
+    def unsent(self, limit: int = SYNC_BATCH) -> List[tuple]:
+        """Oldest unsent rows: (id, client_uuid, user_id, command, response, mode, created_at)."""
+        with self._lock:
+            return self.conn.execute(
+                "SELECT id, client_uuid, user_id, user_command, aura_response, input_mode, created_at "
+                "FROM history_journal WHERE synced_at IS NULL AND rejected IS NULL "
+                "ORDER BY id LIMIT ?",
+                (limit,),
+            ).fetchall()
+
+    def mark_synced(self, ids):
+        now = datetime.now().isoformat()
+        with self._lock:
+            with self.conn:
+                self.conn.executemany(
+                    "UPDATE history_journal SET synced_at = ? WHERE id = ?",
+                    [(now, i) for i in ids],
+                )
+
+    def mark_rejected(self, rejected):
+        """(id, error) pairs MySQL refused; they are kept but not resent."""
+        with self._lock:
+            with self.conn:
+                self.conn.executemany(
+                    "UPDATE history_journal SET rejected = ? WHERE id = ?",
+                    [(error, i) for i, error in rejected],
+                )
+
+    def pending(self) -> int:
+        with self._lock:
+            return self.conn.execute(
+                "SELECT COUNT(*) FROM history_journal WHERE synced_at IS NULL AND rejected IS NULL"
+            ).fetchone()[0]
+
+    def rejected_count(self) -> int:
+        with self._lock:
+            return self.conn.execute(
+                "SELECT COUNT(*) FROM history_journal WHERE rejected IS NOT NULL"
+            ).fetchone()[0]
+
+    def prune(self, before: str) -> int:
+        """Delete synced and rejected rows created before the ISO timestamp `before`."""
+        with self._lock:
+            with self.conn:
+                cur = self.conn.execute(
+                    "DELETE FROM history_journal "
+                    "WHERE (synced_at IS NOT NULL OR rejected IS NOT NULL) AND created_at < ?",
+                    (before,),
+                )
+        return cur.rowcount
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+
+def _is_row_error(e) -> bool:
+    """MySQL refused the data itself, so resending it will not help."""
+    from aura import db_pool
+    return not isinstance(e, db_pool.NETWORK_ERRORS + (db_pool.DatabaseUnavailable,
+                                                       db_pool.PoolError)) \
+        and e.errno not in SCHEMA_ERRNOS
+
+
+def _remote_time(value):
+    try:
+        return datetime.fromisoformat(value).replace(microsecond=0)
+    except:
+        return None
+
+
+class JournalSyncer:
+    """Background thread: journal -> MySQL command_history, in batches."""
+
+    def __init__(self, journal: HistoryJournal, batch_size: int = SYNC_BATCH,
+                 interval: float = SYNC_INTERVAL):
+        self.journal = journal
+        self.batch_size = batch_size
+        self.interval = interval
+        self.sent = 0
+        self.failures = 0
+        self.deferred = 0
+        self.last_error = None
+        self.last_sync = None
+        self._backoff = 0.0
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._sync_lock = threading.Lock()
+        self._thread = None
+        self._insert_sql = None     # chosen by _check_remote_schema()
+
+    def sync_once(self) -> int:
+        """Ship every unsent row now. Returns rows sent; raises on failure."""
+        from aura import db_pool
+
+        total = 0
+        with self._sync_lock:
+            if self._insert_sql is None:
+                self._insert_sql = self._check_remote_schema()
+            while True:
+                rows = self.journal.unsent(self.batch_size)
+                if not rows:
+                    break
+                try:
+                    db_pool.executemany(self._insert_sql, [self._remote_row(r) for r in rows])
+                    sent = [r[0] for r in rows]
+                except db_pool.Error as e:
+                    if not _is_row_error(e):
+                        raise
+                    # the whole batch was rolled back: find the bad rows
+                    sent = self._send_each(rows)
+                # committed remotely: mark it; a crash right here only causes a
+                # replay that the duplicate client_uuid turns into a no-op
+                self.journal.mark_synced(sent)
+                total += len(sent)
+                self.sent += len(sent)
+                if len(rows) < self.batch_size:
+                    break
+        self.last_sync = datetime.now().isoformat()
+        return total
+
+    def _remote_row(self, row, drop_user: bool = False):
+        _, client_uuid, user_id, command, response, mode, created_at = row
+        values = (None if drop_user else user_id, command, response, mode,
+                  _remote_time(created_at))
+        return values if self._insert_sql == INSERT_REMOTE_PLAIN_SQL else (client_uuid,) + values
+
+    def _send_each(self, rows) -> List[int]:
+        """Resend a rejected batch one row at a time; returns the ids that landed."""
+        from aura import db_pool
+
+        sent, rejected = [], []
+        for row in rows:
+            try:
+                db_pool.execute(self._insert_sql, self._remote_row(row), prepared=False)
+                sent.append(row[0])
+                continue
+            except db_pool.Error as e:
+                if not _is_row_error(e):
+                    raise
+                error = e
+            if error.errno == FK_ERRNO and row[2] is not None:
+                # user unknown to MySQL: keep the turn, drop the link
+                try:
+                    db_pool.execute(self._insert_sql, self._remote_row(row, drop_user=True),
+                                    prepared=False)
+                    sent.append(row[0])
+                    continue
+                except db_pool.Error as e:
+                    if not _is_row_error(e):
+                        raise
+                    error = e
+            rejected.append((row[0], str(error)))
+        if rejected:
+            self.journal.mark_rejected(rejected)
+            print(f"[history_journal] MySQL rejected {len(rejected)} row(s): {rejected[0][1]}")
+        return sent
+
+    def _check_remote_schema(self) -> str:
+        """
+        Make sure command_history has client_uuid + its unique key (tables
+        created before the journal lack them). Returns the INSERT to use.
+        """
+        from aura import db_pool
+
+        with db_pool.connection() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute(
+                    "SELECT COUNT(*) FROM information_schema.COLUMNS WHERE TABLE_SCHEMA = DATABASE() "
+                    "AND TABLE_NAME = 'command_history' AND COLUMN_NAME = 'client_uuid'"
+                )
+                has_column = cursor.fetchone()[0] > 0
+                cursor.execute(
+                    "SELECT COUNT(*) FROM information_schema.STATISTICS WHERE TABLE_SCHEMA = DATABASE() "
+                    "AND TABLE_NAME = 'command_history' AND COLUMN_NAME = 'client_uuid' "
+                    "AND NON_UNIQUE = 0"
+                )
+                has_key = cursor.fetchone()[0] > 0
+                if has_column and has_key:
+                    return INSERT_REMOTE_SQL
+                changes = [] if has_column else ["ADD COLUMN client_uuid CHAR(36) NULL"]
+                changes.append("ADD CONSTRAINT uq_history_client_uuid UNIQUE (client_uuid)")
+                try:
+                    cursor.execute(f"ALTER TABLE command_history {', '.join(changes)}")
+                    print("[history_journal] added client_uuid to command_history")
+                    return INSERT_REMOTE_SQL
+                except db_pool.NETWORK_ERRORS:
+                    raise
+                except db_pool.Error as e:
+                    print(f"[history_journal] cannot add client_uuid ({e}); "
+                          f"syncing without replay protection")
+                    return INSERT_REMOTE_SQL if has_column else INSERT_REMOTE_PLAIN_SQL
+            finally:
+                cursor.close()
+
+    def notify(self):
+        """New rows were appended; sync soon (unless backing off)."""
+        self._wake.set()
+
+    def _loop(self):
+        while not self._stop.is_set():
+            try:
+                self.sync_once()
+                self._backoff = 0.0
+                self.last_error = None
+            except CircuitOpenError as e:
+                # MySQL known to be down: nothing was attempted, try again
+                # next interval (the breaker decides when to really probe)
+                self.deferred += 1
+                self.last_error = str(e)
+                self._backoff = 0.0
+            except Exception as e:
+                self.failures += 1
+                self.last_error = str(e)
+                self._backoff = min(MAX_BACKOFF, max(self.interval, self._backoff * 2))
+            if self._backoff:
+                # failing: ignore notify() until the backoff has passed
+                self._stop.wait(self._backoff)
+            else:
+                self._wake.wait(self.interval)
+            self._wake.clear()
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name="aura-journal-sync", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: float = 2.0):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def stats(self) -> dict:
+        return {
+            "pending": self.journal.pending(),
+            "sent": self.sent,
+            "rejected": self.journal.rejected_count(),
+            "failures": self.failures,
+            "deferred": self.deferred,
+            "circuit": get_breaker("mysql").state,
+            "backoff_s": self._backoff,
+            "last_error": self.last_error,
+            "last_sync": self.last_sync,
+        }
+
+
+# ---------- process-wide journal + syncer ----------
+_journal: Optional[HistoryJournal] = None
+_syncer: Optional[JournalSyncer] = None
+_init_lock = threading.Lock()
+
+
+def get_journal() -> HistoryJournal:
+    global _journal
+    with _init_lock:
+        if _journal is None:
+            _journal = HistoryJournal()
+        return _journal
+
+
+def get_syncer() -> JournalSyncer:
+    """The shared syncer, started on first use."""
+    global _syncer
+    journal = get_journal()
+    with _init_lock:
+        if _syncer is None:
+            _syncer = JournalSyncer(journal).start()
+        return _syncer
+
+
+def record(user_id, command, response, mode="text", created_at=None) -> bool:
+    """Journal one history row and nudge the syncer. Never touches the network."""
+    try:
+        get_journal().append([(user_id, command, response, mode, created_at)])
+        get_syncer().notify()
+        return True
+    except Exception as e:
+        print(f"[history_journal] append failed: {e}")
+        return False
+
+
+def record_many(rows) -> int:
+    """rows of (user_id, command, response, mode, created_at or None)."""
+    try:
+        count = get_journal().append(rows)
+        get_syncer().notify()
+        return count
+    except Exception as e:
+        print(f"[history_journal] append failed: {e}")
+        return 0
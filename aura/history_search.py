@@ -0,0 +1,236 @@
+# aura/history_search.py
+"""
+Searchable local mirror of command + response history.
+
+The `history` table (in aura_commands.db, next to `commands`) keeps every
+turn with its user, input mode and category. It is filled by the
+HistorySink "search" backend. An external-content FTS5 table indexes
+the command and response text (and the category, so text + category
+queries are answered inside the index), kept in sync by triggers.
+
+    idx = HistoryIndex(conn)
+    page = idx.search("weather", since="2026-10-11", categories=["weather"])
+    more = idx.search("weather", since="2026-10-11", categories=["weather"],
+                      cursor=page["next_cursor"])
+
+Pages are newest first and use keyset pagination on the row id
+(`id < cursor`). Ids only grow, so fetching page N costs the same as
+page 1. Rows are appended in time order, so since / until become an id
+range via the timestamp index. Text queries walk the FTS index in rowid
+order; other filters use the (category, id) and (user_id, id) indexes.
+A query never scans the whole table.
+"""
+
+import re
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+from typing import Iterable, List, Optional
+
+PAGE_SIZE = 20
+MAX_PAGE_SIZE = 500
+# the FTS index also stores 2..PREFIX_MAX character prefixes, so a
+# half-typed last word is an index lookup rather than a term-range merge
+PREFIX_MAX = 6
+
+SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS history (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        timestamp TEXT NOT NULL,
+        user_id INTEGER,
+        mode TEXT,
+        category TEXT,
+        command TEXT,
+        response TEXT
+    );
+    CREATE INDEX IF NOT EXISTS idx_history_time ON history(timestamp);
+    CREATE INDEX IF NOT EXISTS idx_history_category ON history(category, id);
+    CREATE INDEX IF NOT EXISTS idx_history_user ON history(user_id, id);
+
+    CREATE VIRTUAL TABLE IF NOT EXISTS history_fts USING fts5(
+        command, response, category,
+        content='history', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2',
+        prefix='2 3 4 5 6'
+    );
+    CREATE TRIGGER IF NOT EXISTS history_fts_insert AFTER INSERT ON history BEGIN
+        INSERT INTO history_fts(rowid, command, response, category)
+        VALUES (new.id, new.command, new.response, new.category);
+    END;
+    CREATE TRIGGER IF NOT EXISTS history_fts_delete AFTER DELETE ON history BEGIN
+        INSERT INTO history_fts(history_fts, rowid, command, response, category)
+        VALUES ('delete', old.id, old.command, old.response, old.category);
+    END;
+'''
+
+INSERT_SQL = (
+    "INSERT INTO history (timestamp, user_id, mode, category, command, response) "
+    "VALUES (?, ?, ?, ?, ?, ?)"
+)
+
+_COLUMNS = ("id", "timestamp", "user_id", "mode", "category", "command", "response")
+_WORD_RE = re.compile(r"\w+")
+
+# panel / API shorthands for time ranges
+RANGES = {
+    "today": lambda now: now.replace(hour=0, minute=0, second=0, microsecond=0),
+    "7d": lambda now: now - timedelta(days=7),
+    "30d": lambda now: now - timedelta(days=30),
+}
+
+
+def ensure_schema(conn: sqlite3.Connection):
+    conn.executescript(SCHEMA)
+    conn.commit()
+
+
+def fts_query(text: str) -> Optional[str]:
+    """
+    User text -> FTS5 query: every word must match, the last one as a
+    prefix while it is short enough for the prefix index ("open chr"
+    finds "open chrome"). Words are quoted, so FTS operators typed by the
+    user are searched for literally.
+    """
+    words = _WORD_RE.findall(text or "")
+    if not words:
+        return None
+    terms = [f'"{w}"' for w in words]
+    if 2 <= len(words[-1]) <= PREFIX_MAX:
+        terms[-1] += "*"
+    return " ".join(terms)
+
+
+def since_for(range_name: str, now: datetime = None) -> Optional[str]:
+    """ISO start time for a RANGES shorthand, or None for "any time"."""
+    fn = RANGES.get(range_name)
+    return fn(now or datetime.now()).isoformat() if fn else None
+
+
+class HistoryIndex:
+    """Query API over the mirror; safe to share between threads."""
+
+    def __init__(self, conn: sqlite3.Connection, lock: threading.Lock = None):
+        self.conn = conn
+        self._lock = lock or threading.Lock()
+        with self._lock:
+            ensure_schema(conn)
+
+    def search(self, text: str = None, since: str = None, until: str = None,
+               categories: Iterable[str] = None, user_id=None,
+               limit: int = PAGE_SIZE, cursor: int = None,
+               include_unowned: bool = False) -> dict:
+        """
+        One page of matching turns, newest first:
+            {"rows": [{id, timestamp, user_id, mode, category, command, response}],
+             "next_cursor": id to pass as `cursor` for the next page, or None}
+        since / until are ISO timestamps (inclusive / exclusive).
+        include_unowned keeps rows without a user (imported from
+        `commands`, or typed while logged out) in a user_id search.
+        """
+        limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+        categories = list(categories or [])
+        match = fts_query(text) if text else None
+        empty = {"rows": [], "next_cursor": None}
+
+        with self._lock:
+            # rows are appended in time order, so a time range is an id
+            # range: two seeks on the timestamp index, then every plan below
+            # walks ids from `hi` down and stops at `lo`
+            lo = hi = None
+            if since:
+                lo = self._first_id_at(since)
+                if lo is None:
+                    return empty
+            if until:
+                hi = self._first_id_at(until)
+            if cursor is not None:
+                hi = int(cursor) if hi is None else min(hi, int(cursor))
+
+            where, params = [], []
+            if lo is not None:
+                where.append("h.id >= ?")
+                params.append(lo)
+            if hi is not None:
+                where.append("h.id < ?")
+                params.append(hi)
+            if since:
+                where.append("h.timestamp >= ?")
+                params.append(since)
+            if until:
+                where.append("h.timestamp < ?")
+                params.append(until)
+            if categories:
+                where.append(f"h.category IN ({','.join('?' * len(categories))})")
+                params.extend(categories)
+            if user_id is not None:
+                where.append("(h.user_id = ? OR h.user_id IS NULL)" if include_unowned
+                             else "h.user_id = ?")
+                params.append(user_id)
+
+            cols = ", ".join(f"h.{c}" for c in _COLUMNS)
+            if match:
+                # the category filter goes into MATCH too, so FTS intersects
+                # posting lists instead of joining every text hit to `history`
+                match = f"{{command response}} : ({match})"
+                if categories:
+                    match += " AND category : (" + " OR ".join(
+                        '"' + c.replace('"', '""') + '"' for c in categories) + ")"
+                fts_where = ["history_fts MATCH ?"]
+                fts_params = [match]
+                if lo is not None:
+                    fts_where.append("history_fts.rowid >= ?")
+                    fts_params.append(lo)
+                if hi is not None:
+                    fts_where.append("history_fts.rowid < ?")
+                    fts_params.append(hi)
+                sql = (
+                    f"SELECT {cols} FROM history_fts JOIN history h ON h.id = history_fts.rowid "
+                    f"WHERE {' AND '.join(fts_where + where)} "
+                    f"ORDER BY history_fts.rowid DESC LIMIT ?"
+                )
+                params = fts_params + params
+            else:
+                sql = (
+                    f"SELECT {cols} FROM history h "
+                    f"{'WHERE ' + ' AND '.join(where) if where else ''} "
+                    f"ORDER BY h.id DESC LIMIT ?"
+                )
+            params.append(limit)
+            rows = self.conn.execute(sql, params).fetchall()
+
+        rows = [dict(zip(_COLUMNS, r)) for r in rows]
+        next_cursor = rows[-1]["id"] if len(rows) == limit else None
+        return {"rows": rows, "next_cursor": next_cursor}
+
+    def _first_id_at(self, timestamp: str) -> Optional[int]:
+        """Id of the first row at or after `timestamp` (None: past the end)."""
+        row = self.conn.execute(
+            "SELECT id FROM history WHERE timestamp >= ? ORDER BY timestamp, id LIMIT 1",
+            (timestamp,),
+        ).fetchone()
+        return row[0] if row else None
+
+    def categories(self) -> List[str]:
+        """Categories present in the mirror (walks the category index)."""
+        with self._lock:
+            return [r[0] for r in self.conn.execute(
+                "SELECT DISTINCT category FROM history WHERE category IS NOT NULL ORDER BY category"
+            )]
+
+    def import_commands(self) -> int:
+        """
+        One-time fill from the older `commands` table (no user / mode
+        columns there). Only runs while the mirror is empty.
+        """
+        with self._lock:
+            if self.conn.execute("SELECT 1 FROM history LIMIT 1").fetchone():
+                return 0
+            try:
+                with self.conn:
+                    cur = self.conn.execute(
+                        "INSERT INTO history (timestamp, category, command, response) "
+                        "SELECT timestamp, category, command, result FROM commands ORDER BY id"
+                    )
+                return cur.rowcount
+            except sqlite3.OperationalError:
+                return 0        # no commands table yet
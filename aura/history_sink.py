@@ -0,0 +1,391 @@
+# aura/history_sink.py
+"""
+One history pipeline: every command is recorded exactly once and fanned
+out to pluggable backends.
+
+    sink = HistorySink([SQLiteBackend("aura_commands.db"), MySQLBackend()])
+    sink.record("open chrome", "app", "✅ Opening chrome...", user_id=7, mode="voice")
+
+record() only appends to one bounded queue per backend and returns.
+Each backend has its own writer thread, which takes everything waiting
+(up to the backend's batch_size, or flush_interval seconds worth) and
+writes it in one batch: one SQLite transaction, one local journal
+transaction (shipped to MySQL in bulk later), one JSONL append. A slow or dead backend only fills its own
+queue; when that queue is full its records are dropped and counted.
+With tracing on, every batch shows up as a "history_write" span and a
+"history_queue_wait" sample (how long its oldest record was queued),
+both tagged with the backend.
+
+Backends come from aura_config.json "history" ({"backends": ["sqlite", "search",
+"mysql", "jsonl"], "jsonl": "logs/history.jsonl"}) or AURA_HISTORY
+("sqlite,search,mysql"). The default is sqlite + search + mysql.
+
+Builtin backends:
+  sqlite  `commands` table in aura_commands.db (WAL, synchronous=NORMAL)
+          plus its usage rollups (aura/usage_rollups.py)
+  search  full-text searchable `history` mirror in the same database
+          (aura/history_search.py)
+  mysql   `command_history`, via the local offline-first journal and its
+          background syncer (aura/history_journal.py)
+  jsonl   one JSON object per line
+"""
+
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+
+from aura import tracing
+
+CONFIG_FILE = Path("aura_config.json")
+DEFAULT_BACKENDS = ("sqlite", "search", "mysql")
+DEFAULT_JSONL = "logs/history.jsonl"
+
+MAX_QUEUE = 10000
+BATCH_SIZE = 500
+FLUSH_INTERVAL = 0.5        # seconds
+
+
+@dataclass
+class HistoryRecord:
+    command: str
+    category: Optional[str]
+    response: str
+    user_id: Optional[int] = None
+    mode: str = "text"
+    timestamp: str = field(default_factory=lambda: datetime.now().isoformat())
+
+
+COMMANDS_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS commands (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        timestamp TEXT,
+        command TEXT,
+        category TEXT,
+        result TEXT
+    )
+'''
+
+
+def ensure_commands_table(conn: sqlite3.Connection):
+    """The `commands` log, for the engine and for a sink opened on a fresh database."""
+    conn.execute(COMMANDS_SCHEMA)
+    conn.commit()
+
+
+def connect_sqlite(db_path: str, uri: bool = False) -> sqlite3.Connection:
+    """Connection in WAL mode, usable from any thread."""
+    conn = sqlite3.connect(db_path, uri=uri, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+# ---------- backends ----------
+class Backend:
+    """write() gets a list of HistoryRecords on the backend's own thread."""
+
+    name = "backend"
+    batch_size = BATCH_SIZE
+    flush_interval = FLUSH_INTERVAL
+
+    def open(self):
+        """Called once on the writer thread before the first write."""
+
+    def write(self, records: List[HistoryRecord]):
+        raise NotImplementedError
+
+    def close(self):
+        """Called on the writer thread after the last write."""
+
+
+class SQLiteBackend(Backend):
+    name = "sqlite"
+    INSERT_SQL = "INSERT INTO commands (timestamp, command, category, result) VALUES (?, ?, ?, ?)"
+
+    def __init__(self, db_path: str = "aura_commands.db", uri: bool = False):
+        self.db_path = db_path
+        self.uri = uri
+        self.conn = None
+
+    def open(self):
+        from aura import usage_rollups
+        self.conn = connect_sqlite(self.db_path, self.uri)
+        ensure_commands_table(self.conn)
+        usage_rollups.ensure_schema(self.conn)
+
+    def write(self, records):
+        from aura import usage_rollups
+        with self.conn:
+            self.conn.executemany(
+                self.INSERT_SQL,
+                [(r.timestamp, r.command, r.category, r.response) for r in records],
+            )
+            # usage counters move in the same transaction as the log
+            usage_rollups.apply(self.conn, records)
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+
+
+class SearchBackend(SQLiteBackend):
+    """`history` + its FTS5 index; the insert trigger keeps the index in step."""
+
+    name = "search"
+
+    def open(self):
+        from aura.history_search import ensure_schema
+        self.conn = connect_sqlite(self.db_path, self.uri)
+        ensure_schema(self.conn)
+
+    def write(self, records):
+        from aura.history_search import INSERT_SQL
+        with self.conn:
+            self.conn.executemany(
+                INSERT_SQL,
+                [(r.timestamp, r.user_id, r.mode, r.category, r.command, r.response)
+                 for r in records],
+            )
+
+
+class MySQLBackend(Backend):
+    """Journals locally; JournalSyncer ships the rows to MySQL."""
+
+    name = "mysql"
+
+    def open(self):
+        # start syncing right away: rows left unsent by a previous run resume
+        from aura import history_journal
+        history_journal.get_syncer()
+
+    def write(self, records):
+        from aura import history_journal
+        history_journal.get_journal().append(
+            [(r.user_id, r.command, r.response, r.mode, r.timestamp) for r in records]
+        )
+        history_journal.get_syncer().notify()
+
+
+class JSONLBackend(Backend):
+    name = "jsonl"
+
+    def __init__(self, path: str = DEFAULT_JSONL):
+        self.path = Path(path)
+
+    def open(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def write(self, records):
+        lines = "".join(json.dumps(asdict(r), ensure_ascii=False) + "\n" for r in records)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(lines)
+
+
+# ---------- per-backend queue + writer thread ----------
+class BatchWriter:
+    """Bounded queue -> one writer thread -> backend.write(batch)."""
+
+    def __init__(self, backend: Backend, max_queue: int = MAX_QUEUE):
+        self.backend = backend
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self._closed = False
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self.batches = 0
+        self.max_backlog = 0
+        self._thread = threading.Thread(
+            target=self._run, name=f"aura-history-{backend.name}", daemon=True
+        )
+        self._thread.start()
+
+    def put(self, record) -> bool:
+        """Queue one record. False if it was dropped (queue full or closed)."""
+        if self._closed:
+            with self._lock:
+                self.dropped += 1
+            return False
+        try:
+            self._queue.put_nowait((record, time.perf_counter()))
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            return False
+        backlog = self._queue.qsize()
+        if backlog > self.max_backlog:
+            self.max_backlog = backlog
+        return True
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Block until every record queued before this call is written."""
+        if not self._thread.is_alive():
+            return self._queue.empty()
+        done = threading.Event()
+        try:
+            self._queue.put(done, timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def close(self, timeout: float = 5.0):
+        if self._closed:
+            return
+        self.flush(timeout)
+        self._closed = True
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            pass
+        self._thread.join(timeout)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "written": self.written,
+                "dropped": self.dropped,
+                "failed": self.failed,
+                "batches": self.batches,
+                "backlog": self._queue.qsize(),
+                "max_backlog": self.max_backlog,
+            }
+
+    def _run(self):
+        backend = self.backend
+        try:
+            backend.open()
+        except Exception as e:
+            print(f"[history:{backend.name}] open failed: {e}")
+        try:
+            stop = False
+            while not stop:
+                item = self._queue.get()
+                rows, waiters, oldest = [], [], None
+                deadline = time.monotonic() + backend.flush_interval
+                # everything already queued, then whatever arrives before
+                # the flush interval ends
+                while True:
+                    if item is None:
+                        stop = True
+                    elif isinstance(item, threading.Event):
+                        waiters.append(item)
+                    else:
+                        record, queued = item
+                        rows.append(record)
+                        if oldest is None:
+                            oldest = queued
+                    if stop or waiters or len(rows) >= backend.batch_size:
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        item = self._queue.get(timeout=remaining)
+                    except queue.Empty:
+                        break
+                if rows:
+                    # how long the oldest record of the batch sat in the queue
+                    tracing.record("history_queue_wait", (time.perf_counter() - oldest) * 1000,
+                                   backend=backend.name, rows=len(rows))
+                self._write(rows)
+                for waiter in waiters:
+                    waiter.set()
+        finally:
+            try:
+                backend.close()
+            except Exception:
+                pass
+
+    def _write(self, rows):
+        if not rows:
+            return
+        try:
+            with tracing.span("history_write", backend=self.backend.name, rows=len(rows)):
+                self.backend.write(rows)
+            with self._lock:
+                self.written += len(rows)
+                self.batches += 1
+        except Exception as e:
+            with self._lock:
+                self.failed += len(rows)
+            print(f"[history:{self.backend.name}] write failed: {e}")
+
+
+# ---------- the sink ----------
+class HistorySink:
+    """Records each command once; every backend gets it asynchronously."""
+
+    def __init__(self, backends: List[Backend], max_queue: int = MAX_QUEUE):
+        self.writers = [BatchWriter(b, max_queue) for b in backends]
+
+    def record(self, command, category, response, user_id=None, mode="text") -> HistoryRecord:
+        rec = HistoryRecord(command, category, response, user_id, mode)
+        for writer in self.writers:
+            writer.put(rec)
+        return rec
+
+    def record_many(self, rows, user_id=None, mode="text"):
+        """rows of (command, category, response); one timestamp for all."""
+        now = datetime.now().isoformat()
+        for command, category, response in rows:
+            rec = HistoryRecord(command, category, response, user_id, mode, now)
+            for writer in self.writers:
+                writer.put(rec)
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        return all([w.flush(timeout) for w in self.writers])
+
+    def close(self, timeout: float = 5.0):
+        for writer in self.writers:
+            writer.close(timeout)
+
+    def stats(self) -> dict:
+        return {w.backend.name: w.stats() for w in self.writers}
+
+
+def configured_backends() -> List[str]:
+    """Backend names from AURA_HISTORY or aura_config.json "history"."""
+    env = os.getenv("AURA_HISTORY")
+    if env:
+        return [name.strip() for name in env.split(",") if name.strip()]
+    try:
+        setting = json.loads(CONFIG_FILE.read_text(encoding="utf-8")).get("history")
+        if isinstance(setting, dict) and setting.get("backends"):
+            return list(setting["backends"])
+    except:
+        pass
+    return list(DEFAULT_BACKENDS)
+
+
+def _jsonl_path() -> str:
+    try:
+        setting = json.loads(CONFIG_FILE.read_text(encoding="utf-8")).get("history")
+        if isinstance(setting, dict) and setting.get("jsonl"):
+            return setting["jsonl"]
+    except:
+        pass
+    return DEFAULT_JSONL
+
+
+def build_sink(db_path: str, uri: bool = False, backends: List[str] = None) -> HistorySink:
+    """HistorySink for the named backends (default: configured_backends())."""
+    made = []
+    for name in backends if backends is not None else configured_backends():
+        if name == "sqlite":
+            made.append(SQLiteBackend(db_path, uri))
+        elif name == "search":
+            made.append(SearchBackend(db_path, uri))
+        elif name == "mysql":
+            made.append(MySQLBackend())
+        elif name == "jsonl":
+            made.append(JSONLBackend(_jsonl_path()))
+        else:
+            print(f"[history] unknown backend {name!r} ignored")
+    return HistorySink(made)
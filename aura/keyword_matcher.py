@@ -0,0 +1,112 @@
+# aura/keyword_matcher.py
+"""
+Multi-pattern keyword matcher (Aho-Corasick) used by the command router.
+
+All trigger phrases are compiled once into a single automaton, so an
+utterance is scanned in one pass no matter how many phrases or
+categories are registered.
+"""
+
+from collections import deque
+from typing import Dict, Iterable, List, Tuple
+
+
+class KeywordMatcher:
+    """
+    Aho-Corasick automaton mapping trigger phrases to categories.
+
+        m = KeywordMatcher()
+        m.add_category("weather", ["weather", "forecast"])
+        m.match("weather in delhi")   # {"weather": [(0, 7)]}
+
+    Matching is plain substring matching, same as `phrase in text`.
+    """
+
+    def __init__(self, categories: Dict[str, Iterable[str]] = None):
+        # node 0 is the root; each node has goto edges, a fail link,
+        # the (category, phrase length) pairs of phrases ending exactly
+        # there (_own) and those plus every suffix state's (_out, built)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._own: List[List[Tuple[str, int]]] = [[]]
+        self._out: List[List[Tuple[str, int]]] = [[]]
+        self._built = False
+        self.phrase_count = 0
+
+        for category, phrases in (categories or {}).items():
+            self.add_category(category, phrases)
+
+    # -------- building --------
+    def add(self, phrase: str, category: str):
+        """Register one phrase for a category."""
+        phrase = phrase.lower()
+        if not phrase:
+            return
+
+        node = 0
+        for ch in phrase:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._own.append([])
+                self._out.append([])
+                self._goto[node][ch] = nxt
+            node = nxt
+
+        if (category, len(phrase)) in self._own[node]:
+            return      # already registered
+        self._own[node].append((category, len(phrase)))
+        self.phrase_count += 1
+        self._built = False
+
+    def add_category(self, category: str, phrases: Iterable[str]):
+        for phrase in phrases:
+            self.add(phrase, category)
+
+    def build(self):
+        """Compute fail links and outputs (BFS). Called lazily by match()."""
+        queue = deque()
+        # outputs are rebuilt from each node's own phrases, so building
+        # again after add() never repeats inherited matches
+        self._out = [list(own) for own in self._own]
+        for nxt in self._goto[0].values():
+            self._fail[nxt] = 0
+            queue.append(nxt)
+
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                f = self._fail[node]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                target = self._goto[f].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                # inherit outputs of the suffix state
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+        self._built = True
+
+    # -------- matching --------
+    def match(self, text: str) -> Dict[str, List[Tuple[int, int]]]:
+        """
+        Scan `text` once and return every matching category with the
+        (start, end) spans of its phrases, in order of occurrence.
+        """
+        if not self._built:
+            self.build()
+
+        goto, fail, out = self._goto, self._fail, self._out
+        found: Dict[str, List[Tuple[int, int]]] = {}
+        node = 0
+
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            for category, length in out[node]:
+                found.setdefault(category, []).append((i + 1 - length, i + 1))
+
+        return found
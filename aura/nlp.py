@@ -1,6 +1,14 @@
 # aura/nlp.py
+import os
 import re
 
+from aura.parse_cache import ParseCache
+
+# Parsed commands are cached by their lowercased, stripped text.
+PARSE_CACHE_SIZE = int(os.getenv("AURA_PARSE_CACHE_SIZE", "256"))
+_cache = ParseCache(PARSE_CACHE_SIZE)
+
+
 def parse_command(text: str):
     """
     Return (intent, params) based on simple, robust patterns.
@@ -10,7 +18,29 @@ def parse_command(text: str):
         return "unknown", {}
 
     t = text.lower().strip()
+    cached = _cache.get(t)
+    if cached is None:
+        cached = _parse(t)
+        _cache.put(t, cached)
+
+    intent, params = cached
+    return intent, dict(params)
+
+
+def clear_parse_cache():
+    """Forget cached parses, e.g. after changing the patterns below."""
+    _cache.clear()
+
+
+def set_parse_cache_size(size: int):
+    _cache.resize(size)
+
+
+def parse_cache_stats() -> dict:
+    return _cache.stats()
+
 
+def _parse(t: str):
     # --- Open app / site ---
     # e.g., "open chrome", "open snipping tool", "open youtube"
     m = re.match(r"^(open|launch|start)\s+(.+)$", t)
@@ -0,0 +1,60 @@
+# aura/parse_cache.py
+"""
+Bounded LRU cache for parser results.
+Voice users repeat the same few commands all day, so parsers keep their
+last N results keyed on the normalized utterance.
+"""
+
+from collections import OrderedDict
+from threading import Lock
+
+
+class ParseCache:
+    """Thread-safe LRU cache with hit / miss counters."""
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = max(0, int(maxsize))
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key):
+        """Return the cached value, or None on a miss."""
+        with self._lock:
+            value = self._data.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            if self.maxsize == 0:
+                return
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        """Drop every entry (e.g. after the keyword tables change)."""
+        with self._lock:
+            self._data.clear()
+
+    def resize(self, maxsize: int):
+        with self._lock:
+            self.maxsize = max(0, int(maxsize))
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+            }
@@ -0,0 +1,310 @@
+# aura/retention.py
+"""
+Retention for the local command log.
+
+Only the last `hot_days` of `commands` stay in aura_commands.db. Older
+rows are moved out in id order into time-partitioned, gzip-compressed
+JSON-lines segments:
+
+    data/archive/2026-07/commands-000000012345.jsonl.gz
+    data/archive/2026-08/commands-000000019876.jsonl.gz
+
+There is one directory per partition (a month, or a day with
+"segment": "day"). Each pass writes one part per partition, named after
+its first row id. A part is written to a temp file and renamed into
+place before its rows are deleted from the database, so a crash can at
+worst archive a row twice. query() drops those duplicates by id.
+
+The same pass also:
+  * trims the searchable `history` mirror to the hot window (its FTS
+    index follows through the delete trigger)
+  * prunes journal rows that were already synced to (or rejected by) MySQL
+Usage rollups are not touched, so lifetime stats survive archiving.
+
+Policy: aura_config.json "retention", either a number of hot days
+(30), false, or {"hot_days": 30, "segment": "month", "archive_dir":
+"data/archive", "interval_hours": 24}. AURA_RETENTION_DAYS overrides
+hot_days, and AURA_RETENTION_DAYS=0 turns retention off.
+
+    archiver = Archiver("aura_commands.db")
+    archiver.run()                                  # one pass now
+    archiver.query(since="2026-07-01", text="chrome")
+"""
+
+import gzip
+import json
+import os
+import sqlite3
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+
+CONFIG_FILE = Path("aura_config.json")
+BATCH_SIZE = 5000
+FIRST_RUN_DELAY = 60.0      # seconds after start, so cold start is not slowed
+
+_PART_GLOB = "commands-*.jsonl.gz"
+
+
+@dataclass
+class RetentionPolicy:
+    enabled: bool = True
+    hot_days: int = 30
+    segment: str = "month"              # "month" or "day"
+    archive_dir: str = "data/archive"
+    interval_hours: float = 24.0
+
+    def partition(self, timestamp: str) -> str:
+        return timestamp[:10] if self.segment == "day" else timestamp[:7]
+
+
+def load_policy() -> RetentionPolicy:
+    """Policy from aura_config.json "retention" and AURA_RETENTION_DAYS."""
+    policy = RetentionPolicy()
+    try:
+        setting = json.loads(CONFIG_FILE.read_text(encoding="utf-8")).get("retention")
+    except:
+        setting = None
+
+    if isinstance(setting, dict):
+        policy.enabled = bool(setting.get("enabled", True))
+        policy.hot_days = int(setting.get("hot_days", policy.hot_days))
+        policy.segment = setting.get("segment", policy.segment)
+        policy.archive_dir = setting.get("archive_dir", policy.archive_dir)
+        policy.interval_hours = float(setting.get("interval_hours", policy.interval_hours))
+    elif setting is False:
+        policy.enabled = False
+    elif isinstance(setting, (int, float)) and not isinstance(setting, bool):
+        policy.hot_days = int(setting)
+
+    env = os.getenv("AURA_RETENTION_DAYS")
+    if env:
+        try:
+            policy.hot_days = int(env)
+        except ValueError:
+            pass
+    if policy.hot_days <= 0:
+        policy.enabled = False
+    return policy
+
+
+class Archiver:
+    """Moves cold `commands` rows into segments; queries the segments."""
+
+    def __init__(self, db_path: str = "aura_commands.db", uri: bool = False,
+                 policy: RetentionPolicy = None):
+        self.db_path = db_path
+        self.uri = uri
+        self.policy = policy or load_policy()
+        self.root = Path(self.policy.archive_dir)
+        self.last_run = None
+        self.last_result = None
+        self._run_lock = threading.Lock()
+
+    # ---------- archiving ----------
+    def run(self, now: datetime = None) -> dict:
+        """One retention pass. Returns counts of what it moved / trimmed."""
+        from aura.history_sink import connect_sqlite
+
+        cutoff = ((now or datetime.now()) - timedelta(days=self.policy.hot_days)).isoformat()
+        result = {"cutoff": cutoff, "archived": 0, "parts": 0,
+                  "history_trimmed": 0, "journal_pruned": 0}
+        with self._run_lock:
+            conn = connect_sqlite(self.db_path, self.uri)
+            try:
+                while True:
+                    moved, parts = self._archive_batch(conn, cutoff)
+                    result["archived"] += moved
+                    result["parts"] += parts
+                    if moved < BATCH_SIZE:
+                        break
+                result["history_trimmed"] = self._trim_history(conn, cutoff)
+            finally:
+                conn.close()
+            result["journal_pruned"] = self._prune_journal(cutoff)
+        self.last_run = datetime.now().isoformat()
+        self.last_result = result
+        return result
+
+    def _archive_batch(self, conn, cutoff):
+        """Oldest rows by id, up to the first one inside the hot window."""
+        try:
+            rows = conn.execute(
+                "SELECT id, timestamp, command, category, result FROM commands "
+                "ORDER BY id LIMIT ?", (BATCH_SIZE,)
+            ).fetchall()
+        except sqlite3.OperationalError:
+            return 0, 0         # no commands table yet
+        cold = []
+        for row in rows:
+            if (row[1] or "") >= cutoff:
+                break
+            cold.append(row)
+        if not cold:
+            return 0, 0
+
+        partitions: Dict[str, List[tuple]] = {}
+        for row in cold:
+            partitions.setdefault(self.policy.partition(row[1] or "0000-00-00"), []).append(row)
+        for key, part_rows in partitions.items():
+            self._write_part(key, part_rows)
+
+        # every row up to the last archived id was in this batch
+        with conn:
+            conn.execute("DELETE FROM commands WHERE id <= ?", (cold[-1][0],))
+        return len(cold), len(partitions)
+
+    def _write_part(self, key: str, rows):
+        directory = self.root / key
+        directory.mkdir(parents=True, exist_ok=True)
+        final = directory / f"commands-{rows[0][0]:012d}.jsonl.gz"
+        tmp = final.with_suffix(".tmp")
+        with open(tmp, "wb") as raw:
+            with gzip.GzipFile(fileobj=raw, mode="wb") as gz:
+                for id_, timestamp, command, category, result in rows:
+                    gz.write((json.dumps({
+                        "id": id_, "timestamp": timestamp, "command": command,
+                        "category": category, "result": result,
+                    }, ensure_ascii=False) + "\n").encode("utf-8"))
+            raw.flush()
+            os.fsync(raw.fileno())
+        os.replace(tmp, final)
+
+    def _trim_history(self, conn, cutoff) -> int:
+        trimmed = 0
+        try:
+            while True:
+                with conn:
+                    cur = conn.execute(
+                        "DELETE FROM history WHERE id IN ("
+                        "  SELECT id FROM history WHERE timestamp < ? ORDER BY timestamp LIMIT ?)",
+                        (cutoff, BATCH_SIZE),
+                    )
+                trimmed += cur.rowcount
+                if cur.rowcount < BATCH_SIZE:
+                    break
+        except sqlite3.OperationalError:
+            pass                # no search mirror
+        return trimmed
+
+    def _prune_journal(self, cutoff) -> int:
+        from aura import history_journal
+        if not os.path.exists(history_journal.JOURNAL_DB):
+            return 0
+        try:
+            return history_journal.get_journal().prune(cutoff)
+        except Exception as e:
+            print(f"[retention] journal prune failed: {e}")
+            return 0
+
+    # ---------- reading ----------
+    def segments(self) -> List[str]:
+        """Partition keys that have archived parts, oldest first."""
+        if not self.root.is_dir():
+            return []
+        return sorted(d.name for d in self.root.iterdir()
+                      if d.is_dir() and any(d.glob(_PART_GLOB)))
+
+    def query(self, since: str = None, until: str = None, text: str = None,
+              category: str = None, limit: int = 100) -> List[dict]:
+        """
+        Archived rows, newest first. Only partitions overlapping
+        since <= timestamp < until are opened; text is a
+        case-insensitive substring of the command or result.
+        """
+        needle = text.lower() if text else None
+        found, seen = [], set()
+        for key in reversed(self.segments()):
+            if since and key < since[:len(key)]:
+                break
+            if until and key > until[:len(key)]:
+                continue
+            rows = []
+            for part in sorted((self.root / key).glob(_PART_GLOB)):
+                rows.extend(self._read_part(part))
+            for row in reversed(rows):
+                if row["id"] in seen:
+                    continue
+                ts = row.get("timestamp") or ""
+                if (since and ts < since) or (until and ts >= until):
+                    continue
+                if category and row.get("category") != category:
+                    continue
+                if needle and needle not in (row.get("command") or "").lower() \
+                        and needle not in (row.get("result") or "").lower():
+                    continue
+                seen.add(row["id"])
+                found.append(row)
+                if len(found) >= limit:
+                    return found
+        return found
+
+    def iter_rows(self):
+        """Every archived row once, oldest partition first (for recounts)."""
+        seen = set()
+        for key in self.segments():
+            for part in sorted((self.root / key).glob(_PART_GLOB)):
+                for row in self._read_part(part):
+                    if row["id"] not in seen:
+                        seen.add(row["id"])
+                        yield row
+
+    @staticmethod
+    def _read_part(path: Path) -> List[dict]:
+        rows = []
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                for line in f:
+                    rows.append(json.loads(line))
+        except (OSError, EOFError, ValueError) as e:
+            print(f"[retention] unreadable segment {path}: {e}")
+        return rows
+
+    def stats(self) -> dict:
+        parts = list(self.root.glob(f"*/{_PART_GLOB}")) if self.root.is_dir() else []
+        return {
+            "hot_days": self.policy.hot_days,
+            "segments": len(self.segments()),
+            "parts": len(parts),
+            "archive_bytes": sum(p.stat().st_size for p in parts),
+            "last_run": self.last_run,
+            "last_result": self.last_result,
+        }
+
+
+class RetentionWorker:
+    """Background thread: Archiver.run() shortly after start, then every interval."""
+
+    def __init__(self, archiver: Archiver, first_delay: float = FIRST_RUN_DELAY):
+        self.archiver = archiver
+        self.first_delay = first_delay
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._loop, name="aura-retention", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def _loop(self):
+        delay = self.first_delay
+        while not self._stop.wait(delay):
+            try:
+                self.archiver.run()
+            except Exception as e:
+                print(f"[retention] pass failed: {e}")
+            delay = self.archiver.policy.interval_hours * 3600
+
+    def stop(self, timeout: float = 2.0):
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join(timeout)
+
+
+def start_worker(db_path: str, uri: bool = False) -> Optional[RetentionWorker]:
+    """Background retention for the configured policy, or None if it is off."""
+    policy = load_policy()
+    if not policy.enabled:
+        return None
+    return RetentionWorker(Archiver(db_path, uri, policy)).start()
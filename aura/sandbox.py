@@ -0,0 +1,280 @@
+# aura/sandbox.py
+"""
+Side-effect gateway for command handlers.
+
+Handlers call open_url / popen / call / startfile / system / kill /
+smtp / press / hotkey from here instead of webbrowser, subprocess, os,
+psutil, smtplib and pyautogui directly. Normally every call goes straight to the real
+API. In sandbox mode nothing is launched: each effect is appended to a
+recorder with its arguments and a simulated latency, so load tests and
+benchmarks can run the real routing + handler code on a headless box.
+
+Sandbox mode is on when:
+  * AURA_SANDBOX=1 is set, or
+  * aura_config.json has "sandbox": true (or {"enabled": true, ...}), or
+  * code runs inside `with sandboxed() as rec:`.
+
+    with sandboxed() as rec:
+        engine.execute_command("open chrome")
+    rec.effects[0].kind   # "popen"
+"""
+
+import json
+import os
+import smtplib
+import subprocess
+import threading
+import time
+import webbrowser
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+CONFIG_FILE = Path("aura_config.json")
+
+# Simulated latency (seconds) per effect kind - roughly what the real call
+# costs on a desktop, so throughput numbers stay honest
+DEFAULT_LATENCIES = {
+    "open_url": 0.050,
+    "popen": 0.120,
+    "call": 0.250,
+    "startfile": 0.080,
+    "system": 0.250,
+    "kill": 0.020,
+    "smtp.connect": 0.300,
+    "smtp.starttls": 0.150,
+    "smtp.login": 0.200,
+    "smtp.sendmail": 0.250,
+    "smtp.quit": 0.050,
+    "press": 0.010,
+    "hotkey": 0.015,
+}
+
+
+@dataclass
+class Effect:
+    kind: str
+    args: tuple
+    kwargs: dict
+    latency: float
+    timestamp: float = field(default_factory=time.time)
+    thread: str = field(default_factory=lambda: threading.current_thread().name)
+
+
+class EffectRecorder:
+    """Collects effects instead of performing them (thread-safe)."""
+
+    def __init__(self, latencies: Dict[str, float] = None, sleep: bool = False):
+        self.latencies = {**DEFAULT_LATENCIES, **(latencies or {})}
+        self.sleep = sleep      # actually wait out the simulated latency
+        self.effects: List[Effect] = []
+        self._lock = threading.Lock()
+
+    def record(self, kind: str, *args, **kwargs) -> Effect:
+        effect = Effect(kind, args, kwargs, self.latencies.get(kind, 0.0))
+        with self._lock:
+            self.effects.append(effect)
+        if self.sleep and effect.latency:
+            time.sleep(effect.latency)
+        return effect
+
+    def of_kind(self, kind: str) -> List[Effect]:
+        with self._lock:
+            return [e for e in self.effects if e.kind == kind]
+
+    def clear(self):
+        with self._lock:
+            self.effects.clear()
+
+    def summary(self) -> dict:
+        """{kind: {"count": n, "latency": total simulated seconds}}"""
+        out = {}
+        with self._lock:
+            for e in self.effects:
+                row = out.setdefault(e.kind, {"count": 0, "latency": 0.0})
+                row["count"] += 1
+                row["latency"] += e.latency
+        return out
+
+
+# ---------- activation ----------
+_lock = threading.Lock()
+_stack: List[EffectRecorder] = []
+_configured: Optional[EffectRecorder] = None
+_config_loaded = False
+
+
+def _load_config() -> Optional[EffectRecorder]:
+    """Recorder for config/env-enabled sandbox mode, or None."""
+    setting = os.getenv("AURA_SANDBOX")
+    if setting is None:
+        try:
+            setting = json.loads(CONFIG_FILE.read_text(encoding="utf-8")).get("sandbox")
+        except:
+            setting = None
+
+    if isinstance(setting, dict):
+        if not setting.get("enabled", True):
+            return None
+        return EffectRecorder(setting.get("latency"), bool(setting.get("sleep", False)))
+    if isinstance(setting, str):
+        setting = setting.strip().lower() in ("1", "true", "yes", "on")
+    return EffectRecorder() if setting else None
+
+
+def active() -> Optional[EffectRecorder]:
+    """The recorder effects currently go to, or None for the real APIs."""
+    global _configured, _config_loaded
+    with _lock:
+        if _stack:
+            return _stack[-1]
+        if not _config_loaded:
+            _configured = _load_config()
+            _config_loaded = True
+        return _configured
+
+
+def is_enabled() -> bool:
+    return active() is not None
+
+
+def enable(latencies: Dict[str, float] = None, sleep: bool = False) -> EffectRecorder:
+    """Turn sandbox mode on for the whole process (like the config flag)."""
+    global _configured, _config_loaded
+    with _lock:
+        _configured = EffectRecorder(latencies, sleep)
+        _config_loaded = True
+        return _configured
+
+
+def disable():
+    global _configured, _config_loaded
+    with _lock:
+        _configured = None
+        _config_loaded = True
+
+
+@contextmanager
+def sandboxed(latencies: Dict[str, float] = None, sleep: bool = False,
+              recorder: EffectRecorder = None):
+    """
+    Record effects for the duration of the block. Process-wide, so
+    handlers running on worker threads are covered too.
+    """
+    rec = recorder or EffectRecorder(latencies, sleep)
+    with _lock:
+        _stack.append(rec)
+    try:
+        yield rec
+    finally:
+        with _lock:
+            _stack.remove(rec)
+
+
+# ---------- effects ----------
+def open_url(url, *args, **kwargs):
+    rec = active()
+    if rec:
+        rec.record("open_url", url, *args, **kwargs)
+        return True
+    return webbrowser.open(url, *args, **kwargs)
+
+
+def popen(args, **kwargs):
+    rec = active()
+    if rec:
+        rec.record("popen", args, **kwargs)
+        return None
+    return subprocess.Popen(args, **kwargs)
+
+
+def call(args, **kwargs):
+    rec = active()
+    if rec:
+        rec.record("call", args, **kwargs)
+        return 0
+    return subprocess.call(args, **kwargs)
+
+
+def startfile(path, *args):
+    """os.startfile; raises AttributeError off Windows, like the real one."""
+    rec = active()
+    if rec:
+        rec.record("startfile", path, *args)
+        return None
+    return os.startfile(path, *args)
+
+
+def system(command):
+    rec = active()
+    if rec:
+        rec.record("system", command)
+        return 0
+    return os.system(command)
+
+
+def kill(proc):
+    """Kill a psutil.Process (the sandbox only records its pid and name)."""
+    rec = active()
+    if rec:
+        try:
+            name = proc.name()
+        except Exception:
+            name = None
+        rec.record("kill", proc.pid, name)
+        return None
+    return proc.kill()
+
+
+class RecordingSMTP:
+    """Stand-in for smtplib.SMTP that records instead of connecting."""
+
+    def __init__(self, recorder: EffectRecorder, host="", port=0):
+        self._rec = recorder
+        self._rec.record("smtp.connect", host, port)
+
+    def starttls(self, *args, **kwargs):
+        self._rec.record("smtp.starttls")
+
+    def login(self, user, password):
+        # never keep the password in the log
+        self._rec.record("smtp.login", user)
+
+    def sendmail(self, from_addr, to_addrs, msg, *args, **kwargs):
+        self._rec.record("smtp.sendmail", from_addr, to_addrs, len(msg))
+        return {}
+
+    def quit(self):
+        self._rec.record("smtp.quit")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.quit()
+
+
+def smtp(host="", port=0, **kwargs):
+    rec = active()
+    if rec:
+        return RecordingSMTP(rec, host, port)
+    return smtplib.SMTP(host, port, **kwargs)
+
+
+def press(*keys, **kwargs):
+    rec = active()
+    if rec:
+        rec.record("press", *keys, **kwargs)
+        return
+    import pyautogui
+    pyautogui.press(*keys, **kwargs)
+
+
+def hotkey(*keys, **kwargs):
+    rec = active()
+    if rec:
+        rec.record("hotkey", *keys, **kwargs)
+        return
+    import pyautogui
+    pyautogui.hotkey(*keys, **kwargs)
@@ -1,6 +1,6 @@
 # aura/setup_handlers.py
 
-from aura.command_engine import SimpleKeywordHandler, CommandCategory, EnhancedCommandEngine
+from aura.handler_engine import SimpleKeywordHandler, CommandCategory, EnhancedCommandEngine
 from aura.system_handlers import SystemHandler
 from aura.smart_search import SmartSearch
 from aura.screen_reader import read_screen
@@ -379,7 +379,7 @@ def initialize_engine():
         "smart_search",
         SimpleKeywordHandler(
             name="smart_search",
-            keywords=[""],   # empty string → always matches (fallback)
+            keywords=[""],   # empty keyword → fallback when nothing clears min_confidence
             response_func=lambda t: smart.handle(t),
             category=CommandCategory.INFORMATION
         )
@@ -6,6 +6,13 @@ CACHE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".cach
 os.makedirs(CACHE_DIR, exist_ok=True)
 CACHE_FILE = os.path.join(CACHE_DIR, "apps_index.json")
 
+# Fuzzy lookup: trigram inverted index over the index keys, rebuilt
+# whenever apps_index.json changes
+NGRAM = 3
+RERANK_CANDIDATES = 64      # best trigram overlaps passed to difflib
+FUZZY_CUTOFF = 0.6
+_loaded = {"mtime": None, "index": {}, "grams": {}}
+
 # Start Menu shortcut locations
 START_MENU_DIRS = [
     os.path.expandvars(r"%APPDATA%\Microsoft\Windows\Start Menu\Programs"),
@@ -136,12 +143,62 @@ def index_apps() -> str:
     _save_cache(index)
     return f"Indexed {len(index)} apps. Try: open chrome, open snipping tool, open visual studio code."
 
+def _ngrams(text: str) -> set:
+    padded = f" {text} "
+    return {padded[i:i + NGRAM] for i in range(len(padded) - NGRAM + 1)}
+
+def _build_ngram_index(keys) -> dict:
+    """trigram -> list of index keys containing it"""
+    grams = {}
+    for key in keys:
+        for g in _ngrams(key):
+            grams.setdefault(g, []).append(key)
+    return grams
+
+def _cache_mtime():
+    try:
+        return os.path.getmtime(CACHE_FILE)
+    except OSError:
+        return None
+
 def _ensure_index() -> dict:
+    """The app index, reloaded (with its trigram index) only when the file changes."""
+    mtime = _cache_mtime()
+    if _loaded["index"] and mtime is not None and mtime == _loaded["mtime"]:
+        return _loaded["index"]
+
     idx = _load_cache()
-    if idx:
-        return idx
-    index_apps()
-    return _load_cache()
+    if not idx:
+        index_apps()
+        idx = _load_cache()
+        mtime = _cache_mtime()
+    _loaded.update(index=idx, grams=_build_ngram_index(idx.keys()), mtime=mtime)
+    return idx
+
+def _fuzzy_match(target: str, index: dict, grams: dict = None):
+    """
+    Closest index key to `target` (difflib ratio >= FUZZY_CUTOFF), or None.
+    Only keys sharing trigrams with the target are scored, best overlap first.
+    """
+    if grams is None:
+        grams = _build_ngram_index(index.keys())
+
+    target_grams = _ngrams(target)
+    shared = {}
+    for g in target_grams:
+        for key in grams.get(g, ()):
+            shared[key] = shared.get(key, 0) + 1
+    if not shared:
+        return None
+
+    # ratio >= 0.6 needs lengths within 0.6 / 1.4 of each other;
+    # rank the rest by trigram Dice overlap (a key of n chars has n trigrams)
+    n = len(target_grams)
+    lo, hi = len(target) * 3 / 7, len(target) * 7 / 3
+    ranked = sorted((k for k in shared if lo <= len(k) <= hi),
+                    key=lambda k: -shared[k] / (n + len(k)))[:RERANK_CANDIDATES]
+    best = difflib.get_close_matches(target, ranked, n=1, cutoff=FUZZY_CUTOFF)
+    return best[0] if best else None
 
 def _launch_lnk(path: str) -> bool:
     try:
@@ -197,9 +254,8 @@ def open_application_any(target: str) -> str:
         return f"Found {meta['display']} but failed to launch."
 
     # 2) Fuzzy match
-    candidates = difflib.get_close_matches(target, list(index.keys()), n=1, cutoff=0.6)
-    if candidates:
-        best = candidates[0]
+    best = _fuzzy_match(target, index, _loaded["grams"])
+    if best:
         meta = index[best]
         kind = meta["kind"]
         if kind == "lnk" and _launch_lnk(meta["path"]):
@@ -1,9 +1,10 @@
 # aura/smart_search.py
 
 import re
-import webbrowser
 import wikipedia
 
+from aura import sandbox
+
 
 class SmartSearch:
     """
@@ -67,7 +68,7 @@ class SmartSearch:
                 url = f"https://www.{site}.com"
             else:
                 url = site
-            webbrowser.open(url)
+            sandbox.open_url(url)
             return f"🌐 Opening {site}..."
 
         # 4) Default: Google it
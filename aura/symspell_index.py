@@ -0,0 +1,254 @@
+# aura/symspell_index.py
+"""
+Symmetric-delete (SymSpell) candidate index for short command phrases.
+
+Every phrase is indexed three ways:
+  * exactly (after fuzzy-style normalisation),
+  * with its spaces removed, plus its deletes ("shut down" ~ "shutdwn"), and
+  * per token: every string reachable by deleting up to 2 characters
+    from a vocabulary token points back at that token.
+
+A lookup generates the deletes of the query and collects the phrases
+they reach. Phrases whose tokens are a subset or superset of the query's
+score 100 by definition and are found by counting tokens. A phrase
+reached only through tokens covering less than MIN_COVER of the
+shorter side is dropped, so very common verbs like "open" do not pull
+in thousands of phrases. The rest are scored with token_set_ratio. That
+is the same scorer and cutoff FuzzyMatcher always used, but the scan no
+longer covers every known phrase. Adding a phrase is incremental.
+"""
+
+from functools import lru_cache
+from threading import Lock
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+try:
+    from rapidfuzz import fuzz as _fuzz, process as _scan
+    from rapidfuzz.utils import default_process as _process
+
+    def _best(key: str, phrases: List[str], cutoff: int):
+        """(position, score) of the first best phrase scoring > cutoff."""
+        # fuzzywuzzy rounds scores, so "> 80" means ">= 80.5"
+        found = _scan.extractOne(key, phrases, scorer=_fuzz.token_set_ratio,
+                                 score_cutoff=cutoff + 0.5)
+        if found is None:
+            return None
+        return found[2], int(round(found[1]))
+
+    # below this many phrases one C-level scan beats building candidates
+    SCAN_BELOW = 200
+except ImportError:
+    from fuzzywuzzy import fuzz as _fuzz
+    from fuzzywuzzy.utils import full_process as _process
+
+    def _best(key: str, phrases: List[str], cutoff: int):
+        best = None
+        for pos, phrase in enumerate(phrases):
+            score = _fuzz.token_set_ratio(key, phrase, force_ascii=False, full_process=False)
+            if score > cutoff and (best is None or score > best[1]):
+                best = (pos, score)
+        return best
+
+    SCAN_BELOW = 0
+
+MAX_DISTANCE = 2
+# a phrase is only scored when the query tokens reaching it (exactly or
+# within MAX_DISTANCE) cover this share of the shorter of the two
+MIN_COVER = 0.6
+
+
+def normalize(text: str) -> str:
+    """Lowercase, strip punctuation, collapse whitespace."""
+    return " ".join(_process(text or "").split())
+
+
+@lru_cache(maxsize=8192)
+def deletes(word: str, max_distance: int) -> frozenset:
+    """`word` plus every string made by deleting up to max_distance chars."""
+    out = {word}
+    level = {word}
+    for _ in range(max_distance):
+        level = {w[:i] + w[i + 1:] for w in level for i in range(len(w))}
+        out |= level
+    return frozenset(out)
+
+
+def _joined_distance(joined: str) -> int:
+    # whole phrases without spaces; long ones only get one edit to keep
+    # the index small
+    return MAX_DISTANCE if len(joined) <= 10 else 1
+
+
+def _distance_for(token: str) -> int:
+    # short tokens would otherwise reach most of the vocabulary
+    if len(token) <= 2:
+        return 0
+    if len(token) <= 4:
+        return 1
+    return MAX_DISTANCE
+
+
+class SymSpellIndex:
+    """
+    Maps phrases (canonical commands and their misspellings) to their
+    canonical command.
+
+        idx = SymSpellIndex()
+        idx.add("play music", "play music")
+        idx.add("paly music", "play music")
+        idx.lookup("play musc")    # ("play music", 95)
+    """
+
+    def __init__(self):
+        self._phrases: List[str] = []          # id -> normalised phrase
+        self._canonical: List[str] = []        # id -> canonical command
+        self._lengths: List[int] = []          # id -> letters (no spaces)
+        self._n_tokens: List[int] = []         # id -> distinct tokens
+        self._exact: Dict[str, int] = {}
+        self._token_phrases: Dict[str, List[int]] = {}
+        self._token_deletes: Dict[str, Set[str]] = {}
+        self._joined_deletes: Dict[str, Set[int]] = {}
+        # numpy views, rebuilt lazily after add()
+        self._postings: Dict[str, np.ndarray] = {}
+        self._length_arr = np.zeros(0, dtype=np.int32)
+        self._n_tokens_arr = np.zeros(0, dtype=np.int32)
+        self._lock = Lock()
+
+    def __len__(self):
+        return len(self._phrases)
+
+    def __contains__(self, text: str):
+        return normalize(text) in self._exact
+
+    # -------- building --------
+    def add(self, phrase: str, canonical: str) -> bool:
+        """Index one phrase. Returns False if it was already known."""
+        key = normalize(phrase)
+        if not key:
+            return False
+        with self._lock:
+            if key in self._exact:
+                pid = self._exact[key]
+                self._canonical[pid] = canonical
+                return False
+
+            pid = len(self._phrases)
+            tokens = set(key.split())
+            self._phrases.append(key)
+            self._canonical.append(canonical)
+            self._lengths.append(len(key) - key.count(" "))
+            self._n_tokens.append(len(tokens))
+            self._exact[key] = pid
+
+            for token in tokens:
+                ids = self._token_phrases.get(token)
+                if ids is None:
+                    ids = self._token_phrases[token] = []
+                    for d in deletes(token, _distance_for(token)):
+                        self._token_deletes.setdefault(d, set()).add(token)
+                ids.append(pid)
+                self._postings.pop(token, None)
+
+            joined = key.replace(" ", "")
+            for d in deletes(joined, _joined_distance(joined)):
+                self._joined_deletes.setdefault(d, set()).add(pid)
+            return True
+
+    def add_many(self, pairs):
+        for phrase, canonical in pairs:
+            self.add(phrase, canonical)
+
+    # -------- lookup --------
+    def _posting(self, token: str) -> np.ndarray:
+        arr = self._postings.get(token)
+        if arr is None:
+            arr = self._postings[token] = np.array(self._token_phrases[token], dtype=np.int64)
+        return arr
+
+    def _gather(self, key: str):
+        """
+        (candidate ids, id of the first phrase scoring 100 or None).
+        token_set_ratio is 100 exactly when one side's tokens are a
+        subset of the other's, so those are found by token counting.
+        """
+        n = len(self._phrases)
+        if len(self._length_arr) != n:
+            self._length_arr = np.array(self._lengths, dtype=np.int32)
+            self._n_tokens_arr = np.array(self._n_tokens, dtype=np.int32)
+
+        tokens = set(key.split())
+        covered = np.zeros(n, dtype=np.int32)  # letters of the query reaching each phrase
+        exact = np.zeros(n, dtype=np.int32)    # query tokens each phrase contains verbatim
+        for token in tokens:
+            near = set()
+            for d in deletes(token, _distance_for(token)):
+                near.update(self._token_deletes.get(d, ()))
+            if not near:
+                continue
+            if len(near) == 1:
+                reached = self._posting(next(iter(near)))
+            else:
+                reached = np.unique(np.concatenate([self._posting(t) for t in near]))
+            covered[reached] += len(token)
+            if token in self._token_phrases:
+                exact[self._posting(token)] += 1
+
+        perfect = np.flatnonzero((exact == len(tokens)) |
+                                 ((exact > 0) & (exact == self._n_tokens_arr)))
+        if len(perfect):
+            return set(), int(perfect[0])
+
+        query_len = len(key) - key.count(" ")
+        keep = (covered > 0) & (covered >= MIN_COVER * np.minimum(query_len, self._length_arr))
+        found = set(np.flatnonzero(keep).tolist())
+
+        joined = key.replace(" ", "")
+        for d in deletes(joined, _joined_distance(joined)):
+            found |= self._joined_deletes.get(d, set())
+        return found, None
+
+    def candidates(self, key: str) -> Set[int]:
+        """Ids of phrases that share enough (near-)tokens with `key`."""
+        with self._lock:
+            found, perfect = self._gather(normalize(key))
+        return {perfect} if perfect is not None else found
+
+    def lookup(self, text: str, cutoff: int = 80) -> Optional[Tuple[str, int]]:
+        """
+        Best (canonical, score) with token_set_ratio score > cutoff, or None.
+        Ties go to the phrase added first.
+        """
+        key = normalize(text)
+        if not key:
+            return None
+        with self._lock:
+            pid = self._exact.get(key)
+            if pid is not None:
+                return self._canonical[pid], 100
+
+            phrases = self._phrases
+            if len(phrases) < SCAN_BELOW:
+                ids = range(len(phrases))
+                result = _best(key, phrases, cutoff)
+            else:
+                found, perfect = self._gather(key)
+                if perfect is not None:
+                    return self._canonical[perfect], 100
+                ids = sorted(found)
+                result = _best(key, [phrases[i] for i in ids], cutoff)
+            if result is None:
+                return None
+            pos, score = result
+            return self._canonical[ids[pos]], score
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "phrases": len(self._phrases),
+                "tokens": len(self._token_phrases),
+                "token_deletes": len(self._token_deletes),
+                "joined_deletes": len(self._joined_deletes),
+
+            }
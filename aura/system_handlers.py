@@ -1,16 +1,15 @@
 # aura/system_handlers.py
 
 import os
-import subprocess
 import time
 import ctypes
-import pyautogui
-import webbrowser
 import psutil
 import wikipedia
 import random
 import glob
 
+from aura import sandbox
+
 
 class SystemHandler:
     """
@@ -86,22 +85,22 @@ class SystemHandler:
         if app_name in all_apps:
             target = all_apps[app_name]
             try:
-                os.startfile(target)
+                sandbox.startfile(target)
                 return f"🚀 Opening {app_name}..."
             except:
                 try:
-                    subprocess.Popen(target)
+                    sandbox.popen(target)
                     return f"🚀 Opening {app_name}..."
                 except Exception as e:
                     return f"❌ Cannot open {app_name}: {e}"
 
         # Try as executable
         try:
-            os.startfile(app_name)
+            sandbox.startfile(app_name)
             return f"🚀 Opening {app_name}..."
         except:
             try:
-                subprocess.Popen(app_name)
+                sandbox.popen(app_name)
                 return f"🚀 Opening {app_name}..."
             except Exception as e:
                 return f"❌ Unknown application '{app_name}'. Error: {e}"
@@ -134,7 +133,7 @@ class SystemHandler:
         for proc in psutil.process_iter():
             try:
                 if proc.name().lower() == proc_name.lower():
-                    proc.kill()
+                    sandbox.kill(proc)
                     closed = True
             except:
                 pass
@@ -151,7 +150,7 @@ class SystemHandler:
         if not query:
             return "❌ Empty search query."
         url = f"https://www.google.com/search?q={query.replace(' ', '+')}"
-        webbrowser.open(url)
+        sandbox.open_url(url)
         return f"🔎 Searching Google for '{query}'..."
 
     def open_youtube(self, query):
@@ -159,7 +158,7 @@ class SystemHandler:
         if not query:
             return "❌ Empty YouTube query."
         url = f"https://www.youtube.com/results?search_query={query.replace(' ', '+')}"
-        webbrowser.open(url)
+        sandbox.open_url(url)
         return f"📺 Searching YouTube for '{query}'..."
 
     # --------------------------------------------------------
@@ -190,7 +189,7 @@ class SystemHandler:
                 return f"❌ No music found in {self.MUSIC_FOLDER}. Update MUSIC_FOLDER path."
 
             track = random.choice(files)
-            os.startfile(track)
+            sandbox.startfile(track)
             return f"🎵 Playing: {os.path.basename(track)}"
 
         except Exception as e:
@@ -200,35 +199,35 @@ class SystemHandler:
     # WIFI CONTROL
     # --------------------------------------------------------
     def wifi_on(self):
-        os.system(f'netsh interface set interface "{self.WIFI_NAME}" admin=enable')
+        sandbox.system(f'netsh interface set interface "{self.WIFI_NAME}" admin=enable')
         return "📶 Wi-Fi ON"
 
     def wifi_off(self):
-        os.system(f'netsh interface set interface "{self.WIFI_NAME}" admin=disable')
+        sandbox.system(f'netsh interface set interface "{self.WIFI_NAME}" admin=disable')
         return "📵 Wi-Fi OFF"
 
     # --------------------------------------------------------
     # BLUETOOTH
     # --------------------------------------------------------
     def bluetooth_on(self):
-        os.system("powershell Start-Service bthserv")
+        sandbox.system("powershell Start-Service bthserv")
         return "🔵 Bluetooth ON"
 
     def bluetooth_off(self):
-        os.system("powershell Stop-Service bthserv")
+        sandbox.system("powershell Stop-Service bthserv")
         return "⚪ Bluetooth OFF"
 
     # --------------------------------------------------------
     # AIRPLANE MODE
     # --------------------------------------------------------
     def airplane_on(self):
-        os.system(
+        sandbox.system(
             r'powershell "Set-ItemProperty -Path HKLM:\System\CurrentControlSet\Control\RadioManagement\SystemRadioState -Name RadioEnable -Value 0"'
         )
         return "✈️ Airplane Mode ON"
 
     def airplane_off(self):
-        os.system(
+        sandbox.system(
             r'powershell "Set-ItemProperty -Path HKLM:\System\CurrentControlSet\Control\RadioManagement\SystemRadioState -Name RadioEnable -Value 1"'
         )
         return "🟢 Airplane Mode OFF"
@@ -237,12 +236,12 @@ class SystemHandler:
     # HOTSPOT
     # --------------------------------------------------------
     def hotspot_on(self):
-        os.system('netsh wlan set hostednetwork mode=allow ssid=AURA_Hotspot key=12345678')
-        os.system('netsh wlan start hostednetwork')
+        sandbox.system('netsh wlan set hostednetwork mode=allow ssid=AURA_Hotspot key=12345678')
+        sandbox.system('netsh wlan start hostednetwork')
         return "📡 Hotspot ON"
 
     def hotspot_off(self):
-        os.system('netsh wlan stop hostednetwork')
+        sandbox.system('netsh wlan stop hostednetwork')
         return "📡 Hotspot OFF"
 
     # --------------------------------------------------------
@@ -250,7 +249,7 @@ class SystemHandler:
     # --------------------------------------------------------
     def brightness_set(self, percent):
         try:
-            subprocess.call(
+            sandbox.call(
                 f"powershell (Get-WmiObject -Namespace root/WMI -Class WmiMonitorBrightnessMethods).WmiSetBrightness(1,{percent})",
                 shell=True,
             )
@@ -259,11 +258,11 @@ class SystemHandler:
             return "❌ Unable to change brightness"
 
     def brightness_up(self):
-        pyautogui.press("brightnessup")
+        sandbox.press("brightnessup")
         return "🔆 Brightness increased"
 
     def brightness_down(self):
-        pyautogui.press("brightnessdown")
+        sandbox.press("brightnessdown")
         return "🔅 Brightness decreased"
 
     # --------------------------------------------------------
@@ -276,13 +275,13 @@ class SystemHandler:
     # DARK / LIGHT MODE
     # --------------------------------------------------------
     def dark_mode(self):
-        os.system(
+        sandbox.system(
             r'reg add HKCU\Software\Microsoft\Windows\CurrentVersion\Themes\Personalize /v AppsUseLightTheme /t REG_DWORD /d 0 /f'
         )
         return "🌙 Dark mode ON"
 
     def light_mode(self):
-        os.system(
+        sandbox.system(
             r'reg add HKCU\Software\Microsoft\Windows\CurrentVersion\Themes\Personalize /v AppsUseLightTheme /t REG_DWORD /d 1 /f'
         )
         return "🌞 Light mode ON"
@@ -291,13 +290,13 @@ class SystemHandler:
     # MICROPHONE
     # --------------------------------------------------------
     def mic_mute(self):
-        os.system(
+        sandbox.system(
             r"powershell ""(Get-AudioDevice -List | ?{$_.Type -eq 'Recording'}).Mute = $true"""
         )
         return "🎤 Microphone muted"
 
     def mic_unmute(self):
-        os.system(
+        sandbox.system(
             r"powershell ""(Get-AudioDevice -List | ?{$_.Type -eq 'Recording'}).Mute = $false"""
         )
         return "🎤 Microphone unmuted"
@@ -306,47 +305,47 @@ class SystemHandler:
     # BATTERY SAVER
     # --------------------------------------------------------
     def battery_saver_on(self):
-        os.system("powercfg /setdcvalueindex scheme_current sub_energy saver 1")
+        sandbox.system("powercfg /setdcvalueindex scheme_current sub_energy saver 1")
         return "🔋 Battery saver ON"
 
     def battery_saver_off(self):
-        os.system("powercfg /setdcvalueindex scheme_current sub_energy saver 0")
+        sandbox.system("powercfg /setdcvalueindex scheme_current sub_energy saver 0")
         return "🔋 Battery saver OFF"
 
     # --------------------------------------------------------
     # POWER CONTROLS
     # --------------------------------------------------------
     def lock_system(self):
-        os.system("rundll32.exe user32.dll,LockWorkStation")
+        sandbox.system("rundll32.exe user32.dll,LockWorkStation")
         return "🔒 Locked"
 
     def shutdown(self):
-        os.system("shutdown /s /t 3")
+        sandbox.system("shutdown /s /t 3")
         return "⚠️ Shutting down..."
 
     def restart(self):
-        os.system("shutdown /r /t 3")
+        sandbox.system("shutdown /r /t 3")
         return "🔄 Restarting..."
 
     def sleep_mode(self):
-        os.system("rundll32.exe powrprof.dll,SetSuspendState 0,1,0")
+        sandbox.system("rundll32.exe powrprof.dll,SetSuspendState 0,1,0")
         return "😴 Sleeping..."
 
     # --------------------------------------------------------
     # CHROME TAB CONTROL
     # --------------------------------------------------------
     def chrome_new_tab(self):
-        pyautogui.hotkey('ctrl', 't')
+        sandbox.hotkey('ctrl', 't')
         return "🆕 New Chrome tab opened."
 
     def chrome_close_tab(self):
-        pyautogui.hotkey('ctrl', 'w')
+        sandbox.hotkey('ctrl', 'w')
         return "❌ Chrome tab closed."
 
     def chrome_next_tab(self):
-        pyautogui.hotkey('ctrl', 'tab')
+        sandbox.hotkey('ctrl', 'tab')
         return "➡️ Next tab."
 
     def chrome_prev_tab(self):
-        pyautogui.hotkey('ctrl', 'shift', 'tab')
+        sandbox.hotkey('ctrl', 'shift', 'tab')
         return "⬅️ Previous tab."
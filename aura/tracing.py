@@ -0,0 +1,284 @@
+# aura/tracing.py
+"""
+Lightweight per-stage latency tracing.
+
+    with tracing.span("handler", category="app"):
+        ...
+
+Every finished span goes to
+  * an in-process histogram per (span name, category), queryable at
+    runtime with stats() / percentile(), and
+  * a rotating JSONL file (one object per span).
+
+Spans opened on the same thread nest: the outermost one starts a trace,
+and annotate() tags every open span of the current thread (e.g. the
+category, once the router has decided it).
+
+Tracing is off unless AURA_TRACE=1 or aura_config.json has "trace"
+(true, or {"enabled": true, "file": ..., "max_bytes": ..., "backups": ...}).
+When off, span() returns a shared no-op object and costs one call.
+"""
+
+import itertools
+import json
+import logging
+import math
+import os
+import threading
+import time
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+from typing import Dict, Optional
+
+CONFIG_FILE = Path("aura_config.json")
+DEFAULT_TRACE_FILE = "logs/aura_trace.jsonl"
+DEFAULT_MAX_BYTES = 5 * 1024 * 1024
+DEFAULT_BACKUPS = 3
+
+# histogram buckets: 10 µs growing by sqrt(2) up to ~10 minutes
+_BUCKET_BASE_MS = 0.01
+_BUCKETS = 52
+
+_enabled = False
+_logger: Optional[logging.Logger] = None
+_local = threading.local()
+_trace_ids = itertools.count(1)
+_hist_lock = threading.Lock()
+_histograms: Dict[tuple, "Histogram"] = {}
+
+
+class Histogram:
+    """Log-scale latency histogram (milliseconds)."""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+        self.buckets = [0] * (_BUCKETS + 1)
+
+    def add(self, ms: float):
+        self.count += 1
+        self.total += ms
+        self.min = min(self.min, ms)
+        self.max = max(self.max, ms)
+        if ms <= _BUCKET_BASE_MS:
+            idx = 0
+        else:
+            idx = min(_BUCKETS, int(2 * math.log2(ms / _BUCKET_BASE_MS)) + 1)
+        self.buckets[idx] += 1
+
+    def percentile(self, pct: float) -> float:
+        """Upper bound of the bucket holding the pct-th sample."""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(pct / 100 * self.count))
+        seen = 0
+        for idx, n in enumerate(self.buckets):
+            seen += n
+            if seen >= rank:
+                return min(self.max, _BUCKET_BASE_MS * (2 ** (idx / 2)))
+        return self.max
+
+    def as_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "mean_ms": self.total / self.count if self.count else 0.0,
+            "min_ms": self.min if self.count else 0.0,
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "p99_ms": self.percentile(99),
+            "max_ms": self.max,
+        }
+
+
+class _NoSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def tag(self, **tags):
+        pass
+
+
+_NOOP = _NoSpan()
+
+
+class Span:
+    __slots__ = ("name", "tags", "trace", "parent", "start")
+
+    def __init__(self, name: str, tags: dict):
+        self.name = name
+        self.tags = tags
+
+    def tag(self, **tags):
+        self.tags.update(tags)
+
+    def __enter__(self):
+        stack = _stack()
+        if stack:
+            self.trace, self.parent = stack[0].trace, stack[-1].name
+            # later stages of an already-routed command keep its category
+            if "category" in stack[0].tags:
+                self.tags.setdefault("category", stack[0].tags["category"])
+        else:
+            self.trace, self.parent = next(_trace_ids), None
+        stack.append(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        ms = (time.perf_counter() - self.start) * 1000
+        stack = _stack()
+        if stack and stack[-1] is self:
+            stack.pop()
+        if exc_type is not None:
+            self.tags["error"] = exc_type.__name__
+        _emit(self.name, ms, self.tags, self.trace, self.parent)
+        return False
+
+
+def _stack():
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+
+def _emit(name, ms, tags, trace=None, parent=None):
+    key = (name, tags.get("category"))
+    with _hist_lock:
+        hist = _histograms.get(key)
+        if hist is None:
+            hist = _histograms[key] = Histogram()
+        hist.add(ms)
+
+    if _logger is not None:
+        record = {"ts": time.time(), "span": name, "ms": round(ms, 3)}
+        if trace is not None:
+            record["trace"] = trace
+        if parent is not None:
+            record["parent"] = parent
+        record.update(tags)
+        try:
+            _logger.info(json.dumps(record, default=str))
+        except Exception:
+            pass
+
+
+# ---------- public API ----------
+def span(name: str, **tags):
+    """Time a block. A no-op unless tracing is enabled."""
+    if not _enabled:
+        return _NOOP
+    return Span(name, tags)
+
+
+def record(name: str, ms: float, **tags):
+    """Add a duration measured elsewhere (e.g. queue wait)."""
+    if _enabled:
+        stack = _stack()
+        _emit(name, ms, tags, stack[0].trace if stack else None,
+              stack[-1].name if stack else None)
+
+
+def annotate(**tags):
+    """Tag every open span on this thread (e.g. category=...)."""
+    if _enabled:
+        for s in _stack():
+            s.tags.update(tags)
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def enable(path: str = None, max_bytes: int = DEFAULT_MAX_BYTES,
+           backups: int = DEFAULT_BACKUPS, write_file: bool = True):
+    """Turn tracing on; spans also go to `path` unless write_file=False."""
+    global _enabled, _logger
+    _close_logger()
+    if write_file:
+        path = Path(path or os.getenv("AURA_TRACE_FILE", DEFAULT_TRACE_FILE))
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            handler = RotatingFileHandler(path, maxBytes=max_bytes,
+                                          backupCount=backups, encoding="utf-8")
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            logger = logging.getLogger("aura.trace")
+            logger.setLevel(logging.INFO)
+            logger.propagate = False
+            logger.addHandler(handler)
+            _logger = logger
+        except Exception as e:
+            print(f"⚠️ Trace file disabled: {e}")
+    _enabled = True
+
+
+def disable():
+    global _enabled
+    _enabled = False
+    _close_logger()
+
+
+def _close_logger():
+    global _logger
+    if _logger is not None:
+        for handler in list(_logger.handlers):
+            _logger.removeHandler(handler)
+            handler.close()
+    _logger = None
+
+
+def stats(name: str = None) -> dict:
+    """
+    Histogram summaries keyed "span" or "span[category]".
+    Pass `name` to only get one span.
+    """
+    with _hist_lock:
+        items = list(_histograms.items())
+        out = {}
+        for (span_name, category), hist in sorted(items, key=lambda kv: (kv[0][0], str(kv[0][1]))):
+            if name is not None and span_name != name:
+                continue
+            key = span_name if category is None else f"{span_name}[{category}]"
+            out[key] = hist.as_dict()
+        return out
+
+
+def percentile(name: str, pct: float, category: str = None) -> float:
+    with _hist_lock:
+        hist = _histograms.get((name, category))
+        return hist.percentile(pct) if hist else 0.0
+
+
+def reset():
+    with _hist_lock:
+        _histograms.clear()
+
+
+def _load_config():
+    setting = os.getenv("AURA_TRACE")
+    if setting is None:
+        try:
+            setting = json.loads(CONFIG_FILE.read_text(encoding="utf-8")).get("trace")
+        except:
+            setting = None
+
+    if isinstance(setting, dict):
+        if setting.get("enabled", True):
+            enable(setting.get("file"),
+                   int(setting.get("max_bytes", DEFAULT_MAX_BYTES)),
+                   int(setting.get("backups", DEFAULT_BACKUPS)))
+        return
+    if isinstance(setting, str):
+        setting = setting.strip().lower() in ("1", "true", "yes", "on")
+    if setting:
+        enable()
+
+
+_load_config()
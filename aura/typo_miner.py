@@ -0,0 +1,272 @@
+# aura/typo_miner.py
+"""
+Learns typo corrections from command history.
+
+When a command falls through to the Google-search fallback (or errors),
+and the same user types a similar command a few seconds later that does
+route, the first one was almost always a typo of the second. TypoMiner
+scans both history stores for such pairs:
+
+  * aura_commands.db  `commands` (category "search" = fallback)
+  * MySQL             `command_history` (per user_id, by response text)
+
+Pairs seen at least MIN_SUPPORT times go into a small SQLite correction
+store and are pushed into a FuzzyMatcher with add_correction(), which
+updates its index in place. Each run only reads rows added since the
+previous one.
+
+    miner = TypoMiner(matcher)
+    miner.start()           # loads stored corrections, then mines every 10 min
+"""
+
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from rapidfuzz import fuzz
+except ImportError:
+    from fuzzywuzzy import fuzz
+
+RETYPE_WINDOW = 30          # seconds between the failed and the retyped command
+MIN_SIMILARITY = 70         # fuzz.ratio between typo and correction
+MIN_SUPPORT = 2             # times a pair must be seen before it is used
+MAX_LENGTH = 80
+MINE_INTERVAL = 600         # seconds between background runs
+
+# engine responses that mean "did not understand, searched Google instead"
+FAILED_PREFIXES = ("🔍 Google:", "❌", "Sorry, I didn't understand")
+
+
+class CorrectionStore:
+    """typo -> correction pairs with support counts (SQLite)."""
+
+    def __init__(self, path: str = "aura_commands.db"):
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self.conn.execute('''
+                CREATE TABLE IF NOT EXISTS typo_corrections (
+                    typo TEXT PRIMARY KEY,
+                    correction TEXT NOT NULL,
+                    hits INTEGER NOT NULL DEFAULT 0,
+                    last_seen TEXT
+                )
+            ''')
+            self.conn.execute('''
+                CREATE TABLE IF NOT EXISTS typo_miner_state (
+                    source TEXT PRIMARY KEY,
+                    last_id INTEGER NOT NULL
+                )
+            ''')
+            self.conn.commit()
+
+    def add_pairs(self, counts: Dict[Tuple[str, str], int]):
+        """Add support for mined pairs. A typo keeps its most supported correction."""
+        if not counts:
+            return
+        now = datetime.now().isoformat()
+        with self._lock:
+            for (typo, correction), hits in counts.items():
+                row = self.conn.execute(
+                    "SELECT correction, hits FROM typo_corrections WHERE typo = ?", (typo,)
+                ).fetchone()
+                if row is None:
+                    self.conn.execute(
+                        "INSERT INTO typo_corrections (typo, correction, hits, last_seen) VALUES (?, ?, ?, ?)",
+                        (typo, correction, hits, now),
+                    )
+                elif row[0] == correction:
+                    self.conn.execute(
+                        "UPDATE typo_corrections SET hits = hits + ?, last_seen = ? WHERE typo = ?",
+                        (hits, now, typo),
+                    )
+                elif hits > row[1]:
+                    # a different correction has overtaken the stored one
+                    self.conn.execute(
+                        "UPDATE typo_corrections SET correction = ?, hits = ?, last_seen = ? WHERE typo = ?",
+                        (correction, hits, now, typo),
+                    )
+            self.conn.commit()
+
+    def corrections(self, min_support: int = MIN_SUPPORT) -> List[Tuple[str, str]]:
+        with self._lock:
+            return self.conn.execute(
+                "SELECT typo, correction FROM typo_corrections WHERE hits >= ? ORDER BY typo",
+                (min_support,),
+            ).fetchall()
+
+    def get_watermark(self, source: str) -> int:
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT last_id FROM typo_miner_state WHERE source = ?", (source,)
+            ).fetchone()
+        return row[0] if row else 0
+
+    def set_watermark(self, source: str, last_id: int):
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO typo_miner_state (source, last_id) VALUES (?, ?)",
+                (source, last_id),
+            )
+            self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+
+def _parse_time(value) -> Optional[datetime]:
+    if isinstance(value, datetime):
+        return value
+    try:
+        return datetime.fromisoformat(str(value))
+    except:
+        return None
+
+
+def is_failed_response(response: str) -> bool:
+    return (response or "").startswith(FAILED_PREFIXES)
+
+
+def mine_pairs(rows) -> Dict[Tuple[str, str], int]:
+    """
+    rows: (user, timestamp, command, failed) in time order per user.
+    Returns {(typo, correction): times seen}.
+    """
+    counts: Dict[Tuple[str, str], int] = {}
+    prev = None
+    for user, ts, command, failed in rows:
+        command = (command or "").lower().strip()
+        ts = _parse_time(ts)
+        if (
+            prev is not None and not failed and command and ts is not None
+            and prev[0] == user and prev[3]
+            and 0 <= (ts - prev[1]).total_seconds() <= RETYPE_WINDOW
+        ):
+            typo = prev[2]
+            if (
+                typo != command and len(typo) <= MAX_LENGTH
+                and fuzz.ratio(typo, command) >= MIN_SIMILARITY
+            ):
+                counts[(typo, command)] = counts.get((typo, command), 0) + 1
+        prev = (user, ts, command, failed) if ts is not None else None
+    return counts
+
+
+class TypoMiner:
+    """Background job: history -> CorrectionStore -> FuzzyMatcher."""
+
+    def __init__(self, matcher=None, store: CorrectionStore = None,
+                 commands_db: str = "aura_commands.db", use_mysql: bool = True,
+                 interval: float = MINE_INTERVAL):
+        self.matcher = matcher
+        self.store = store or CorrectionStore(commands_db)
+        self.commands_db = commands_db
+        self.use_mysql = use_mysql
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+
+    # -------- sources --------
+    def _rows_from_sqlite(self):
+        """Commands logged by AURACommandEngine since the last run."""
+        last_id = self.store.get_watermark("sqlite")
+        try:
+            conn = sqlite3.connect(self.commands_db)
+            try:
+                rows = conn.execute(
+                    "SELECT id, timestamp, command, category, result FROM commands "
+                    "WHERE id >= ? ORDER BY id",
+                    (max(last_id, 1),),
+                ).fetchall()
+            finally:
+                conn.close()
+        except Exception as e:
+            print(f"[typo_miner] sqlite read failed: {e}")
+            return [], last_id
+
+        if not rows:
+            return [], last_id
+        mined = [
+            (None, ts, command, category == "search" or is_failed_response(result))
+            for _, ts, command, category, result in rows
+        ]
+        return mined, rows[-1][0]
+
+    def _rows_from_mysql(self):
+        """command_history rows since the last run, grouped by user."""
+        last_id = self.store.get_watermark("mysql")
+        try:
+            from aura.database import get_connection
+            conn = get_connection()
+        except Exception:
+            return [], last_id
+
+        try:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT id, user_id, timestamp, user_command, aura_response FROM command_history "
+                "WHERE id >= %s ORDER BY user_id, id",
+                (max(last_id, 1),),
+            )
+            rows = cursor.fetchall()
+            cursor.close()
+        except Exception as e:
+            print(f"[typo_miner] mysql read failed: {e}")
+            return [], last_id
+        finally:
+            conn.close()
+
+        if not rows:
+            return [], last_id
+        mined = [
+            (user_id, ts, command, is_failed_response(response))
+            for _, user_id, ts, command, response in rows
+        ]
+        return mined, max(r[0] for r in rows)
+
+    # -------- running --------
+    def run_once(self) -> int:
+        """Mine new history once. Returns how many corrections are active."""
+        # the row at the watermark is read again so a pair can span two runs;
+        # it only counts as the "typo" side, never twice as a retype
+        sources = [("sqlite", self._rows_from_sqlite)]
+        if self.use_mysql:
+            sources.append(("mysql", self._rows_from_mysql))
+
+        for source, read in sources:
+            rows, last_id = read()
+            self.store.add_pairs(mine_pairs(rows))
+            self.store.set_watermark(source, last_id)
+
+        return self.push()
+
+    def push(self) -> int:
+        """Send every supported correction to the matcher (idempotent)."""
+        pairs = self.store.corrections()
+        if self.matcher is not None:
+            self.matcher.load_corrections(pairs)
+        return len(pairs)
+
+    def _loop(self):
+        self.push()
+        while not self._stop.is_set():
+            try:
+                count = self.run_once()
+                print(f"[typo_miner] {count} learned corrections")
+            except Exception as e:
+                print(f"[typo_miner] run failed: {e}")
+            self._stop.wait(self.interval)
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name="typo-miner", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
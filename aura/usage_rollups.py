@@ -0,0 +1,168 @@
+# aura/usage_rollups.py
+"""
+Usage counters kept next to the `commands` log in aura_commands.db.
+
+    usage_category (category)                  -> count
+    usage_user     (user_key, category)        -> count
+    usage_daily    (day, category, user_key)   -> count
+
+SQLiteBackend calls apply() inside the same transaction that inserts
+the batch into `commands`, so the counters never drift from the log.
+A batch is first summed in Python and then costs one upsert per
+distinct (day, category, user) key. Stats read these small tables
+instead of running GROUP BY over `commands`, so they cost the same at
+ten rows or ten million. Counters are not decremented when old rows are
+archived or deleted, so totals cover the whole life of the install.
+
+Turns without a user are counted under user_key -1 (ANON_USER).
+Databases that existed before these tables are filled with backfill():
+
+    python backfill_usage.py [aura_commands.db]
+
+backfill() recounts `commands` (plus any archived segments it is given)
+and cannot recover who ran a command, so it refuses to replace counters
+that already exist unless forced.
+"""
+
+import sqlite3
+from collections import Counter
+from typing import Dict, Iterable, List
+
+ANON_USER = -1
+
+SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS usage_category (
+        category TEXT PRIMARY KEY,
+        count INTEGER NOT NULL
+    ) WITHOUT ROWID;
+    CREATE TABLE IF NOT EXISTS usage_user (
+        user_key INTEGER NOT NULL,
+        category TEXT NOT NULL,
+        count INTEGER NOT NULL,
+        PRIMARY KEY (user_key, category)
+    ) WITHOUT ROWID;
+    CREATE TABLE IF NOT EXISTS usage_daily (
+        day TEXT NOT NULL,
+        category TEXT NOT NULL,
+        user_key INTEGER NOT NULL,
+        count INTEGER NOT NULL,
+        PRIMARY KEY (day, category, user_key)
+    ) WITHOUT ROWID;
+'''
+
+_UPSERT_CATEGORY = (
+    "INSERT INTO usage_category (category, count) VALUES (?, ?) "
+    "ON CONFLICT(category) DO UPDATE SET count = count + excluded.count"
+)
+_UPSERT_USER = (
+    "INSERT INTO usage_user (user_key, category, count) VALUES (?, ?, ?) "
+    "ON CONFLICT(user_key, category) DO UPDATE SET count = count + excluded.count"
+)
+_UPSERT_DAILY = (
+    "INSERT INTO usage_daily (day, category, user_key, count) VALUES (?, ?, ?, ?) "
+    "ON CONFLICT(day, category, user_key) DO UPDATE SET count = count + excluded.count"
+)
+
+
+def ensure_schema(conn: sqlite3.Connection):
+    conn.executescript(SCHEMA)
+    conn.commit()
+
+
+def _user_key(user_id) -> int:
+    return ANON_USER if user_id is None else int(user_id)
+
+
+def apply(conn: sqlite3.Connection, records: Iterable):
+    """
+    Add HistoryRecords to the counters. Runs inside the caller's
+    transaction; records without a category are not counted.
+    """
+    daily = Counter()
+    for r in records:
+        if r.category is None:
+            continue
+        daily[(r.timestamp[:10], r.category, _user_key(r.user_id))] += 1
+    if not daily:
+        return
+    per_category, per_user = Counter(), Counter()
+    for (day, category, user_key), n in daily.items():
+        per_category[category] += n
+        per_user[(user_key, category)] += n
+    conn.executemany(_UPSERT_DAILY, [(*key, n) for key, n in daily.items()])
+    conn.executemany(_UPSERT_USER, [(*key, n) for key, n in per_user.items()])
+    conn.executemany(_UPSERT_CATEGORY, list(per_category.items()))
+
+
+def is_empty(conn: sqlite3.Connection) -> bool:
+    return conn.execute("SELECT 1 FROM usage_category LIMIT 1").fetchone() is None
+
+
+class CountersExist(Exception):
+    """backfill() would replace live counters (lifetime + per-user totals)."""
+
+
+def backfill(conn: sqlite3.Connection, force: bool = False, archived: Iterable[dict] = ()) -> int:
+    """
+    Rebuild every counter from `commands` (one pass, one transaction),
+    plus `archived` rows (dicts with id / timestamp / category, e.g.
+    retention.Archiver.iter_rows()) that are no longer in `commands`.
+    Neither has a user column, so every row counts as ANON_USER and the
+    per-user split is lost. Raises CountersExist if counters are already
+    there, unless force=True. Returns the number of rows counted.
+    """
+    if not force and not is_empty(conn):
+        raise CountersExist("usage counters already exist; rebuilding them loses per-user totals")
+    first_live = conn.execute("SELECT MIN(id) FROM commands").fetchone()[0]
+    old = Counter()
+    for row in archived:
+        # archived ids are below every live id, except a row archived twice
+        # by an interrupted pass, which is still in `commands`
+        if row.get("category") is None or (first_live is not None and row["id"] >= first_live):
+            continue
+        old[((row.get("timestamp") or "")[:10], row["category"])] += 1
+    with conn:
+        conn.execute("DELETE FROM usage_daily")
+        conn.execute("DELETE FROM usage_user")
+        conn.execute("DELETE FROM usage_category")
+        conn.execute(
+            "INSERT INTO usage_daily (day, category, user_key, count) "
+            "SELECT substr(timestamp, 1, 10), category, ?, COUNT(*) FROM commands "
+            "WHERE category IS NOT NULL GROUP BY 1, 2",
+            (ANON_USER,),
+        )
+        conn.executemany(_UPSERT_DAILY, [(day, category, ANON_USER, n)
+                                         for (day, category), n in old.items()])
+        conn.execute(
+            "INSERT INTO usage_user (user_key, category, count) "
+            "SELECT user_key, category, SUM(count) FROM usage_daily GROUP BY 1, 2"
+        )
+        conn.execute(
+            "INSERT INTO usage_category (category, count) "
+            "SELECT category, SUM(count) FROM usage_user GROUP BY 1"
+        )
+        total = conn.execute("SELECT COALESCE(SUM(count), 0) FROM usage_category").fetchone()[0]
+    return total
+
+
+# ---------- reads ----------
+def category_totals(conn: sqlite3.Connection) -> Dict[str, int]:
+    return dict(conn.execute("SELECT category, count FROM usage_category"))
+
+
+def user_totals(conn: sqlite3.Connection, user_id=None) -> Dict[str, int]:
+    return dict(conn.execute(
+        "SELECT category, count FROM usage_user WHERE user_key = ?", (_user_key(user_id),)
+    ))
+
+
+def daily(conn: sqlite3.Connection, since: str = None, until: str = None,
+          category: str = None) -> List[tuple]:
+    """(day, category, count) rows for since <= day < until (YYYY-MM-DD), all users."""
+    sql = "SELECT day, category, SUM(count) FROM usage_daily WHERE day >= ? AND day < ?"
+    params = [since or "", until or "\uffff"]
+    if category:
+        sql += " AND category = ?"
+        params.append(category)
+    sql += " GROUP BY day, category ORDER BY day"
+    return conn.execute(sql, params).fetchall()
@@ -2,17 +2,67 @@
 
 import json
 import queue
+import threading
 from typing import Callable, Optional
 
 import sounddevice as sd
 from vosk import Model, KaldiRecognizer
 
-from aura.engine import handle_command
+from aura.engine import get_engine, handle_command
 from aura.voice import speak_auto
 
 
 WAKE_WORDS = ["hey aura", "hai aura", "hey ora", "aura"]
 
+# partial transcripts shorter than this are too ambiguous to route
+MIN_PARTIAL_WORDS = 2
+
+
+class Speculator:
+    """
+    Runs engine.prewarm() on the newest partial transcript in a
+    background thread, so the audio loop never waits on it. Partials
+    that arrive while a warm-up is running replace each other; only the
+    latest one is warmed next.
+    """
+
+    def __init__(self, engine=None):
+        self.engine = engine or get_engine()
+        self._latest = None
+        self._last = ""
+        self._cond = threading.Condition()
+        threading.Thread(target=self._loop, name="aura-prewarm", daemon=True).start()
+
+    def feed(self, partial: str):
+        partial = partial.strip()
+        if partial == self._last or len(partial.split()) < MIN_PARTIAL_WORDS:
+            return
+        self._last = partial
+        # the token goes stale at finish(), so a partial still queued or
+        # warming then cannot leave its result behind
+        gen = self.engine.warm_generation()
+        with self._cond:
+            self._latest = (partial, gen)
+            self._cond.notify()
+
+    def finish(self, final: str):
+        """Final transcript arrived: keep or drop the warmed work."""
+        self._last = ""
+        with self._cond:
+            self._latest = None
+        self.engine.settle_prewarm(final)
+
+    def _loop(self):
+        while True:
+            with self._cond:
+                while self._latest is None:
+                    self._cond.wait()
+                (text, gen), self._latest = self._latest, None
+            try:
+                self.engine.prewarm(text, gen)
+            except Exception as e:
+                print("prewarm error:", e)
+
 
 class WakeWordListener:
     def __init__(self, model_path: str = "models/vosk-small-en",
@@ -22,6 +72,7 @@ class WakeWordListener:
         self.q: queue.Queue[bytes] = queue.Queue()
         self.listening_for_command = False
         self.on_wake = on_wake
+        self.speculator = Speculator()
 
     def _audio_callback(self, indata, frames, time_, status):
         if status:
@@ -33,6 +84,14 @@ class WakeWordListener:
         text = text.lower().strip()
         return any(w in text for w in WAKE_WORDS)
 
+    def _speculate(self, partial_json: str):
+        try:
+            partial = json.loads(partial_json).get("partial", "")
+        except Exception:
+            return
+        if partial:
+            self.speculator.feed(partial)
+
     def start(self):
         speak_auto("Wake word listener started. Say hey aura.")
         with sd.RawInputStream(
@@ -45,6 +104,8 @@ class WakeWordListener:
             while True:
                 data = self.q.get()
                 if not self.rec.AcceptWaveform(data):
+                    if self.listening_for_command:
+                        self._speculate(self.rec.PartialResult())
                     continue
 
                 result = self.rec.Result()
@@ -70,6 +131,10 @@ class WakeWordListener:
                     continue
 
                 self.listening_for_command = False
+                try:
+                    self.speculator.finish(text)
+                except Exception as e:
+                    print("prewarm error:", e)
                 try:
                     response = handle_command(text)
                 except Exception as e:
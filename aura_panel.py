@@ -14,12 +14,14 @@ Integrated with:
 import json
 import math
 import random
+import time
 from pathlib import Path
 from typing import Optional
 from threading import Thread
 
 from PyQt6.QtCore import (
-    Qt, QRectF, QPointF, QTimer, pyqtSignal, QThread
+    Qt, QRectF, QPointF, QTimer, pyqtSignal, QThread,
+    QObject, QRunnable, QThreadPool
 )
 from PyQt6.QtGui import (
     QPainter, QPaintEvent, QColor, QPen, QBrush, QFont,
@@ -27,7 +29,7 @@ from PyQt6.QtGui import (
 )
 from PyQt6.QtWidgets import (
     QApplication, QWidget, QLabel, QHBoxLayout, QVBoxLayout,
-    QLineEdit, QTextEdit, QPushButton
+    QLineEdit, QTextEdit, QPushButton, QComboBox, QListWidget, QListWidgetItem
 )
 
 import speech_recognition as sr
@@ -43,16 +45,12 @@ except Exception:
 # ----------------------------------------------
 # IMPORT AI ENGINE + WAKE WORD LISTENER + VOICE STATE
 # ----------------------------------------------
-from aura import get_engine
+from aura import get_engine, tracing
 from aura.wake_word_listener import WakeWordListener
 from aura.voice import is_speaking as voice_is_speaking
 
-# History (safe fallback)
-try:
-    from history import save_history
-except Exception:
-    def save_history(id, t, r, m): 
-        pass
+# commands executed at once; responses are still shown in submission order
+COMMAND_WORKERS = 2
 
 # ------------- UI COLORS -------------
 BG_DARK   = QColor(18, 20, 28, 255)
@@ -350,6 +348,41 @@ class VoiceThread(QThread):
         except Exception:
             pass
 
+# ------------------------------------------------------------
+# COMMAND WORKER (engine + history off the GUI thread)
+# ------------------------------------------------------------
+class CommandSignals(QObject):
+    done = pyqtSignal(int, str)     # seq, response
+
+
+class CommandWorker(QRunnable):
+    def __init__(self, seq, engine, text, user_id=None, mode="text"):
+        super().__init__()
+        self.setAutoDelete(False)   # the panel owns it until it reports back
+        self.seq = seq
+        self.engine = engine
+        self.text = text
+        self.user_id = user_id
+        self.mode = mode
+        self.cancelled = False
+        self.submitted = time.perf_counter()
+        self.signals = CommandSignals()
+
+    def run(self):
+        if self.cancelled:
+            return
+        with tracing.span("panel.command", mode=self.mode):
+            tracing.record("panel.queue_wait",
+                           (time.perf_counter() - self.submitted) * 1000, mode=self.mode)
+            # the engine records history (user id + input mode) exactly once
+            try:
+                resp = self.engine.execute(self.text, min_confidence=0.2,
+                                           user_id=self.user_id, mode=self.mode)
+            except Exception as e:
+                resp = f"Error: {e}"
+
+        self.signals.done.emit(self.seq, resp)
+
 # ------------------------------------------------------------
 # PILL INPUT
 # ------------------------------------------------------------
@@ -410,6 +443,165 @@ class PillInput(QWidget):
         p.drawPath(path)
         p.end()
 
+# ------------------------------------------------------------
+# HISTORY VIEW (full-text search over the local history mirror)
+# ------------------------------------------------------------
+HISTORY_RANGES = [("Any time", None), ("Today", "today"), ("Last 7 days", "7d"), ("Last 30 days", "30d")]
+HISTORY_PAGE = 30
+
+
+class HistorySignals(QObject):
+    done = pyqtSignal(object, object, str)  # job, page (or None), error
+
+
+class HistoryQuery(QRunnable):
+    """One history page, fetched off the GUI thread (flush + db lock can block)."""
+
+    def __init__(self, generation, engine, cursor, query):
+        super().__init__()
+        self.setAutoDelete(False)   # the view owns it until it reports back
+        self.generation = generation
+        self.engine = engine
+        self.cursor = cursor
+        self.query = query
+        self.signals = HistorySignals()
+
+    def run(self):
+        try:
+            page = self.engine.search_history(cursor=self.cursor, **self.query)
+            self.signals.done.emit(self, page, "")
+        except Exception as e:
+            self.signals.done.emit(self, None, str(e) or type(e).__name__)
+
+
+class HistoryView(QWidget):
+    """
+    Search box + category / time filters; pages are fetched by keyset
+    cursor on the panel's thread pool. Every new query bumps a
+    generation, and pages from an older one are dropped when they land.
+    """
+
+    def __init__(self, engine, pool, parent=None):
+        super().__init__(parent)
+        self.engine = engine
+        self.pool = pool
+        self._cursor = None
+        self._query = {}
+        self._generation = 0
+        self._jobs = set()          # HistoryQuery objects still running
+
+        combo_css = ("QComboBox{background:rgba(40,44,58,220);color:white;border:0;"
+                     "border-radius:6px;padding:3px 8px;font-size:12px;}")
+
+        self.search = QLineEdit(self)
+        self.search.setPlaceholderText("Search history…")
+        self.search.setStyleSheet("QLineEdit{background:rgba(40,44,58,220);color:white;border:0;"
+                                  "border-radius:8px;padding:5px 10px;font-size:13px;}")
+        self.category = QComboBox(self)
+        self.category.setStyleSheet(combo_css)
+        self.time_range = QComboBox(self)
+        self.time_range.setStyleSheet(combo_css)
+        for label, key in HISTORY_RANGES:
+            self.time_range.addItem(label, key)
+
+        self.results = QListWidget(self)
+        self.results.setStyleSheet("QListWidget{background:transparent;color:white;border:0;font-size:13px;}")
+        self.results.setWordWrap(True)
+
+        self.more_btn = QPushButton("Load more", self)
+        self.more_btn.setStyleSheet(
+            "QPushButton{color:rgba(150,170,255,220);background:transparent;border:0;font:600 12px 'Segoe UI';}"
+            "QPushButton:hover{color:white;}"
+        )
+        self.more_btn.clicked.connect(self._load_more)
+        self.more_btn.hide()
+
+        filters = QHBoxLayout()
+        filters.addWidget(self.search, 1)
+        filters.addWidget(self.category)
+        filters.addWidget(self.time_range)
+
+        lay = QVBoxLayout(self)
+        lay.setContentsMargins(0, 0, 0, 0)
+        lay.addLayout(filters)
+        lay.addWidget(self.results)
+        lay.addWidget(self.more_btn)
+
+        # re-query shortly after the user stops typing
+        self._debounce = QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(250)
+        self._debounce.timeout.connect(self.refresh)
+        self.search.textChanged.connect(lambda _: self._debounce.start())
+        self.category.currentIndexChanged.connect(lambda _: self.refresh())
+        self.time_range.currentIndexChanged.connect(lambda _: self.refresh())
+
+    def showEvent(self, e):
+        self._load_categories()
+        self.refresh()
+        super().showEvent(e)
+
+    def _load_categories(self):
+        current = self.category.currentData()
+        self.category.blockSignals(True)
+        self.category.clear()
+        self.category.addItem("All", None)
+        try:
+            for name in self.engine.history_categories():
+                self.category.addItem(name, name)
+        except Exception as e:
+            print("History categories error:", e)
+        idx = self.category.findData(current)
+        self.category.setCurrentIndex(max(idx, 0))
+        self.category.blockSignals(False)
+
+    def refresh(self):
+        """New query: first page."""
+        uid = getattr(self.window(), "user_id", None)
+        category = self.category.currentData()
+        self._query = {
+            "text": self.search.text().strip() or None,
+            "categories": [category] if category else None,
+            "time_range": self.time_range.currentData(),
+            "user_id": uid or None,
+            # imported / logged-out turns have no user; show them too
+            "include_unowned": True,
+            "limit": HISTORY_PAGE,
+        }
+        self.results.clear()
+        self._cursor = None
+        self._generation += 1
+        self._fetch()
+
+    def _load_more(self):
+        if self._cursor is not None:
+            self._fetch()
+
+    def _fetch(self):
+        self.more_btn.hide()        # until this page lands
+        job = HistoryQuery(self._generation, self.engine, self._cursor, dict(self._query))
+        job.signals.done.connect(self._on_page)
+        self._jobs.add(job)
+        self.pool.start(job)
+
+    def _on_page(self, job, page, error: str):
+        self._jobs.discard(job)
+        if job.generation != self._generation:
+            return              # the query changed while this page was loading
+        if page is None:
+            self.results.addItem(f"⚠️ History search failed: {error}")
+            return
+        for row in page["rows"]:
+            when = (row["timestamp"] or "")[:16].replace("T", " ")
+            tag = f" [{row['category']}]" if row["category"] else ""
+            item = QListWidgetItem(f"{when}{tag}  {row['command']}\n   → {row['response'] or ''}")
+            self.results.addItem(item)
+        if not page["rows"] and self._cursor is None:
+            self.results.addItem("No matching commands.")
+        self._cursor = page["next_cursor"]
+        self.more_btn.setVisible(self._cursor is not None)
+
+
 # ------------------------------------------------------------
 # AURA PANEL MAIN CLASS
 # ------------------------------------------------------------
@@ -428,9 +620,25 @@ class AuraPanel(QWidget):
         self.subtitle = QLabel("Loading…", self)
         self.subtitle.setStyleSheet("color:gray; font-size:13px;")
 
+        # in-flight commands
+        self.queue_label = QLabel("", self)
+        self.queue_label.setStyleSheet("color:rgba(150,170,255,220); font-size:12px;")
+        self.queue_label.hide()
+
         hl = QVBoxLayout()
         hl.addWidget(self.title)
         hl.addWidget(self.subtitle)
+        hl.addWidget(self.queue_label)
+
+        self.cancel_btn = QPushButton("⏹", self)
+        self.cancel_btn.setFixedSize(30, 30)
+        self.cancel_btn.setToolTip("Cancel last pending command (Esc)")
+        self.cancel_btn.setStyleSheet(
+            "QPushButton{color:rgba(150,170,255,220);background:transparent;border:0;font:700 15px 'Segoe UI';}"
+            "QPushButton:hover{color:white;}"
+        )
+        self.cancel_btn.clicked.connect(self._cancel_last_pending)
+        self.cancel_btn.hide()
 
         self.toggle_chat_btn = QPushButton("☰", self)
         self.toggle_chat_btn.setFixedSize(30, 30)
@@ -440,6 +648,15 @@ class AuraPanel(QWidget):
         )
         self.toggle_chat_btn.clicked.connect(self._toggle_chat)
 
+        self.history_btn = QPushButton("🔍", self)
+        self.history_btn.setFixedSize(30, 30)
+        self.history_btn.setToolTip("Search history")
+        self.history_btn.setStyleSheet(
+            "QPushButton{color:rgba(220,224,234,220);background:transparent;border:0;font:700 14px 'Segoe UI';}"
+            "QPushButton:hover{color:white;}"
+        )
+        self.history_btn.clicked.connect(self._toggle_history)
+
         self.close_btn = QPushButton("✕", self)
         self.close_btn.setFixedSize(30, 30)
         self.close_btn.setStyleSheet(
@@ -462,6 +679,8 @@ class AuraPanel(QWidget):
         header.addWidget(self.logo)
         header.addLayout(hl)
         header.addStretch()
+        header.addWidget(self.cancel_btn)
+        header.addWidget(self.history_btn)
         header.addWidget(self.toggle_chat_btn)
         header.addWidget(self.logout_btn)
         header.addWidget(self.close_btn)
@@ -486,6 +705,19 @@ class AuraPanel(QWidget):
         # AI engine
         self.enhanced_engine = get_engine()
 
+        # command queue: workers run on the pool, replies are shown in order
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(COMMAND_WORKERS)
+
+        # history search (hidden until toggled); queries run on the same pool
+        self.history = HistoryView(self.enhanced_engine, self._pool, self)
+        self.history.hide()
+        root.addWidget(self.history)
+        self._next_seq = 0
+        self._next_to_show = 0
+        self._pending = {}      # seq -> CommandWorker (not shown yet)
+        self._finished = {}     # seq -> response, waiting for earlier ones
+
         # VOICE THREAD (push-to-talk mic)
         model = model_path or "models/vosk-small-en"
         self.voice = VoiceThread(model, self)
@@ -577,6 +809,9 @@ class AuraPanel(QWidget):
     def _toggle_chat(self):
         self.chat.setVisible(not self.chat.isVisible())
 
+    def _toggle_history(self):
+        self.history.setVisible(not self.history.isVisible())
+
     def _append_chat(self, who, msg):
         self.chat.append(f"<b>{who}:</b> {msg}")
 
@@ -590,22 +825,70 @@ class AuraPanel(QWidget):
         who = "You (Voice)" if from_voice else "You"
         self._append_chat(who, text)
 
-        try:
-            resp = self.enhanced_engine.execute(text, min_confidence=0.2)
-        except Exception as e:
-            resp = f"Error: {e}"
-
-        self._append_chat("AURA", resp)
-
-        # save history if available
-        try:
-            win = self.window()
-            uid = getattr(win, "user_id", None)
-            if uid is not None:
-                mode = "voice" if from_voice else "text"
-                save_history(uid, text, resp, mode)
-        except Exception:
-            pass
+        win = self.window()
+        uid = getattr(win, "user_id", None)
+        mode = "voice" if from_voice else "text"
+
+        seq = self._next_seq
+        self._next_seq += 1
+        worker = CommandWorker(seq, self.enhanced_engine, text, uid, mode)
+        worker.signals.done.connect(self._on_command_done)
+        self._pending[seq] = worker
+        self._pool.start(worker)
+        self._update_queue()
+
+    def _on_command_done(self, seq: int, resp: str):
+        # already shown (e.g. cancelled while running) or already finished
+        if seq < self._next_to_show or seq in self._finished:
+            return
+        self._finished[seq] = resp
+        self._flush_responses()
+
+    def _flush_responses(self):
+        """Show finished replies in submission order."""
+        while self._next_to_show in self._finished:
+            seq = self._next_to_show
+            resp = self._finished.pop(seq)
+            self._pending.pop(seq, None)
+            self._append_chat("AURA", resp)
+            self._next_to_show += 1
+        self._update_queue()
+
+    def _cancel_last_pending(self):
+        """Cancel the newest command that has not replied yet."""
+        waiting = [seq for seq in self._pending if seq not in self._finished]
+        if not waiting:
+            return
+        seq = max(waiting)
+        worker = self._pending[seq]
+        worker.cancelled = True
+        # not started yet → drop it from the pool, nothing runs or is
+        # recorded. Running → it cannot be stopped: it finishes and the
+        # engine records it in history; only its reply is ignored.
+        if self._pool.tryTake(worker):
+            self._finished[seq] = f"⏹ Cancelled: {worker.text}"
+        else:
+            self._finished[seq] = f"⏹ Reply hidden (already running): {worker.text}"
+        self._flush_responses()
+
+    def _update_queue(self):
+        waiting = [w.text for seq, w in sorted(self._pending.items())
+                   if seq not in self._finished]
+        if not waiting:
+            self.queue_label.hide()
+            self.cancel_btn.hide()
+            return
+        shown = " · ".join(t if len(t) <= 24 else t[:23] + "…" for t in waiting[:3])
+        more = f" +{len(waiting) - 3}" if len(waiting) > 3 else ""
+        self.queue_label.setText(f"⏳ {len(waiting)} running: {shown}{more}")
+        self.queue_label.show()
+        self.cancel_btn.show()
+
+    def keyPressEvent(self, e):
+        if e.key() == Qt.Key.Key_Escape and self._pending:
+            self._cancel_last_pending()
+            return
+        super().keyPressEvent(e)
 
     # UI background
     def paintEvent(self, e: QPaintEvent):
@@ -679,6 +962,11 @@ class MainWindow(QWidget):
                 self.panel.voice.wait(500)
         except Exception:
             pass
+        try:
+            self.panel._pool.clear()
+            self.panel._pool.waitForDone(1000)
+        except Exception:
+            pass
 
 # ------------------------------------------------------------
 # TEST MODE
@@ -1,4 +1,4 @@
-# auth.py — login/register using password_hash
+# auth.py — login/register using password_hash (pooled connections via db.py)
 from db import get_connection
 import bcrypt
 
@@ -8,7 +8,7 @@ def register_user(name: str, email: str, password: str):
     try:
         pw_hash = bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
         conn = get_connection()
-        cursor = conn.cursor()
+        cursor = conn.cursor(prepared=True)
         cursor.execute(
             "INSERT INTO users (name, email, password_hash) VALUES (%s, %s, %s)",
             (name, email, pw_hash)
@@ -30,7 +30,7 @@ def login_user(email: str, password: str):
     cursor = None
     try:
         conn = get_connection()
-        cursor = conn.cursor()
+        cursor = conn.cursor(prepared=True)
         cursor.execute("SELECT user_id, name, password_hash FROM users WHERE email=%s", (email,))
         row = cursor.fetchone()
         if not row:
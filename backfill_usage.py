@@ -0,0 +1,48 @@
+# backfill_usage.py
+"""
+Rebuild the usage rollups (aura/usage_rollups.py) from the `commands`
+log and the archived segments (aura/retention.py). Needed once for
+databases created before the rollups existed; the engine also does this
+by itself when it finds them empty.
+
+Neither the log nor the archive records who ran a command, so per-user
+counts cannot be rebuilt: every recounted command is counted as
+anonymous. The script therefore refuses to touch counters that already
+exist unless --force is given.
+
+Run:  python backfill_usage.py [aura_commands.db] [--force]
+"""
+
+import sqlite3
+import sys
+
+from aura import retention, usage_rollups
+
+
+def main():
+    args = [a for a in sys.argv[1:] if a != "--force"]
+    force = "--force" in sys.argv[1:]
+    db_path = args[0] if args else "aura_commands.db"
+    conn = sqlite3.connect(db_path)
+    try:
+        usage_rollups.ensure_schema(conn)
+        archiver = retention.Archiver(db_path)
+        total = usage_rollups.backfill(conn, force=force, archived=archiver.iter_rows())
+        print(f"✅ Usage rollups rebuilt from {db_path} "
+              f"({len(archiver.segments())} archived partitions): {total:,} commands counted")
+        print("   per-user counts cannot be rebuilt; every command now counts as anonymous")
+        totals = usage_rollups.category_totals(conn)
+        for category, count in sorted(totals.items(), key=lambda kv: -kv[1]):
+            print(f"   {category:<14} {count:>10,}")
+    except usage_rollups.CountersExist as e:
+        print(f"❌ {e}. Run with --force to rebuild them anyway.")
+        sys.exit(1)
+    except sqlite3.OperationalError as e:
+        print(f"❌ Backfill failed: {e}")
+        sys.exit(1)
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
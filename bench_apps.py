@@ -0,0 +1,136 @@
+# bench_apps.py
+"""
+App-name fuzzy resolution benchmark: trigram index + difflib rerank vs.
+the old difflib.get_close_matches scan over every index key, on a
+synthetic 20k-entry apps index (Start Menu / EXE / Store style names).
+
+Nothing is launched; only the name resolution step is timed.
+
+Run:  python bench_apps.py [entries] [queries]
+"""
+
+import difflib
+import random
+import string
+import sys
+import time
+
+from aura.skills import apps
+
+VENDORS = ["microsoft", "adobe", "google", "jetbrains", "autodesk", "mozilla", "oracle",
+           "nvidia", "intel", "amd", "hp", "dell", "lenovo", "logitech", "steam", "epic games",
+           "zoom", "slack", "discord", "spotify", "vlc", "7-zip", "notepad++", "python", "git"]
+PRODUCTS = ["word", "excel", "powerpoint", "outlook", "teams", "edge", "photoshop", "illustrator",
+            "acrobat reader", "chrome", "drive", "pycharm", "intellij idea", "autocad", "firefox",
+            "virtualbox", "control panel", "driver update", "support assistant", "vantage",
+            "options", "launcher", "player", "media player", "uninstall", "documentation",
+            "visual studio code", "terminal", "bash", "idle", "manual", "release notes"]
+SUFFIXES = ["", "", "", " 2019", " 2021", " 2024", " x64", " (x86)", " beta", " help", " settings"]
+
+
+def _word(rng):
+    return "".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 9)))
+
+
+def make_index(size, seed=3):
+    rng = random.Random(seed)
+    index = {}
+    while len(index) < size:
+        kind = rng.random()
+        if kind < 0.6:
+            name = f"{rng.choice(VENDORS)} {rng.choice(PRODUCTS)}{rng.choice(SUFFIXES)}"
+            if name in index:
+                name = f"{name} {_word(rng)}"
+        elif kind < 0.85:
+            name = f"{_word(rng)} {rng.choice(PRODUCTS)}"
+        else:
+            name = _word(rng) + rng.choice(["", "", " " + _word(rng)])
+        key = apps._normalize(name)
+        index.setdefault(key, {"kind": "exe", "path": f"C:\\Apps\\{name}.exe", "display": name})
+    return index
+
+
+def _typo(text, rng):
+    if len(text) < 4:
+        return text
+    i = rng.randrange(len(text) - 1)
+    op = rng.randrange(3)
+    if op == 0:
+        return text[:i] + text[i + 1:]
+    if op == 1:
+        return text[:i] + text[i + 1] + text[i] + text[i + 2:]
+    return text[:i] + rng.choice(string.ascii_lowercase) + text[i + 1:]
+
+
+def make_queries(index, count, seed=8):
+    """[(kind, query)]"""
+    rng = random.Random(seed)
+    keys = list(index)
+    queries = []
+    for _ in range(count):
+        key = rng.choice(keys)
+        kind = rng.random()
+        if kind < 0.5:
+            queries.append(("typo", _typo(key, rng)))
+        elif kind < 0.7:
+            queries.append(("typo", _typo(_typo(key, rng), rng)))
+        elif kind < 0.85:
+            queries.append(("prefix", " ".join(key.split()[:2])))   # "adobe photoshop" for "... 2024"
+        else:
+            queries.append(("unknown", _word(rng)))                  # not an installed app
+    return queries
+
+
+def full_scan(target, index):
+    found = difflib.get_close_matches(target, list(index.keys()), n=1, cutoff=apps.FUZZY_CUTOFF)
+    return found[0] if found else None
+
+
+def _time(fn, queries):
+    out, times = [], []
+    for q in queries:
+        start = time.perf_counter()
+        out.append(fn(q))
+        times.append(time.perf_counter() - start)
+    times.sort()
+    return out, sum(times) / len(times) * 1000, times[int(len(times) * 0.99)] * 1000
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    n_queries = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+
+    index = make_index(size)
+    kinds, queries = zip(*make_queries(index, n_queries))
+
+    t0 = time.perf_counter()
+    grams = apps._build_ngram_index(index.keys())
+    build_ms = (time.perf_counter() - t0) * 1000
+
+    print("\n" + "=" * 80)
+    print(f"⏱️  APP RESOLUTION over {len(index)} apps, {len(queries)} queries")
+    print("=" * 80)
+    print(f"   trigram index build: {build_ms:.1f} ms ({len(grams)} trigrams)")
+
+    ref, scan_ms, scan_p99 = _time(lambda q: full_scan(q, index), queries)
+    got, idx_ms, idx_p99 = _time(lambda q: apps._fuzzy_match(q, index, grams), queries)
+    print(f"   full difflib scan:   {scan_ms:>8.2f} ms mean  {scan_p99:>8.2f} ms p99")
+    print(f"   trigram + rerank:    {idx_ms:>8.2f} ms mean  {idx_p99:>8.2f} ms p99  "
+          f"({scan_ms / idx_ms:.0f}x)")
+
+    print("   same answer as the full scan:")
+    for kind in ("typo", "prefix", "unknown"):
+        rows = [(a, b) for k, a, b in zip(kinds, ref, got) if k == kind]
+        if rows:
+            agree = sum(a == b for a, b in rows) / len(rows) * 100
+            print(f"     {kind:<8} {agree:>6.1f}%  ({len(rows)} queries)")
+
+    for kind, q, a, b in zip(kinds, queries, ref, got):
+        if a != b:
+            print(f"   e.g. {kind} {q!r}: scan={a!r} index={b!r}")
+            break
+    print("=" * 80)
+
+
+if __name__ == "__main__":
+    main()
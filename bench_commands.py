@@ -0,0 +1,226 @@
+# bench_commands.py
+"""
+Command replay + latency benchmark.
+
+Replays a corpus through AURACommandEngine.parse_command (routing +
+handler) and EnhancedNLP.parse with every side effect stubbed out
+(browser, processes and SMTP go to the aura.sandbox recorder; timers
+and files are patched; parse_command records no history), then reports
+p50 / p95 / p99 latency and throughput per routing category / intent.
+
+Corpus sources:
+  --jsonl FILE [--field NAME]   one JSON object per line (e.g. requests.jsonl)
+  --history FILE                aura_commands.db, or a CSV export of
+                                command_history (user_command column)
+  --generate N                  synthetic commands (default: 5000)
+
+Examples:
+  python bench_commands.py --generate 20000
+  python bench_commands.py --history aura_commands.db --repeat 5
+  python bench_commands.py --jsonl requests.jsonl --field title --json report.json
+"""
+
+import argparse
+import contextlib
+import csv
+import json
+import sqlite3
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from unittest import mock
+
+from aura.sandbox import sandboxed
+from bench_nlp import make_corpus
+
+JSONL_FIELDS = ("command", "user_command", "text", "title")
+
+
+# ---------- corpus loading ----------
+def load_jsonl(path, field=None):
+    commands = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            row = json.loads(line)
+            if isinstance(row, str):
+                commands.append(row)
+                continue
+            keys = [field] if field else JSONL_FIELDS
+            for key in keys:
+                if row.get(key):
+                    commands.append(str(row[key]))
+                    break
+    return commands
+
+
+def load_history(path):
+    if path.endswith(".csv"):
+        with open(path, newline="", encoding="utf-8") as f:
+            return [row.get("user_command") or row.get("command") or ""
+                    for row in csv.DictReader(f)]
+    conn = sqlite3.connect(path)
+    try:
+        return [row[0] for row in conn.execute("SELECT command FROM commands ORDER BY id")]
+    finally:
+        conn.close()
+
+
+# ---------- side-effect stubs ----------
+class _NoTimer:
+    daemon = True
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def start(self):
+        pass
+
+    def cancel(self):
+        pass
+
+
+@contextlib.contextmanager
+def stubbed_side_effects():
+    """
+    Sandbox everything a handler could launch or send, and patch out what
+    the sandbox does not cover (timers, files).
+    Yields the sandbox recorder.
+    """
+    with contextlib.ExitStack() as stack:
+        recorder = stack.enter_context(sandboxed())
+        for target, value in [
+            ("threading.Timer", _NoTimer),
+            ("pathlib.Path.touch", None),
+            ("pathlib.Path.unlink", None),
+        ]:
+            new = value if value is not None else mock.MagicMock()
+            stack.enter_context(mock.patch(target, new, create=True))
+        yield recorder
+
+
+# ---------- stats ----------
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    idx = min(len(sorted_values) - 1, max(0, int(round(pct / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[idx]
+
+
+def summarize(samples):
+    """samples: {label: [seconds, ...]} -> {label: stats}"""
+    report = {}
+    everything = []
+    for label, values in samples.items():
+        everything.extend(values)
+        report[label] = _stats(values)
+    report["ALL"] = _stats(everything)
+    return report
+
+
+def _stats(values):
+    values = sorted(values)
+    total = sum(values)
+    return {
+        "count": len(values),
+        "p50_us": percentile(values, 50) * 1e6,
+        "p95_us": percentile(values, 95) * 1e6,
+        "p99_us": percentile(values, 99) * 1e6,
+        "ops_per_s": len(values) / total if total else 0.0,
+    }
+
+
+def print_report(title, report):
+    print("\n" + "=" * 80)
+    print(title)
+    print("=" * 80)
+    print(f"{'category':<14}{'count':>8}{'p50 µs':>11}{'p95 µs':>11}{'p99 µs':>11}{'ops/s':>14}")
+    print("-" * 80)
+    rows = sorted((k, v) for k, v in report.items() if k != "ALL")
+    rows.append(("ALL", report["ALL"]))
+    for label, st in rows:
+        print(f"{label:<14}{st['count']:>8}{st['p50_us']:>11.1f}{st['p95_us']:>11.1f}"
+              f"{st['p99_us']:>11.1f}{st['ops_per_s']:>14,.0f}")
+
+
+# ---------- runners ----------
+def bench_engine(corpus, repeat):
+    from aura.command_engine import AURACommandEngine
+
+    engine = AURACommandEngine(db_path=":memory:", history_backends=[])
+    samples = defaultdict(list)
+    with stubbed_side_effects() as recorder:
+        for _ in range(repeat):
+            for cmd in corpus:
+                category = engine.route(cmd)[0] if cmd else "empty"
+                start = time.perf_counter()
+                engine.parse_command(cmd)
+                samples[category].append(time.perf_counter() - start)
+    engine.close()
+    return summarize(samples), recorder.summary()
+
+
+def bench_nlp(corpus, repeat, cache):
+    from aura.enhanced_nlp import EnhancedNLP
+
+    nlp = EnhancedNLP() if cache else EnhancedNLP(cache_size=0)
+    samples = defaultdict(list)
+    for _ in range(repeat):
+        for cmd in corpus:
+            start = time.perf_counter()
+            intent, _ = nlp.parse(cmd)
+            samples[intent].append(time.perf_counter() - start)
+    return summarize(samples)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay commands and report routing latency.")
+    src = parser.add_mutually_exclusive_group()
+    src.add_argument("--jsonl", help="JSONL corpus")
+    src.add_argument("--history", help="aura_commands.db or command_history CSV export")
+    src.add_argument("--generate", type=int, default=5000, help="synthetic corpus size")
+    parser.add_argument("--field", help="JSONL field holding the command text")
+    parser.add_argument("--repeat", type=int, default=1, help="replay the corpus N times")
+    parser.add_argument("--no-cache", action="store_true", help="disable the EnhancedNLP parse cache")
+    parser.add_argument("--json", help="also write the report to this file")
+    args = parser.parse_args(argv)
+
+    if args.jsonl:
+        corpus, source = load_jsonl(args.jsonl, args.field), args.jsonl
+    elif args.history:
+        corpus, source = load_history(args.history), args.history
+    else:
+        corpus, source = make_corpus(args.generate), f"generated ({args.generate})"
+
+    if not corpus:
+        print(f"❌ No commands found in {source}")
+        return 1
+    print(f"📂 Corpus: {source} — {len(corpus)} commands × {args.repeat}")
+
+    engine_report, effects = bench_engine(corpus, args.repeat)
+    report = {
+        "corpus": source,
+        "commands": len(corpus),
+        "repeat": args.repeat,
+        "parse_command": engine_report,
+        "nlp_parse": bench_nlp(corpus, args.repeat, cache=not args.no_cache),
+        "sandbox_effects": effects,
+    }
+    print_report("⏱️  AURACommandEngine.parse_command (by routing category)", report["parse_command"])
+    print_report("⏱️  EnhancedNLP.parse (by intent)", report["nlp_parse"])
+    print("\n🧪 Sandboxed effects (not performed)")
+    for kind, row in sorted(effects.items()):
+        print(f"   {kind:<14}{row['count']:>8}   ~{row['latency']:.1f}s simulated")
+    print("=" * 80)
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"💾 Report written to {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
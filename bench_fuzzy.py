@@ -0,0 +1,152 @@
+# bench_fuzzy.py
+"""
+FuzzyMatcher lookup benchmark: SymSpell candidate index vs. the old
+full scan (process.extractOne + token_set_ratio over every phrase).
+
+For each phrase-table size the index is built with canonical phrases
+only, the same set the full scan sees. Both paths use the same scorer
+and the same "> 80" cutoff. The report shows mean and p99 lookup time,
+and how often the two paths agree on the corrected output. The index
+prunes candidates heuristically, so agreement is high but not exactly
+100%.
+
+Run:  python bench_fuzzy.py [queries]
+"""
+
+import random
+import string
+import sys
+import time
+
+from rapidfuzz import fuzz as rfuzz, process as rprocess
+from rapidfuzz.utils import default_process
+
+from aura.fuzzy_matcher import FuzzyMatcher, MATCH_CUTOFF
+from aura.symspell_index import SymSpellIndex
+
+SIZES = [0, 1000, 10000, 50000]     # 0 = the real correct_commands table (scanned)
+FUZZYWUZZY_MAX = 1000               # pure-python full scan is too slow above this
+
+WORDS = ["open", "close", "play", "pause", "next", "volume", "brightness", "wifi",
+         "bluetooth", "send", "email", "search", "lock", "system", "screenshot",
+         "music", "song", "chrome", "notepad", "spotify", "timer", "alarm", "weather"]
+
+
+def _typo(text, rng):
+    """One random edit: drop, swap, duplicate or replace a character."""
+    if len(text) < 3:
+        return text
+    i = rng.randrange(len(text) - 1)
+    op = rng.randrange(4)
+    if op == 0:
+        return text[:i] + text[i + 1:]
+    if op == 1:
+        return text[:i] + text[i + 1] + text[i] + text[i + 2:]
+    if op == 2:
+        return text[:i] + text[i] + text[i:]
+    return text[:i] + rng.choice(string.ascii_lowercase) + text[i + 1:]
+
+
+def make_phrases(size, seed=5):
+    base = list(FuzzyMatcher().correct_commands)
+    rng = random.Random(seed)
+    phrases, seen = list(base), set(base)
+    while len(phrases) < size:
+        words = [rng.choice(WORDS)] + ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 8)))
+                                        for _ in range(rng.randint(1, 2))]
+        phrase = " ".join(words)
+        if phrase not in seen:
+            seen.add(phrase)
+            phrases.append(phrase)
+    return phrases
+
+
+def make_queries(phrases, count, seed=9):
+    rng = random.Random(seed)
+    queries = []
+    for _ in range(count):
+        phrase = rng.choice(phrases)
+        kind = rng.random()
+        if kind < 0.5:
+            queries.append(_typo(phrase, rng))
+        elif kind < 0.7:
+            queries.append(_typo(_typo(phrase, rng), rng))
+        elif kind < 0.85:
+            queries.append(f"please {phrase} now")
+        else:
+            queries.append(" ".join(rng.choices(WORDS, k=rng.randint(1, 4))))
+    return queries
+
+
+def scan_rapidfuzz(phrases, text):
+    result = rprocess.extractOne(text, phrases, scorer=rfuzz.token_set_ratio,
+                                 processor=default_process, score_cutoff=70)
+    if result and int(round(result[1])) > MATCH_CUTOFF:
+        return result[0]
+    return text
+
+
+def scan_fuzzywuzzy(phrases, text):
+    from fuzzywuzzy import fuzz, process
+    result = process.extractOne(text, phrases, scorer=fuzz.token_set_ratio, score_cutoff=70)
+    if result and result[1] > MATCH_CUTOFF:
+        return result[0]
+    return text
+
+
+def indexed(index, text):
+    result = index.lookup(text, cutoff=MATCH_CUTOFF)
+    return result[0] if result else text
+
+
+def _time(fn, queries):
+    """(outputs, mean µs, p99 µs)"""
+    out, times = [], []
+    for q in queries:
+        start = time.perf_counter()
+        out.append(fn(q))
+        times.append(time.perf_counter() - start)
+    times.sort()
+    return out, sum(times) / len(times) * 1e6, times[int(len(times) * 0.99)] * 1e6
+
+
+def main():
+    n_queries = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    print("\n" + "=" * 96)
+    print("⏱️  FUZZY CORRECTION (µs per lookup, mean)")
+    print("=" * 96)
+    print(f"{'phrases':>8} | {'build ms':>8} | {'fuzzywuzzy':>10} | {'rapidfuzz':>10} | "
+          f"{'index':>8} | {'index p99':>9} | {'speedup':>7} | agree")
+    print("-" * 96)
+
+    for size in SIZES:
+        phrases = make_phrases(size)
+        queries = [q.lower().strip() for q in make_queries(phrases, n_queries)]
+
+        t0 = time.perf_counter()
+        index = SymSpellIndex()
+        for phrase in phrases:
+            index.add(phrase, phrase)
+        build_ms = (time.perf_counter() - t0) * 1000
+
+        ref, rapid_us, _ = _time(lambda q: scan_rapidfuzz(phrases, q), queries)
+        got, index_us, index_p99 = _time(lambda q: indexed(index, q), queries)
+        agree = sum(a == b for a, b in zip(ref, got)) / len(queries) * 100
+
+        if len(phrases) <= FUZZYWUZZY_MAX:
+            sample = queries[:200]
+            _, wuzzy_us, _ = _time(lambda q: scan_fuzzywuzzy(phrases, q), sample)
+            wuzzy = f"{wuzzy_us:>10.1f}"
+        else:
+            wuzzy = f"{'-':>10}"
+
+        print(f"{len(phrases):>8} | {build_ms:>8.1f} | {wuzzy} | {rapid_us:>10.1f} | "
+              f"{index_us:>8.1f} | {index_p99:>9.1f} | {rapid_us / index_us:>6.1f}x | {agree:.2f}%")
+
+    print("=" * 96)
+    matcher = FuzzyMatcher()
+    print(f"📚 FuzzyMatcher index: {matcher.index.stats()}")
+
+
+if __name__ == "__main__":
+    main()
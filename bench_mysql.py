@@ -0,0 +1,114 @@
+# bench_mysql.py
+"""
+command_history insert throughput: a fresh connection per insert (the
+old save_command / save_history path) vs. the shared pool one row at a
+time, vs. the pooled executemany batches the history journal syncer
+sends (its real INSERT, client_uuid and all).
+
+Rows go to a scratch copy of command_history (aura_bench_history) that
+is dropped afterwards. Needs the MySQL settings from .env.
+
+Run:  python bench_mysql.py [rows] [threads]
+"""
+
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime
+
+import mysql.connector
+from mysql.connector import Error
+
+from aura import db_pool
+from aura.history_journal import INSERT_REMOTE_SQL
+
+TABLE = "aura_bench_history"
+INSERT_SQL = INSERT_REMOTE_SQL.replace("command_history", TABLE)
+
+
+def _row(i):
+    return (str(uuid.uuid4()), None, f"bench command {i}", "bench response", "text",
+            datetime.now().replace(microsecond=0))
+
+
+def fresh_connection_insert(i):
+    """Before: connect, insert, commit, close - every time."""
+    conn = mysql.connector.connect(**db_pool.db_config())
+    try:
+        cursor = conn.cursor()
+        cursor.execute(INSERT_SQL, _row(i))
+        conn.commit()
+        cursor.close()
+    finally:
+        conn.close()
+
+
+def pooled_insert(i):
+    """Pooled connection, one row per statement."""
+    db_pool.execute(INSERT_SQL, _row(i), prepared=False)
+
+
+def _run(fn, rows, threads):
+    """rows/s with `threads` workers sharing the work."""
+    def worker(offset):
+        for i in range(offset, rows, threads):
+            fn(i)
+
+    pool = [threading.Thread(target=worker, args=(t,)) for t in range(threads)]
+    start = time.perf_counter()
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    return rows / (time.perf_counter() - start)
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    threads = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+
+    try:
+        with db_pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"DROP TABLE IF EXISTS {TABLE}")
+            cursor.execute(f"CREATE TABLE {TABLE} LIKE command_history")
+            try:
+                # command_history not migrated by the journal syncer yet
+                cursor.execute(f"ALTER TABLE {TABLE} ADD COLUMN client_uuid CHAR(36) NULL, "
+                               f"ADD UNIQUE (client_uuid)")
+            except Error:
+                pass
+            conn.commit()
+            cursor.close()
+    except Exception as e:
+        print(f"❌ MySQL not reachable ({e}); set DB_HOST / DB_USER / DB_PASSWORD / DB_NAME")
+        sys.exit(1)
+
+    print("\n" + "=" * 80)
+    print(f"⏱️  command_history INSERTs ({rows} rows, pool size {db_pool.POOL_SIZE})")
+    print("=" * 80)
+    try:
+        for workers in sorted({1, threads}):
+            before = _run(fresh_connection_insert, rows, workers)
+            after = _run(pooled_insert, rows, workers)
+            print(f"   {workers} thread(s): fresh connection {before:>9,.0f} rows/s   "
+                  f"pooled {after:>9,.0f} rows/s  ({after / before:.1f}x)")
+
+        batch = [_row(i) for i in range(rows)]
+        start = time.perf_counter()
+        db_pool.executemany(INSERT_SQL, batch)
+        print(f"   journal sync batch (executemany, 1 transaction): "
+              f"{rows / (time.perf_counter() - start):>9,.0f} rows/s")
+        print(f"   pool: {db_pool.stats()}")
+    finally:
+        with db_pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"DROP TABLE IF EXISTS {TABLE}")
+            conn.commit()
+            cursor.close()
+    print("=" * 80)
+
+
+if __name__ == "__main__":
+    main()
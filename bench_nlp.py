@@ -0,0 +1,241 @@
+# bench_nlp.py
+"""
+Equivalence check + throughput benchmark for EnhancedNLP.parse.
+
+Compares the current implementation (precompiled patterns, one shared
+ParsedUtterance per input) against the original re.search-per-call,
+substring-scan version over a large generated corpus. Every (intent,
+entities) pair must be identical, except where an app/website name
+only appears inside a longer word: those are now whole-word matches.
+
+Run:  python bench_nlp.py [corpus_size]
+"""
+
+import random
+import re
+import sys
+import time
+from datetime import datetime
+
+from aura.enhanced_nlp import EnhancedNLP, ParsedUtterance
+
+
+class LegacyNLP(EnhancedNLP):
+    """
+    Original extractors: patterns passed to re.search as strings, every
+    extractor lowercasing and rescanning the raw input, known names found
+    by substring scans.
+    """
+
+    def extract_intent(self, user_input: str) -> str:
+        text = user_input.lower()
+        for intent, pattern in self.intent_patterns.items():
+            if re.search(pattern, text):
+                return intent
+        return "general"
+
+    def extract_email(self, user_input: str):
+        emails = re.findall(r"[\w\.-]+@[\w\.-]+\.\w+", user_input)
+        return emails[0] if emails else None
+
+    def extract_number(self, user_input: str):
+        numbers = re.findall(r"\b\d+\b", user_input)
+        return [int(n) for n in numbers] if numbers else None
+
+    def extract_app(self, user_input: str):
+        text = user_input.lower()
+        for app in self.known_apps:
+            if app in text:
+                return app
+        return None
+
+    def extract_website(self, user_input: str):
+        text = user_input.lower()
+        for site in self.known_websites:
+            if site in text:
+                return site
+        return None
+
+    def extract_query(self, user_input: str):
+        query = user_input.lower()
+        for kw in self.query_keywords:
+            query = query.replace(kw, "")
+        return query.strip()
+
+    def extract_entities(self, user_input: str):
+        entities = {}
+        for name, value in (("email", self.extract_email(user_input)),
+                            ("app", self.extract_app(user_input)),
+                            ("website", self.extract_website(user_input)),
+                            ("numbers", self.extract_number(user_input))):
+            if value:
+                entities[name] = value
+        query = self.extract_query(user_input)
+        if query and len(query) > 2:
+            entities["query"] = query
+        quoted = re.findall(r'"([^"]*)"', user_input)
+        if quoted:
+            entities["quoted"] = quoted
+        return entities
+
+    def parse(self, user_input: str):
+        intent, entities = self.extract_intent(user_input), self.extract_entities(user_input)
+        entities = {k: list(v) if isinstance(v, list) else v for k, v in entities.items()}
+        entities["raw_input"] = user_input
+        entities["timestamp"] = datetime.now().isoformat()
+        return intent, entities
+
+
+TEMPLATES = [
+    "{verb} {app}",
+    "{polite} {verb} {app}",
+    "{polite} {verb} {site} for me",
+    "search for {topic}",
+    "google {topic}",
+    "what is {topic}",
+    "tell me about {topic} {polite}",
+    "how to {topic}",
+    "play {topic} on youtube",
+    "watch {topic} video",
+    "send email to {email} about {topic}",
+    "email to {email}",
+    "mail to {email} saying \"{topic}\"",
+    "compose a mail to {email}",
+    "set volume to {num}",
+    "set brightness to {num} percent",
+    "what time is it",
+    "what's the weather in {city}",
+    "take a screenshot",
+    "lock my pc",
+    "{word} {word} {word}",
+    "{word}{word} {topic}",
+    "{polite} help",
+]
+
+VOCAB = {
+    "verb": ["open", "launch", "start", "run", "Open", "START"],
+    "polite": ["please", "can you", "could you", "Please", ""],
+    "app": ["chrome", "notepad", "vscode", "Word", "excel", "spotify", "vlc", "paint", "edge", "telegram"],
+    "site": ["github", "reddit", "netflix", "youtube", "gmail", "wikipedia", "whatsapp"],
+    "topic": ["python decorators", "black holes", "despacito", "how to cook rice",
+              "the weather", "email etiquette", "playlist", "find my phone", "startup ideas"],
+    "email": ["amma@gmail.com", "Sinchana.B@college.edu", "dad", "kushi"],
+    "num": ["10", "50", "75", "100"],
+    "city": ["delhi", "bangalore", "mysore"],
+    "word": ["email", "mail", "to", "send", "find", "open", "play", "run", "watch",
+             "search", "for", "what", "is", "how", "google", "start", "launch", "e", "x"],
+}
+
+
+def make_corpus(size, seed=11):
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(size):
+        tpl = rng.choice(TEMPLATES)
+        text = re.sub(r"\{(\w+)\}", lambda m: rng.choice(VOCAB[m.group(1)]), tpl)
+        corpus.append(text)
+    return corpus
+
+
+def _strip_volatile(entities):
+    entities = dict(entities)
+    entities.pop("timestamp", None)
+    return entities
+
+
+def _inside_word(text, a_ent, b_ent):
+    """
+    Known app/website names are now matched as whole words only, so a
+    name buried in a longer word ("togoogle") is no longer reported.
+    True if that is the only difference.
+    """
+    words = set(re.findall(r"\w+", text.lower()))
+    for key in ("app", "website"):
+        if a_ent.get(key) != b_ent.get(key):
+            if a_ent.get(key) in words:
+                return False
+            a_ent, b_ent = dict(a_ent), dict(b_ent)
+            a_ent.pop(key, None)
+            b_ent.pop(key, None)
+    return a_ent == b_ent
+
+
+def check_equivalence(corpus, legacy, fast):
+    """(mismatches, expected whole-word differences)"""
+    mismatches = whole_word = 0
+    for text in corpus:
+        a_intent, a_ent = legacy.parse(text)
+        b_intent, b_ent = fast.parse(text)
+        a_ent, b_ent = _strip_volatile(a_ent), _strip_volatile(b_ent)
+        if a_intent == b_intent and a_ent == b_ent:
+            continue
+        if a_intent == b_intent and _inside_word(text, a_ent, b_ent):
+            whole_word += 1
+            continue
+        mismatches += 1
+        if mismatches <= 5:
+            print(f"   ❌ {text!r}: {a_intent} {a_ent} != {b_intent} {b_ent}")
+    return mismatches, whole_word
+
+
+def throughput(nlp, corpus):
+    start = time.perf_counter()
+    for text in corpus:
+        nlp.parse(text)
+    return len(corpus) / (time.perf_counter() - start)
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    corpus = make_corpus(size)
+    legacy, fast = LegacyNLP(cache_size=0), EnhancedNLP(cache_size=0)
+    cached = EnhancedNLP()
+
+    print("\n" + "=" * 80)
+    print(f"🧪 EnhancedNLP equivalence over {len(corpus)} utterances")
+    print("=" * 80)
+    mismatches, whole_word = check_equivalence(corpus, legacy, fast)
+    if mismatches:
+        print(f"❌ {mismatches} mismatches")
+        sys.exit(1)
+    print("✅ identical (intent, entities) for every utterance, except")
+    print(f"   {whole_word} where an app/website name was only part of a longer word")
+
+    print("\n⏱️  parse() throughput")
+    old = throughput(legacy, corpus)
+    new = throughput(fast, corpus)
+    print(f"   legacy:   {old:>10,.0f} parses/s")
+    print(f"   compiled: {new:>10,.0f} parses/s  ({new / old:.2f}x)")
+    hot = throughput(cached, corpus)
+    stats = cached.cache.stats()
+    print(f"   + cache:  {hot:>10,.0f} parses/s  ({hot / old:.2f}x, "
+          f"{stats['hits']} hits / {stats['misses']} misses)")
+
+    print("\n⏱️  extract_intent only")
+    for name, nlp in (("legacy", legacy), ("compiled", fast)):
+        start = time.perf_counter()
+        for text in corpus:
+            nlp.extract_intent(text)
+        rate = len(corpus) / (time.perf_counter() - start)
+        print(f"   {name + ':':<9} {rate:>10,.0f} calls/s")
+
+    print("\n⏱️  extract_app vs. known_apps size (µs per call)")
+    rng = random.Random(3)
+    extra = ["".join(rng.choices("abcdefghijklmnopqrstuvwxyz", k=8)) for _ in range(5000)]
+    sample = corpus[:20000]
+    parsed = [ParsedUtterance(text) for text in sample]
+    for size in (0, 500, 5000):
+        row = []
+        for nlp, inputs in ((LegacyNLP(cache_size=0), sample), (EnhancedNLP(cache_size=0), parsed)):
+            nlp.known_apps = nlp.known_apps + extra[:size]
+            nlp.compile_patterns()
+            start = time.perf_counter()
+            for u in inputs:
+                nlp.extract_app(u)
+            row.append((time.perf_counter() - start) / len(inputs) * 1e6)
+        print(f"   {len(nlp.known_apps):>5} names:  substring {row[0]:>8.2f}   token set {row[1]:>6.2f}")
+    print("=" * 80)
+
+
+if __name__ == "__main__":
+    main()
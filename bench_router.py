@@ -0,0 +1,105 @@
+# bench_router.py
+"""
+Micro-benchmark: per-command routing cost of the single-pass keyword
+automaton vs. the old one-`any(...)`-scan-per-category approach, as the
+keyword set grows.
+
+Run:  python bench_router.py
+"""
+
+import random
+import string
+import time
+
+from aura.keyword_matcher import KeywordMatcher
+from aura.command_engine import ROUTE_KEYWORDS, ROUTE_ORDER
+
+SIZES = [len(sum(ROUTE_KEYWORDS.values(), [])), 100, 1000, 5000, 20000]
+ROUNDS = 2000
+
+SAMPLE_COMMANDS = [
+    "set timer for 5 minutes",
+    "call amma",
+    "message kushi hello there",
+    "open wifi settings",
+    "email to sinchana about leave saying i am sick",
+    "play despacito video on youtube",
+    "weather in bangalore",
+    "what is a decision tree",
+    "open visual studio code",
+    "how tall is mount everest",
+]
+
+
+def _random_phrase(rng):
+    words = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 8)))
+             for _ in range(rng.randint(1, 3))]
+    return " ".join(words)
+
+
+def make_table(size, seed=7):
+    """The real routing table, padded with synthetic phrases up to `size`."""
+    rng = random.Random(seed)
+    table = {cat: list(words) for cat, words in ROUTE_KEYWORDS.items()}
+    cats = list(table)
+    total = sum(len(v) for v in table.values())
+    while total < size:
+        table[rng.choice(cats)].append(_random_phrase(rng))
+        total += 1
+    return table
+
+
+def naive_route(table, text):
+    """The old approach: one full scan of the text per category."""
+    for category in ROUTE_ORDER:
+        if category == "faq":
+            continue
+        if any(w in text for w in table[category]):
+            return category
+    return "search"
+
+
+def automaton_route(matcher, text):
+    matches = matcher.match(text)
+    for category in ROUTE_ORDER:
+        if category in matches:
+            return category
+    return "search"
+
+
+def _time_per_command(fn, commands):
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        for cmd in commands:
+            fn(cmd)
+    return (time.perf_counter() - start) / (ROUNDS * len(commands)) * 1e6
+
+
+def main():
+    print("\n" + "=" * 80)
+    print("⏱️  ROUTING MICRO-BENCHMARK (µs per command)")
+    print("=" * 80)
+    print(f"{'phrases':>8} | {'naive any()':>12} | {'automaton':>10} | {'build ms':>8} | speedup")
+    print("-" * 80)
+
+    for size in SIZES:
+        table = make_table(size)
+
+        t0 = time.perf_counter()
+        matcher = KeywordMatcher(table)
+        matcher.build()
+        build_ms = (time.perf_counter() - t0) * 1000
+
+        # both routers must agree before we compare their speed
+        for cmd in SAMPLE_COMMANDS:
+            assert naive_route(table, cmd) == automaton_route(matcher, cmd), cmd
+
+        naive = _time_per_command(lambda c: naive_route(table, c), SAMPLE_COMMANDS)
+        fast = _time_per_command(lambda c: automaton_route(matcher, c), SAMPLE_COMMANDS)
+        print(f"{size:>8} | {naive:>12.2f} | {fast:>10.2f} | {build_ms:>8.1f} | {naive / fast:6.1f}x")
+
+    print("=" * 80)
+
+
+if __name__ == "__main__":
+    main()
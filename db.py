@@ -2,24 +2,20 @@
 from dotenv import load_dotenv
 load_dotenv()
 
-import os
-import mysql.connector
 from mysql.connector import Error
 
-DB_HOST = os.getenv("DB_HOST", "localhost")
-DB_USER = os.getenv("DB_USER", "")
-DB_PASSWORD = os.getenv("DB_PASSWORD", "")
-DB_NAME = os.getenv("DB_NAME", "")
+from aura import db_pool
+
+# one set of MySQL settings, read by db_pool
+from aura.db_pool import DB_HOST, DB_USER, DB_PASSWORD, DB_NAME
 
 def get_connection():
+    """
+    Pooled connection (aura/db_pool.py); close() hands it back to the pool.
+    Fails fast with db_pool.DatabaseUnavailable while the MySQL circuit is open.
+    """
     try:
-        conn = mysql.connector.connect(
-            host=DB_HOST,
-            user=DB_USER,
-            password=DB_PASSWORD,
-            database=DB_NAME
-        )
-        return conn
+        return db_pool.get_connection()
 
     except Error as e:
         print(f"[db.py] MYSQL CONNECTION ERROR: {e}")
@@ -4,19 +4,24 @@ AURA Engine: Main command execution handler
 Uses EnhancedCommandEngine for extensible, modular command routing
 """
 
-from .command_engine import EnhancedCommandEngine
-from .setup_handlers import initialize_engine
+import atexit
 
-# Try to import database (optional)
-try:
-    from aura.database import save_command
-except ImportError:
-    def save_command(text, response):
-        pass  # Fallback if database not available
+from aura.handler_engine import EnhancedCommandEngine
+from aura.history_sink import build_sink
+from aura.setup_handlers import initialize_engine
 
+# handler name -> command engine category (ROUTE_ORDER), so both engines
+# record the same categories in `commands`; anything else is "settings"
+HANDLER_CATEGORIES = {
+    "open_app": "app", "open_chrome": "app", "close_app": "app",
+    "chrome_new_tab": "app", "chrome_close_tab": "app",
+    "youtube_search": "youtube", "play_music": "youtube",
+    "google_search": "search", "smart_search": "search",
+}
 
 # Create engine instance (global/singleton)
 _engine = None
+_sink = None
 
 
 def get_engine() -> EnhancedCommandEngine:
@@ -37,16 +42,28 @@ def handle_command(text: str) -> str:
     
     engine = get_engine()
     response = engine.execute(text, min_confidence=0.2)  # LOWERED to 0.2
-    
-    # Save to database if available
-    try:
-        save_command(text, response)
-    except Exception as e:
-        print(f"Warning: Could not save command: {e}")
-    
+    last = engine.get_history(1)
+    category = HANDLER_CATEGORIES.get(last[0]["handler"], "settings") if last else None
+    _history_sink().record(text.strip(), category, response)
     return response
 
 
+def _history_sink():
+    """Same history backends as the command engine (aura/history_sink.py)."""
+    global _sink
+    if _sink is None:
+        _sink = build_sink("aura_commands.db")
+    return _sink
+
+
+def _close_sink():
+    if _sink is not None:
+        _sink.close()
+
+
+atexit.register(_close_sink)
+
+
 def get_command_history(limit: int = 20):
     """Get recent command history"""
     return get_engine().get_history(limit)
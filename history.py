@@ -1,6 +1,6 @@
 # history.py — final version matching your actual DB schema
 
-from db import get_connection
+from aura import history_journal
 
 def save_history(user_id, user_text, bot_text, input_mode="text"):
     """
@@ -10,28 +10,7 @@ def save_history(user_id, user_text, bot_text, input_mode="text"):
     - aura_response
     - input_mode
     - timestamp (auto)
+    The row goes to the local journal first and is shipped to MySQL in the
+    background (aura/history_journal.py), so this never waits on the server.
     """
-    conn = None
-    cursor = None
-    try:
-        conn = get_connection()
-        cursor = conn.cursor()
-
-        sql = """
-            INSERT INTO command_history (user_id, user_command, aura_response, input_mode)
-            VALUES (%s, %s, %s, %s)
-        """
-
-        cursor.execute(sql, (user_id, user_text, bot_text, input_mode))
-        conn.commit()
-        return True
-
-    except Exception as e:
-        print("SAVE_HISTORY ERROR:", e)
-        return False
-
-    finally:
-        if cursor:
-            cursor.close()
-        if conn:
-            conn.close()
+    return history_journal.record(user_id, user_text, bot_text, input_mode)
@@ -4,12 +4,16 @@ load_dotenv()  # ensures .env values are available via os.getenv()
 
 import sys
 from PyQt6.QtWidgets import QApplication
+from aura import db_pool
 from aura_login import AuraLoginWindow, user_memory
 from aura_panel import MainWindow
 
 
 class Controller:
     def __init__(self):
+        # ✅ MYSQL HANDSHAKE IN THE BACKGROUND - the windows never wait for it
+        db_pool.warm_up()
+
         # ✅ CHECK AUTO-LOGIN FIRST
         saved_user = user_memory.get_saved_user()
         
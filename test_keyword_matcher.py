@@ -0,0 +1,25 @@
+# test_keyword_matcher.py
+"""Rebuilding the keyword automaton must not change what it matches."""
+
+from aura.keyword_matcher import KeywordMatcher
+
+
+def test_rebuild_gives_same_matches():
+    m = KeywordMatcher({"a": ["open", "pen"]})
+    first = m.match("open")
+    assert first == {"a": [(0, 4), (1, 4)]}
+
+    for _ in range(3):
+        m.build()
+        assert m.match("open") == first
+
+    # add() + lazy rebuild: only the new phrase's matches are added
+    m.add("op", "b")
+    assert m.match("open") == {"b": [(0, 2)], "a": [(0, 4), (1, 4)]}
+    m.build()
+    assert m.match("open") == {"b": [(0, 2)], "a": [(0, 4), (1, 4)]}
+
+
+if __name__ == "__main__":
+    test_rebuild_gives_same_matches()
+    print("✅ keyword matcher rebuild OK")